@@ -0,0 +1,123 @@
+"""
+Background flushing for buffered writers.
+
+This module provides a base class that collects records in memory and
+sends them from a background thread, used by the CloudWatch Logs and
+CloudWatch metrics writers to keep hot paths off the network.
+"""
+
+import logging
+import threading
+from typing import Any, Optional
+
+from .exceptions import pivot_exceptions
+
+logger = logging.getLogger(__name__)
+
+
+class BufferedWriter:
+    """
+    Base class for writers that buffer records and send them from a
+    background thread.
+
+    Subclasses add records while holding `_condition`, calling
+    `_check_open` first. They implement `_take`, which swaps out the
+    buffer while `_condition` is held, and `_deliver`, which sends what
+    `_take` returned. `_ready` may be overridden to flush before
+    `flush_interval` ends; the subclass then calls `_condition.notify`
+    once it returns True.
+
+    Sends are serialized, so a synchronous `flush` never overlaps a
+    background one. If a background flush fails, its records are
+    dropped and the error is logged. The error is then raised by the
+    next call to `flush` or `close`, unless that call fails with an
+    error of its own.
+
+    Subclasses must call `__init__` after setting up their buffers,
+    since it starts the background thread.
+
+    Args:
+        flush_interval: Seconds between background flushes.
+    """
+
+    def __init__(self, flush_interval: float):
+        self.flush_interval = flush_interval
+        self._closed = False
+        self._error: Optional[Exception] = None
+        self._condition = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> "BufferedWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _check_open(self) -> None:
+        """Raise ValueError if the writer is closed."""
+        if self._closed:
+            raise ValueError(f"{type(self).__name__} is closed")
+
+    def _ready(self) -> bool:
+        """Return whether the buffer should be sent before the interval."""
+        return False
+
+    def _take(self) -> Any:
+        """Remove and return the buffered records."""
+        raise NotImplementedError
+
+    def _deliver(self, records: Any) -> None:
+        """Send records returned by `_take`."""
+        raise NotImplementedError
+
+    def _send(self) -> None:
+        """Send everything buffered so far."""
+        with self._flush_lock:
+            with self._condition:
+                records = self._take()
+            if records:
+                self._deliver(records)
+
+    def _run(self) -> None:
+        """Flush periodically, or when the buffer is ready, until closed."""
+        while True:
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: self._ready() or self._closed, self.flush_interval
+                )
+                if self._closed:
+                    return
+            try:
+                self._send()
+            except Exception as exc:
+                logger.exception(
+                    "Background flush of %s failed", type(self).__name__
+                )
+                if self._error is None:
+                    self._error = exc
+
+    def _raise_error(self) -> None:
+        """Raise the error from a failed background flush, if any."""
+        error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    @pivot_exceptions
+    def flush(self) -> None:
+        """Send everything buffered now."""
+        self._send()
+        self._raise_error()
+
+    @pivot_exceptions
+    def close(self) -> None:
+        """Stop the background thread and send anything still buffered."""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
+        self._send()
+        self._raise_error()
@@ -0,0 +1,320 @@
+"""
+In-process caching utilities.
+
+This module provides a thread-safe TTL + LRU cache with single-flight
+loading, used by service modules to keep hot reads off the network.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+)
+
+# Number of threads shared by all caches for stale-while-revalidate
+# refreshes. Further refreshes queue until a thread is free.
+REFRESH_MAX_WORKERS = 4
+
+_MISSING = object()
+
+_refresh_executor = ThreadPoolExecutor(
+    max_workers=REFRESH_MAX_WORKERS, thread_name_prefix="ttlcache-refresh"
+)
+
+logger = logging.getLogger(__name__)
+
+
+class _Flight:
+    """A load in progress that concurrent callers can wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = _MISSING
+        self.error: Optional[BaseException] = None
+
+
+class TTLCache:
+    """
+    Thread-safe cache with per-entry expiry and least-recently-used
+    eviction.
+
+    `get_or_load` and `get_or_load_many` coalesce concurrent misses for
+    the same key so only one caller loads it while the others wait for
+    its result.
+    None is a valid cached value, which lets callers cache misses.
+
+    With `stale_ttl`, an expired entry is still served by `get_or_load`
+    for that many more seconds while it is reloaded in the background
+    (stale-while-revalidate), using a pool of REFRESH_MAX_WORKERS
+    threads shared by all caches. If the refresh fails, the error is
+    logged and the stale value keeps being served until the stale
+    window ends.
+
+    Args:
+        ttl: Seconds an entry stays fresh.
+        maxsize: Maximum number of entries. The least recently used
+            entry is evicted when the cache is full. Defaults to 1024.
+        stale_ttl: Seconds after expiry during which the entry may be
+            served while it is refreshed. Defaults to 0 (disabled).
+    """
+
+    def __init__(self, ttl: float, maxsize: int = 1024, stale_ttl: float = 0):
+        if ttl <= 0:
+            raise ValueError("ttl must be greater than zero")
+        if maxsize <= 0:
+            raise ValueError("maxsize must be greater than zero")
+        if stale_ttl < 0:
+            raise ValueError("stale_ttl must not be negative")
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.stale_ttl = stale_ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._flights: dict = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def _lookup(self, key: Hashable) -> tuple:
+        """
+        Return (value, stale) for a key, with value _MISSING if there is
+        no usable entry. Caller holds the lock.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return _MISSING, False
+        value, expires_at, stale_until = entry
+        now = time.monotonic()
+        if now >= stale_until:
+            del self._entries[key]
+            return _MISSING, False
+        self._entries.move_to_end(key)
+        return value, now >= expires_at
+
+    def _store(self, key: Hashable, value: Any, ttl: Optional[float]) -> None:
+        """Insert a value, evicting if needed. Caller holds the lock."""
+        expires_at = time.monotonic() + (ttl if ttl is not None else self.ttl)
+        self._entries[key] = (value, expires_at, expires_at + self.stale_ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Return the cached value for a key.
+
+        Args:
+            key: The cache key.
+            default: Returned if the key is missing or expired.
+
+        Returns:
+            The cached value, or `default`. Stale values are not
+            returned.
+        """
+        with self._lock:
+            value, stale = self._lookup(key)
+        return default if value is _MISSING or stale else value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """
+        Store a value.
+
+        Args:
+            key: The cache key.
+            value: The value to cache.
+            ttl: Seconds this entry stays fresh. Defaults to the cache
+                ttl.
+        """
+        with self._lock:
+            self._store(key, value, ttl)
+
+    def invalidate(self, key: Hashable) -> None:
+        """
+        Remove a key from the cache if present.
+
+        A load for the key that is already in flight, including a
+        stale refresh, still returns its result to the callers waiting
+        on it, but the result is not cached and later callers start a
+        new load.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+            self._flights.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove every entry from the cache, as `invalidate` does."""
+        with self._lock:
+            self._entries.clear()
+            self._flights.clear()
+
+    def _finish(self, key: Hashable, flight: _Flight, store: bool) -> None:
+        """
+        End a flight, caching its value if `store` is set and the flight
+        was not superseded by `invalidate` or `clear`. Caller holds the
+        lock.
+        """
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+            if store:
+                self._store(key, flight.value, None)
+
+    def _load(
+        self, key: Hashable, loader: Callable[[], Any], flight: _Flight
+    ) -> Any:
+        """Run a loader for a flight this thread owns."""
+        try:
+            flight.value = loader()
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._finish(key, flight, flight.error is None)
+            flight.done.set()
+        return flight.value
+
+    def _refresh(
+        self, key: Hashable, loader: Callable[[], Any], flight: _Flight
+    ) -> None:
+        """Reload a stale entry, keeping the stale value on failure."""
+        try:
+            self._load(key, loader, flight)
+        except Exception:
+            logger.exception("Background refresh of %r failed", key)
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        Return the cached value for a key, loading it on a miss.
+
+        Concurrent misses for the same key share one call to `loader`.
+        If the loader raises, every waiting caller receives the error
+        and nothing is cached. A stale entry is returned immediately
+        and refreshed in the background.
+
+        Args:
+            key: The cache key.
+            loader: Called with no arguments to produce the value.
+
+        Returns:
+            The cached or freshly loaded value.
+        """
+        return self.get_or_load_with_status(key, loader)[0]
+
+    def get_or_load_with_status(
+        self, key: Hashable, loader: Callable[[], Any]
+    ) -> Tuple[Any, str]:
+        """
+        Like `get_or_load`, but also report where the value came from.
+
+        Args:
+            key: The cache key.
+            loader: Called with no arguments to produce the value.
+
+        Returns:
+            A (value, status) tuple. Status is "hit" for a fresh entry,
+            "stale" for a stale entry being refreshed, "loaded" if this
+            call ran the loader, or "shared" if it waited for a load
+            started by another caller.
+        """
+        with self._lock:
+            value, stale = self._lookup(key)
+            if value is not _MISSING and not stale:
+                return value, "hit"
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if value is not _MISSING:
+            if leader:
+                _refresh_executor.submit(self._refresh, key, loader, flight)
+            return value, "stale"
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            if flight.value is _MISSING:
+                # A multi-key load finished without producing this key.
+                return self.get_or_load_with_status(key, loader)
+            return flight.value, "shared"
+
+        return self._load(key, loader, flight), "loaded"
+
+    def get_or_load_many(
+        self,
+        keys: Iterable[Hashable],
+        loader: Callable[[List[Hashable]], Dict[Hashable, Any]],
+    ) -> Dict[Hashable, Any]:
+        """
+        Return cached values for many keys, loading the misses together.
+
+        Misses that another caller is already loading are waited on
+        instead of being passed to `loader`, and the keys passed to
+        `loader` are in turn shared with concurrent `get_or_load` and
+        `get_or_load_many` calls. Stale entries count as misses.
+
+        Args:
+            keys: The cache keys.
+            loader: Called with the list of keys to load. Returns a dict
+                of loaded values; keys it leaves out are not cached.
+
+        Returns:
+            A dict of values in the order of `keys`, leaving out keys
+            that no loader produced. If a loader raises, the error is
+            raised and nothing from that load is cached.
+        """
+        order = []
+        found = {}
+        led = {}
+        waiting = {}
+        with self._lock:
+            for key in keys:
+                if key in found or key in led or key in waiting:
+                    continue
+                order.append(key)
+                value, stale = self._lookup(key)
+                if value is not _MISSING and not stale:
+                    found[key] = value
+                elif key in self._flights:
+                    waiting[key] = self._flights[key]
+                else:
+                    led[key] = self._flights[key] = _Flight()
+
+        if led:
+            try:
+                loaded = loader(list(led))
+            except BaseException as exc:
+                for flight in led.values():
+                    flight.error = exc
+                raise
+            else:
+                for key, flight in led.items():
+                    if key in loaded:
+                        flight.value = found[key] = loaded[key]
+            finally:
+                with self._lock:
+                    for key, flight in led.items():
+                        self._finish(key, flight, flight.value is not _MISSING)
+                for flight in led.values():
+                    flight.done.set()
+
+        for key, flight in waiting.items():
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            if flight.value is not _MISSING:
+                found[key] = flight.value
+
+        return {key: found[key] for key in order if key in found}
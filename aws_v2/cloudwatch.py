@@ -1,35 +1,87 @@
 """
 This module provides utilities for interacting with AWS CloudWatch.
 
-It includes functions to fetch metric statistics using the AWS SDK
-(boto3).
+It includes functions to fetch metric statistics and batched metric
+data using the AWS SDK (boto3), to work with them as NumPy time series,
+and to publish metrics in batches, directly or through a buffered
+background publisher.
 """
 
-from typing import Optional
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import IO, Any, Dict, Iterable, List, Optional, Tuple, Union
 
 import boto3
 
 from . import session
+from .buffer import BufferedWriter
 from .exceptions import pivot_exceptions
 from .models.cloudwatch import (
+    MetricDataOutput,
+    MetricDataQuery,
+    MetricDataResult,
+    MetricSeries,
     MetricStatisticsInput,
     MetricStatisticsOutput,
 )
+from .utils import import_optional
 
 client = session.client("cloudwatch")
 
+# Maximum number of queries accepted by a single GetMetricData request.
+GET_METRIC_DATA_MAX_QUERIES = 500
+
+# Maximum number of data points a GetMetricStatistics request may return.
+GET_METRIC_STATISTICS_MAX_DATAPOINTS = 1440
+
+# Maximum number of metric data items in a PutMetricData request.
+PUT_METRIC_DATA_MAX_DATUMS = 1000
+
+# Maximum number of metrics, and of values per metric, in one Embedded
+# Metric Format document.
+EMF_MAX_METRICS = 100
+EMF_MAX_VALUES = 100
+
+# Datapoint fields that are not statistics.
+_DATAPOINT_METADATA = ("Timestamp", "Unit")
+
+
+def _statistics_request(
+    input_data: MetricStatisticsInput, start_time: datetime, end_time: datetime
+) -> dict:
+    """Build a GetMetricStatistics request for part of the range."""
+    return {
+        "Namespace": input_data.namespace,
+        "MetricName": input_data.metric_name,
+        "Dimensions": input_data.dimensions,
+        "StartTime": start_time,
+        "EndTime": end_time,
+        "Period": input_data.period,
+        "Statistics": input_data.statistics,
+    }
+
 
 @pivot_exceptions
 def get_metric_statistics(
     input_data: MetricStatisticsInput,
     cloudwatch_client: Optional[boto3.client] = None,
+    max_workers: int = 4,
 ) -> MetricStatisticsOutput:
     """
     Fetch metric statistics from AWS CloudWatch.
 
+    A range holding more than 1,440 data points, the most a single
+    request can return, is split into consecutive sub-ranges that are
+    fetched concurrently. Data points are returned sorted by timestamp.
+
     Args:
         input_data: Dataclass containing input parameters.
         cloudwatch_client: CloudWatch client. Defaults to module client.
+        max_workers: Number of sub-ranges to fetch concurrently when the
+            range is split (default: 4).
 
     Returns:
         Dataclass containing the response from CloudWatch.
@@ -41,17 +93,657 @@ def get_metric_statistics(
     if cloudwatch_client is None:
         cloudwatch_client = client
 
-    response = cloudwatch_client.get_metric_statistics(
-        Namespace=input_data.namespace,
-        MetricName=input_data.metric_name,
-        Dimensions=input_data.dimensions,
-        StartTime=input_data.start_time,
-        EndTime=input_data.end_time,
-        Period=input_data.period,
-        Statistics=input_data.statistics,
+    span = timedelta(
+        seconds=input_data.period * GET_METRIC_STATISTICS_MAX_DATAPOINTS
     )
+    ranges = []
+    start_time = input_data.start_time
+    while start_time < input_data.end_time:
+        end_time = min(start_time + span, input_data.end_time)
+        ranges.append((start_time, end_time))
+        start_time = end_time
+    if len(ranges) <= 1:
+        ranges = [(input_data.start_time, input_data.end_time)]
+
+    def fetch(time_range: tuple) -> dict:
+        return cloudwatch_client.get_metric_statistics(
+            **_statistics_request(input_data, *time_range)
+        )
 
+    if len(ranges) == 1:
+        responses = [fetch(ranges[0])]
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            responses = list(executor.map(fetch, ranges))
+
+    datapoints = [
+        datapoint
+        for response in responses
+        for datapoint in response.get("Datapoints", [])
+    ]
+    datapoints.sort(key=lambda datapoint: datapoint["Timestamp"])
     return MetricStatisticsOutput(
-        label=response.get("Label"),
-        datapoints=response.get("Datapoints", []),
+        label=responses[0].get("Label"),
+        datapoints=datapoints,
+    )
+
+
+def _metric_data_chunk(
+    cloudwatch_client: boto3.client,
+    queries: List[dict],
+    start_time: datetime,
+    end_time: datetime,
+    scan_by: str,
+) -> MetricDataOutput:
+    """Fetch every page of one GetMetricData request."""
+    output = MetricDataOutput()
+    paginator = cloudwatch_client.get_paginator("get_metric_data")
+    for page in paginator.paginate(
+        MetricDataQueries=queries,
+        StartTime=start_time,
+        EndTime=end_time,
+        ScanBy=scan_by,
+    ):
+        output.messages.extend(page.get("Messages", []))
+        for data in page["MetricDataResults"]:
+            result = output.results.setdefault(
+                data["Id"], MetricDataResult(id=data["Id"])
+            )
+            result.label = data.get("Label", result.label)
+            result.timestamps.extend(data.get("Timestamps", []))
+            result.values.extend(data.get("Values", []))
+            if data.get("StatusCode", "Complete") != "Complete":
+                result.status_code = data["StatusCode"]
+    return output
+
+
+@pivot_exceptions
+def get_metric_data(
+    queries: Iterable[Union[MetricDataQuery, dict]],
+    start_time: datetime,
+    end_time: datetime,
+    scan_by: str = "TimestampAscending",
+    max_workers: int = 4,
+    cloudwatch_client: Optional[boto3.client] = None,
+) -> MetricDataOutput:
+    """
+    Fetch many metrics with as few GetMetricData requests as possible.
+
+    Queries are packed up to 500 per request, requests run
+    concurrently, and every page of each request is read. Results are
+    merged per query ID.
+
+    Args:
+        queries: MetricDataQuery objects, or MetricDataQueries entries
+            as dicts. Expressions may only refer to queries in the same
+            request of 500, so keep them close to their inputs.
+        start_time: The start time for the metric data.
+        end_time: The end time for the metric data.
+        scan_by: "TimestampAscending" (default) or
+            "TimestampDescending".
+        max_workers: Number of requests to run concurrently (default:
+            4).
+        cloudwatch_client: CloudWatch client. Defaults to module client.
+
+    Returns:
+        The results keyed by query ID, and any messages.
+
+    Raises:
+        AwsError: If an error occurs while fetching the metric data.
+
+    Examples:
+        >>> output = get_metric_data(
+        ...     [
+        ...         MetricDataQuery(
+        ...             id=f"cpu{index}",
+        ...             namespace="AWS/EC2",
+        ...             metric_name="CPUUtilization",
+        ...             dimensions=[{"Name": "InstanceId", "Value": iid}],
+        ...         )
+        ...         for index, iid in enumerate(instance_ids)
+        ...     ],
+        ...     datetime(2025, 8, 23),
+        ...     datetime(2025, 8, 24),
+        ... )
+        >>> output.results["cpu0"].values[:2]
+        [15.0, 20.0]
+    """
+    if cloudwatch_client is None:
+        cloudwatch_client = client
+
+    entries = [
+        query.to_dict() if isinstance(query, MetricDataQuery) else query
+        for query in queries
+    ]
+    chunks = [
+        entries[index : index + GET_METRIC_DATA_MAX_QUERIES]
+        for index in range(0, len(entries), GET_METRIC_DATA_MAX_QUERIES)
+    ]
+
+    def fetch(chunk: List[dict]) -> MetricDataOutput:
+        return _metric_data_chunk(
+            cloudwatch_client, chunk, start_time, end_time, scan_by
+        )
+
+    output = MetricDataOutput()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for chunk_output in executor.map(fetch, chunks):
+            output.results.update(chunk_output.results)
+            output.messages.extend(chunk_output.messages)
+    return output
+
+
+def _epoch_seconds(timestamp: Union[datetime, str]) -> int:
+    """Convert a data point timestamp to epoch seconds."""
+    if isinstance(timestamp, str):
+        timestamp = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+    return int(timestamp.timestamp())
+
+
+def _series(
+    numpy: Any,
+    timestamps: List[int],
+    columns: Dict[str, List[Optional[float]]],
+    label: Optional[str],
+) -> MetricSeries:
+    """Build a MetricSeries sorted by timestamp."""
+    times = numpy.array(timestamps, dtype=numpy.int64)
+    order = numpy.argsort(times, kind="stable")
+    return MetricSeries(
+        timestamps=times[order],
+        values={
+            name: numpy.array(
+                [numpy.nan if value is None else value for value in values],
+                dtype=numpy.float64,
+            )[order]
+            for name, values in columns.items()
+        },
+        label=label,
+    )
+
+
+@pivot_exceptions
+def metric_statistics_series(output: MetricStatisticsOutput) -> MetricSeries:
+    """
+    Convert get_metric_statistics output into sorted NumPy vectors.
+
+    Standard statistics keep their names ("Average", "Sum", ...), and
+    extended statistics use their percentile names ("p99", ...).
+    Requires numpy.
+
+    Args:
+        output: The output of get_metric_statistics.
+
+    Returns:
+        A MetricSeries with one vector per statistic.
+    """
+    numpy = import_optional("numpy")
+    timestamps = []
+    columns: Dict[str, List[Optional[float]]] = {}
+    for index, datapoint in enumerate(output.datapoints):
+        timestamps.append(_epoch_seconds(datapoint["Timestamp"]))
+        statistics = {
+            name: value
+            for name, value in datapoint.items()
+            if name not in _DATAPOINT_METADATA and name != "ExtendedStatistics"
+        }
+        statistics.update(datapoint.get("ExtendedStatistics", {}))
+        for name, value in statistics.items():
+            columns.setdefault(name, [None] * index).append(value)
+        for name, values in columns.items():
+            if len(values) <= index:
+                values.append(None)
+    return _series(numpy, timestamps, columns, output.label)
+
+
+@pivot_exceptions
+def metric_data_series(result: MetricDataResult) -> MetricSeries:
+    """
+    Convert one get_metric_data result into sorted NumPy vectors.
+    Requires numpy.
+
+    Args:
+        result: A result from get_metric_data.
+
+    Returns:
+        A MetricSeries whose single vector is named "Value".
+    """
+    numpy = import_optional("numpy")
+    return _series(
+        numpy,
+        [_epoch_seconds(timestamp) for timestamp in result.timestamps],
+        {"Value": list(result.values)},
+        result.label,
+    )
+
+
+def _reduce_sorted(numpy: Any, values: Any, starts: Any, how: str) -> Any:
+    """Aggregate runs of values that begin at `starts`."""
+    counts = numpy.diff(numpy.append(starts, len(values)))
+    if how == "sum":
+        return numpy.add.reduceat(values, starts)
+    if how == "mean":
+        return numpy.add.reduceat(values, starts) / counts
+    if how == "max":
+        return numpy.maximum.reduceat(values, starts)
+    if how == "min":
+        return numpy.minimum.reduceat(values, starts)
+    if how == "count":
+        return counts.astype(numpy.float64)
+    raise ValueError(f"Unsupported aggregation: {how}")
+
+
+@pivot_exceptions
+def resample_series(
+    series: MetricSeries, period: int, how: str = "mean"
+) -> MetricSeries:
+    """
+    Aggregate a series into coarser buckets of `period` seconds.
+
+    Buckets are aligned to multiples of `period` since the epoch, and
+    only buckets containing data points are returned. NaN values
+    propagate into their bucket. Requires numpy.
+
+    Args:
+        series: The series to resample.
+        period: Bucket width in seconds.
+        how: "mean" (default), "sum", "min", "max" or "count".
+
+    Returns:
+        A new MetricSeries with one data point per bucket.
+
+    Examples:
+        >>> hourly = resample_series(series, 3600, how="max")
+    """
+    numpy = import_optional("numpy")
+    buckets = series.timestamps - series.timestamps % period
+    if not len(buckets):
+        return MetricSeries(buckets, dict(series.values), series.label)
+    starts = numpy.flatnonzero(
+        numpy.concatenate(([True], buckets[1:] != buckets[:-1]))
+    )
+    return MetricSeries(
+        timestamps=buckets[starts],
+        values={
+            name: _reduce_sorted(numpy, values, starts, how)
+            for name, values in series.values.items()
+        },
+        label=series.label,
     )
+
+
+@pivot_exceptions
+def fill_series_gaps(
+    series: MetricSeries,
+    period: int,
+    fill: Union[str, float] = "nan",
+) -> MetricSeries:
+    """
+    Insert the missing data points of a series on a regular grid.
+
+    The grid runs every `period` seconds from the first to the last
+    timestamp; data points between grid points are placed on the
+    preceding one. Requires numpy.
+
+    Args:
+        series: The series to fill.
+        period: Grid spacing in seconds, usually the metric period.
+        fill: "nan" (default) to leave gaps as NaN, "previous" to carry
+            the last value forward, or a number to fill with.
+
+    Returns:
+        A new MetricSeries with one data point per grid step.
+
+    Examples:
+        >>> filled = fill_series_gaps(series, 60, fill=0)
+    """
+    numpy = import_optional("numpy")
+    if not len(series.timestamps):
+        return series
+    start = series.timestamps[0]
+    steps = int((series.timestamps[-1] - start) // period) + 1
+    positions = (series.timestamps - start) // period
+    present = numpy.zeros(steps, dtype=bool)
+    present[positions] = True
+
+    values = {}
+    for name, column in series.values.items():
+        filled = numpy.full(steps, numpy.nan)
+        filled[positions] = column
+        if fill == "previous":
+            last = numpy.where(present, numpy.arange(steps), 0)
+            filled = filled[numpy.maximum.accumulate(last)]
+        elif fill != "nan":
+            filled[~present] = float(fill)
+        values[name] = filled
+
+    return MetricSeries(
+        timestamps=start + numpy.arange(steps, dtype=numpy.int64) * period,
+        values=values,
+        label=series.label,
+    )
+
+
+@pivot_exceptions
+def rolling_series(
+    series: MetricSeries, window: int, how: str = "mean"
+) -> MetricSeries:
+    """
+    Compute a rolling aggregate over the last `window` data points.
+
+    The first `window - 1` values are NaN. Fill gaps first so the
+    window covers a fixed amount of time. Requires numpy.
+
+    Args:
+        series: The series to aggregate.
+        window: Number of data points in each window.
+        how: "mean" (default), "sum", "min", "max" or "std".
+
+    Returns:
+        A new MetricSeries with the same timestamps.
+
+    Examples:
+        >>> smoothed = rolling_series(fill_series_gaps(series, 60), 5)
+    """
+    numpy = import_optional("numpy")
+    reducers = {
+        "mean": numpy.mean,
+        "sum": numpy.sum,
+        "min": numpy.min,
+        "max": numpy.max,
+        "std": numpy.std,
+    }
+    if how not in reducers:
+        raise ValueError(f"Unsupported aggregation: {how}")
+
+    values = {}
+    for name, column in series.values.items():
+        rolled = numpy.full(len(column), numpy.nan)
+        if len(column) >= window:
+            windows = numpy.lib.stride_tricks.sliding_window_view(
+                column, window
+            )
+            rolled[window - 1 :] = reducers[how](windows, axis=1)
+        values[name] = rolled
+
+    return MetricSeries(series.timestamps, values, series.label)
+
+
+def _put_metric_data(
+    cloudwatch_client: boto3.client, namespace: str, metric_data: List[dict]
+) -> int:
+    """Send metric data in maximum-size batches; return batches sent."""
+    batches = 0
+    for index in range(0, len(metric_data), PUT_METRIC_DATA_MAX_DATUMS):
+        cloudwatch_client.put_metric_data(
+            Namespace=namespace,
+            MetricData=metric_data[index : index + PUT_METRIC_DATA_MAX_DATUMS],
+        )
+        batches += 1
+    return batches
+
+
+@pivot_exceptions
+def put_metric_data(
+    namespace: str,
+    metric_data: Iterable[dict],
+    cloudwatch_client: Optional[boto3.client] = None,
+) -> int:
+    """
+    Publish metric data in as few PutMetricData calls as possible.
+
+    Args:
+        namespace: The metric namespace.
+        metric_data: MetricData entries, e.g. {"MetricName": "Latency",
+            "Value": 12.5, "Unit": "Milliseconds"}. They are sent 1,000
+            per request.
+        cloudwatch_client: CloudWatch client. Defaults to module client.
+
+    Returns:
+        The number of PutMetricData calls made.
+    """
+    if cloudwatch_client is None:
+        cloudwatch_client = client
+
+    return _put_metric_data(cloudwatch_client, namespace, list(metric_data))
+
+
+class _Aggregate:
+    """
+    Running statistics, and optionally a count per distinct value, for
+    one metric.
+    """
+
+    __slots__ = ("count", "total", "minimum", "maximum", "counts")
+
+    def __init__(self, keep_values: bool):
+        self.count = 0
+        self.total = 0.0
+        self.minimum = float("inf")
+        self.maximum = float("-inf")
+        self.counts: Optional[Dict[float, int]] = {} if keep_values else None
+
+    def add(self, value: float) -> None:
+        """Record one observation."""
+        self.count += 1
+        self.total += value
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+        if self.counts is not None:
+            self.counts[value] = self.counts.get(value, 0) + 1
+
+
+class MetricPublisher(BufferedWriter):
+    """
+    Buffered metric publisher that aggregates observations in memory.
+
+    Observations of the same metric name, dimensions and unit are
+    combined into one statistic set (count, sum, minimum, maximum).
+    A background thread publishes the aggregates every
+    `flush_interval` seconds with PutMetricData, 1,000 metrics per
+    request, so hot paths never wait on CloudWatch.
+
+    With `emf=True`, each flush instead writes CloudWatch Embedded
+    Metric Format documents to `stream` (stdout by default), for
+    runtimes such as Lambda that extract metrics from their logs. Each
+    distinct value of the interval is written once with the number of
+    times it was recorded, as `Values` and `Counts` arrays of up to 100
+    entries per metric per document. A metric recorded with several
+    units is written to a separate document per unit, and a metric
+    named like one of its own dimensions is rejected, since both would
+    share one key in the document.
+
+    If a background flush fails, its metrics are dropped and the error
+    is logged, then raised by the next call to `flush` or `close`.
+
+    Args:
+        namespace: The metric namespace.
+        flush_interval: Seconds between background flushes (default:
+            60).
+        storage_resolution: 1 for high-resolution metrics, or 60
+            (default).
+        emf: Write Embedded Metric Format to `stream` instead of calling
+            PutMetricData (default: False).
+        stream: Text stream for EMF output. Defaults to sys.stdout.
+        cloudwatch_client: CloudWatch client. Defaults to module client.
+
+    Examples:
+        >>> with MetricPublisher("MyService") as metrics:
+        ...     metrics.record(
+        ...         "Latency", 12.5, {"Operation": "Get"}, "Milliseconds"
+        ...     )
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        flush_interval: float = 60.0,
+        storage_resolution: int = 60,
+        emf: bool = False,
+        stream: Optional[IO[str]] = None,
+        cloudwatch_client: Optional[boto3.client] = None,
+    ):
+        self.namespace = namespace
+        self.storage_resolution = storage_resolution
+        self.emf = emf
+        self.stream = stream
+        self.cloudwatch_client = (
+            cloudwatch_client if cloudwatch_client is not None else client
+        )
+        self._aggregates: Dict[Tuple, _Aggregate] = {}
+        super().__init__(flush_interval)
+
+    def record(
+        self,
+        metric_name: str,
+        value: float,
+        dimensions: Optional[Dict[str, str]] = None,
+        unit: str = "None",
+    ) -> None:
+        """
+        Record one observation.
+
+        Args:
+            metric_name: The name of the metric.
+            value: The observed value.
+            dimensions: Optional dimension names and values.
+            unit: The CloudWatch unit, e.g. "Milliseconds" (default:
+                "None").
+
+        Raises:
+            ValueError: If the publisher is closed, or if it writes EMF
+                and `metric_name` is also a dimension name.
+        """
+        if self.emf and metric_name in (dimensions or {}):
+            raise ValueError(
+                f"Metric name {metric_name!r} is also a dimension name"
+            )
+        key = (
+            metric_name,
+            tuple(sorted((dimensions or {}).items())),
+            unit,
+        )
+        with self._condition:
+            self._check_open()
+            aggregate = self._aggregates.get(key)
+            if aggregate is None:
+                aggregate = self._aggregates[key] = _Aggregate(self.emf)
+            aggregate.add(value)
+
+    def _metric_data(self, aggregates: Dict[Tuple, _Aggregate]) -> List[dict]:
+        """Convert aggregates to PutMetricData entries."""
+        timestamp = datetime.now(timezone.utc)
+        return [
+            {
+                "MetricName": metric_name,
+                "Dimensions": [
+                    {"Name": name, "Value": value}
+                    for name, value in dimensions
+                ],
+                "Timestamp": timestamp,
+                "StatisticValues": {
+                    "SampleCount": aggregate.count,
+                    "Sum": aggregate.total,
+                    "Minimum": aggregate.minimum,
+                    "Maximum": aggregate.maximum,
+                },
+                "Unit": unit,
+                "StorageResolution": self.storage_resolution,
+            }
+            for (metric_name, dimensions, unit), aggregate in (
+                aggregates.items()
+            )
+        ]
+
+    def _emf_documents(
+        self, aggregates: Dict[Tuple, _Aggregate]
+    ) -> Iterable[dict]:
+        """Convert aggregates to Embedded Metric Format documents."""
+        timestamp = int(time.time() * 1000)
+        # Each dimension set gets one or more layers, each holding a
+        # metric name at most once, so a name recorded with several
+        # units is split across documents instead of overwritten.
+        groups: Dict[Tuple, List[Dict[str, Tuple[str, List[Tuple]]]]] = {}
+        for (metric_name, dimensions, unit), aggregate in aggregates.items():
+            layers = groups.setdefault(dimensions, [])
+            for layer in layers:
+                if metric_name not in layer:
+                    break
+            else:
+                layer = {}
+                layers.append(layer)
+            layer[metric_name] = (unit, sorted(aggregate.counts.items()))
+
+        for dimensions, layers in groups.items():
+            for layer in layers:
+                yield from self._emf_layer(timestamp, dimensions, layer)
+
+    def _emf_layer(
+        self,
+        timestamp: int,
+        dimensions: Tuple,
+        layer: Dict[str, Tuple[str, List[Tuple]]],
+    ) -> Iterable[dict]:
+        """Convert one layer of a dimension set to EMF documents."""
+        metrics = [
+            (name, unit, values) for name, (unit, values) in layer.items()
+        ]
+        longest = max(len(values) for _, _, values in metrics)
+        for start in range(0, longest, EMF_MAX_VALUES):
+            chunk = [
+                (name, unit, values[start : start + EMF_MAX_VALUES])
+                for name, unit, values in metrics
+                if len(values) > start
+            ]
+            for index in range(0, len(chunk), EMF_MAX_METRICS):
+                part = chunk[index : index + EMF_MAX_METRICS]
+                document = {
+                    "_aws": {
+                        "Timestamp": timestamp,
+                        "CloudWatchMetrics": [
+                            {
+                                "Namespace": self.namespace,
+                                "Dimensions": [
+                                    [name for name, _ in dimensions]
+                                ],
+                                "Metrics": [
+                                    {
+                                        "Name": name,
+                                        "Unit": unit,
+                                        "StorageResolution": (
+                                            self.storage_resolution
+                                        ),
+                                    }
+                                    for name, unit, _ in part
+                                ],
+                            }
+                        ],
+                    },
+                    **dict(dimensions),
+                }
+                for name, _, values in part:
+                    document[name] = {
+                        "Values": [value for value, _ in values],
+                        "Counts": [count for _, count in values],
+                    }
+                yield document
+
+    def _take(self) -> Dict[Tuple, _Aggregate]:
+        """Remove and return the aggregates recorded so far."""
+        aggregates = self._aggregates
+        self._aggregates = {}
+        return aggregates
+
+    def _deliver(self, aggregates: Dict[Tuple, _Aggregate]) -> None:
+        """Publish aggregates with PutMetricData or as EMF documents."""
+        if self.emf:
+            stream = self.stream if self.stream is not None else sys.stdout
+            for document in self._emf_documents(aggregates):
+                stream.write(json.dumps(document) + "\n")
+            stream.flush()
+        else:
+            _put_metric_data(
+                self.cloudwatch_client,
+                self.namespace,
+                self._metric_data(aggregates),
+            )
@@ -5,22 +5,552 @@ This module provides functions for interacting with AWS DynamoDB service,
 including operations like scanning tables, querying data, etc.
 """
 
-from typing import Optional
+import base64
+import copy
+import csv
+import hashlib
+import itertools
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from types import ModuleType
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
 
 import boto3
 
 from . import session
+from .cache import TTLCache
 from .exceptions import pivot_exceptions
-from .models.dynamodb import DynamoDBScanOutput
+from .models.dynamodb import (
+    DynamoDBBatchGetOutput,
+    DynamoDBBatchWriteOutput,
+    DynamoDBGetItemOutput,
+    DynamoDBPage,
+    DynamoDBQueryOutput,
+    DynamoDBScanOutput,
+)
+from .utils import backoff_delay, import_optional
+
+# Service limits for a single BatchGetItem / BatchWriteItem request.
+BATCH_GET_MAX_KEYS = 100
+BATCH_WRITE_MAX_ITEMS = 25
+
+# Number of attempts made for each batch before unprocessed keys or
+# items are handed back to the caller.
+BATCH_MAX_ATTEMPTS = 10
+
+# Default maximum number of segments a parallel scan reads at once.
+SCAN_MAX_WORKERS = 16
+
+# Number of pages read by a scan segment between checkpoint writes.
+CHECKPOINT_INTERVAL = 10
 
 client = session.client("dynamodb")
 
 
+class CapacityRateLimiter:
+    """
+    Token bucket that paces DynamoDB requests by consumed capacity.
+
+    Capacity is only known after a request completes, so the bucket is
+    allowed to go into debt: `acquire` blocks until the debt is repaid
+    and `consume` deducts what a response reports. One
+    limiter may be shared by several threads, e.g. parallel scan
+    segments, to pace them against a single budget.
+
+    Args:
+        rate: Capacity units replenished per second.
+        burst: Maximum balance that may accumulate while idle. Defaults
+            to one second worth of `rate`.
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("rate must be greater than zero")
+        self.rate = rate
+        self.burst = burst if burst is not None else rate
+        self._balance = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._balance = min(
+            self.burst, self._balance + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    def acquire(self) -> None:
+        """Block until the bucket is no longer in debt."""
+        while True:
+            with self._lock:
+                self._refill()
+                if self._balance >= 0:
+                    return
+                wait = -self._balance / self.rate
+            time.sleep(wait)
+
+    def consume(self, units: float) -> None:
+        """Deduct consumed capacity units from the bucket."""
+        with self._lock:
+            self._refill()
+            self._balance -= units
+
+
+def _consumed_units(consumed_capacity: Optional[Dict]) -> float:
+    """Extract the capacity units from a ConsumedCapacity response."""
+    if not consumed_capacity:
+        return 0.0
+    return consumed_capacity.get("CapacityUnits", 0.0)
+
+
+def _add_capacity(
+    total: Optional[Dict], consumed: Optional[Dict]
+) -> Optional[Dict]:
+    """
+    Add one ConsumedCapacity structure to a running total, summing the
+    unit counts of the table and of each index.
+    """
+    if not consumed:
+        return total
+    if total is None:
+        total = {}
+    for name, value in consumed.items():
+        if isinstance(value, dict):
+            total[name] = _add_capacity(total.get(name), value)
+        elif isinstance(value, (int, float)):
+            total[name] = total.get(name, 0) + value
+        else:
+            total.setdefault(name, value)
+    return total
+
+
+def _encode_key(key: Optional[Dict]) -> Optional[Dict]:
+    """Make a primary key JSON serializable (binary values as base64)."""
+    if key is None:
+        return None
+    return {
+        name: (
+            {"B": base64.b64encode(value["B"]).decode("ascii")}
+            if "B" in value
+            else value
+        )
+        for name, value in key.items()
+    }
+
+
+def _decode_key(key: Optional[Dict]) -> Optional[Dict]:
+    """Reverse `_encode_key`."""
+    if key is None:
+        return None
+    return {
+        name: ({"B": base64.b64decode(value["B"])} if "B" in value else value)
+        for name, value in key.items()
+    }
+
+
+class _ScanCheckpoint:
+    """
+    Per-segment scan progress persisted to a local JSON file.
+
+    Each segment records its LastEvaluatedKey and whether it finished.
+    A hash of the Scan request is stored too, so a checkpoint is only
+    resumed by the same scan. Writes go to a temporary file that is
+    then renamed over the checkpoint, so an interrupted write never
+    corrupts it.
+    """
+
+    def __init__(
+        self, path: str, table_name: str, total_segments: int, request: Dict
+    ):
+        self.path = path
+        self._lock = threading.Lock()
+        request_hash = hashlib.sha256(
+            json.dumps(request, sort_keys=True, default=repr).encode("utf-8")
+        ).hexdigest()
+        self._state = {
+            "table_name": table_name,
+            "total_segments": total_segments,
+            "request_hash": request_hash,
+            "segments": {
+                str(segment): {"done": False, "last_evaluated_key": None}
+                for segment in range(total_segments)
+            },
+        }
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as checkpoint_file:
+                state = json.load(checkpoint_file)
+            if (
+                state["table_name"] != table_name
+                or state["total_segments"] != total_segments
+            ):
+                raise ValueError(
+                    f"Checkpoint {path} belongs to a scan of "
+                    f"{state['table_name']} with "
+                    f"{state['total_segments']} segments"
+                )
+            if state.get("request_hash") != request_hash:
+                raise ValueError(
+                    f"Checkpoint {path} belongs to a scan with a different "
+                    "filter, projection or other request parameters"
+                )
+            self._state = state
+
+    def _segment(self, segment: int) -> Dict:
+        return self._state["segments"][str(segment)]
+
+    def is_done(self, segment: int) -> bool:
+        return self._segment(segment)["done"]
+
+    def start_key(self, segment: int) -> Optional[Dict]:
+        return _decode_key(self._segment(segment)["last_evaluated_key"])
+
+    def update(self, segment: int, last_evaluated_key: Optional[Dict]):
+        with self._lock:
+            self._state["segments"][str(segment)] = {
+                "done": last_evaluated_key is None,
+                "last_evaluated_key": _encode_key(last_evaluated_key),
+            }
+
+    def save(self) -> None:
+        with self._lock:
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as checkpoint_file:
+                json.dump(self._state, checkpoint_file)
+            os.replace(temp_path, self.path)
+
+    def complete(self) -> bool:
+        return all(
+            segment["done"] for segment in self._state["segments"].values()
+        )
+
+    def remove(self) -> None:
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def _to_number(value: str) -> Any:
+    """Convert a DynamoDB number string to an int or a float."""
+    if "." in value or "e" in value or "E" in value:
+        return float(value)
+    return int(value)
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _null(_value: Any) -> None:
+    return None
+
+
+def _make_deserializer(
+    number: Callable[[str], Any], collection: Callable = set
+) -> Callable:
+    """
+    Build an attribute value deserializer around a precompiled per-type
+    dispatch table. Strings and numbers, the most common types, are
+    checked before falling back to the table. `collection` builds the
+    value of SS, NS and BS attributes.
+    """
+
+    def deserialize(value: Dict) -> Any:
+        for type_, data in value.items():
+            if type_ == "S":
+                return data
+            if type_ == "N":
+                return number(data)
+            return dispatch[type_](data)
+
+    dispatch = {
+        "B": _identity,
+        "BOOL": _identity,
+        "NULL": _null,
+        "SS": collection,
+        "NS": lambda values: collection(number(v) for v in values),
+        "BS": collection,
+        "L": lambda values: [deserialize(v) for v in values],
+        "M": lambda values: {k: deserialize(v) for k, v in values.items()},
+    }
+    return deserialize
+
+
+def _item_deserializer(deserialize: Callable) -> Callable:
+    """Wrap an attribute value deserializer to convert whole items."""
+
+    def deserialize_attributes(item: Dict) -> Dict:
+        return {key: deserialize(value) for key, value in item.items()}
+
+    return deserialize_attributes
+
+
+_DECIMAL_DESERIALIZER = _item_deserializer(_make_deserializer(Decimal))
+_FLOAT_DESERIALIZER = _item_deserializer(_make_deserializer(_to_number))
+
+# Columnar formats have no set type, so sets are exported as sorted
+# lists.
+_COLUMN_DESERIALIZERS = {
+    False: _make_deserializer(Decimal, sorted),
+    True: _make_deserializer(_to_number, sorted),
+}
+
+
+def _converter(deserialize: bool, use_float: bool) -> Optional[Callable]:
+    """Pick the item converter for the given deserialization options."""
+    if not deserialize:
+        return None
+    return _FLOAT_DESERIALIZER if use_float else _DECIMAL_DESERIALIZER
+
+
+def deserialize_item(item: Dict, use_float: bool = False) -> Dict:
+    """
+    Convert an item from DynamoDB attribute value format to plain Python.
+
+    This produces the same values as boto3's `TypeDeserializer`, except
+    that binary values are returned as `bytes`, at roughly twice the
+    speed.
+
+    Args:
+        item: The item in DynamoDB attribute value format, e.g.
+            {"id": {"S": "1"}, "qty": {"N": "3"}}.
+        use_float: Return numbers as int (for integral values) or float
+            instead of Decimal. Defaults to False.
+
+    Returns:
+        The item with native Python values.
+
+    Examples:
+        >>> deserialize_item({"id": {"S": "1"}, "qty": {"N": "3"}})
+        {'id': '1', 'qty': Decimal('3')}
+
+        >>> deserialize_item({"qty": {"N": "3.5"}}, use_float=True)
+        {'qty': 3.5}
+    """
+    return _converter(True, use_float)(item)
+
+
+def _paginate(
+    operation,
+    request: dict,
+    exclusive_start_key: Optional[Dict] = None,
+    converter: Optional[Callable] = None,
+    rate_limiter: Optional[CapacityRateLimiter] = None,
+) -> Iterator[DynamoDBPage]:
+    """
+    Call a paginated DynamoDB read operation until it is exhausted.
+
+    Only the current response is held in memory; running counters are
+    carried forward on each yielded page. If given, `converter` is
+    applied to every item and `rate_limiter` paces each request by the
+    capacity the previous ones consumed.
+    """
+    last_evaluated_key = exclusive_start_key
+    total_count = 0
+    total_scanned_count = 0
+    if rate_limiter is not None:
+        request = {"ReturnConsumedCapacity": "TOTAL", **request}
+
+    while True:
+        kwargs = dict(request)
+        if last_evaluated_key:
+            kwargs["ExclusiveStartKey"] = last_evaluated_key
+
+        if rate_limiter is not None:
+            rate_limiter.acquire()
+        response = operation(**kwargs)
+        if rate_limiter is not None:
+            rate_limiter.consume(
+                _consumed_units(response.get("ConsumedCapacity"))
+            )
+        count = response.get("Count", 0)
+        scanned_count = response.get("ScannedCount", 0)
+        total_count += count
+        total_scanned_count += scanned_count
+        last_evaluated_key = response.get("LastEvaluatedKey")
+        items = response.get("Items", [])
+        if converter is not None:
+            items = [converter(item) for item in items]
+
+        yield DynamoDBPage(
+            items=items,
+            count=count,
+            scanned_count=scanned_count,
+            total_count=total_count,
+            total_scanned_count=total_scanned_count,
+            last_evaluated_key=last_evaluated_key,
+            consumed_capacity=response.get("ConsumedCapacity"),
+        )
+
+        if not last_evaluated_key:
+            break
+
+
+def _add_expression_attributes(
+    request: dict,
+    expression_attr_val: Optional[dict],
+    expression_attr_names: Optional[dict],
+) -> None:
+    """
+    Add expression attribute values and names to a request, but only if
+    it has an expression that can use them, since DynamoDB rejects
+    unused substitutions.
+    """
+    uses_values = (
+        "FilterExpression" in request or "KeyConditionExpression" in request
+    )
+    if expression_attr_val and uses_values:
+        request["ExpressionAttributeValues"] = expression_attr_val
+    if expression_attr_names and (
+        uses_values or "ProjectionExpression" in request
+    ):
+        request["ExpressionAttributeNames"] = expression_attr_names
+
+
+def _scan_request(
+    table_name: str,
+    filter_expression: Optional[str] = None,
+    expression_attr_val: Optional[dict] = None,
+    projection_expression: Optional[str] = None,
+    expression_attr_names: Optional[dict] = None,
+    select: Optional[str] = None,
+    limit: Optional[int] = None,
+    segment: Optional[int] = None,
+    total_segments: Optional[int] = None,
+) -> dict:
+    """Build the keyword arguments for a DynamoDB Scan request."""
+    request = {"TableName": table_name}
+    if filter_expression:
+        request["FilterExpression"] = filter_expression
+    if projection_expression:
+        request["ProjectionExpression"] = projection_expression
+    _add_expression_attributes(
+        request, expression_attr_val, expression_attr_names
+    )
+    if select:
+        request["Select"] = select
+    if limit:
+        request["Limit"] = limit
+    if total_segments:
+        request["Segment"] = segment or 0
+        request["TotalSegments"] = total_segments
+    return request
+
+
+def _query_request(
+    table_name: str,
+    key_condition_expression: str,
+    expression_attr_val: Optional[dict] = None,
+    index_name: Optional[str] = None,
+    filter_expression: Optional[str] = None,
+    projection_expression: Optional[str] = None,
+    expression_attr_names: Optional[dict] = None,
+    select: Optional[str] = None,
+    limit: Optional[int] = None,
+    scan_index_forward: bool = True,
+    consistent_read: bool = False,
+) -> dict:
+    """Build the keyword arguments for a DynamoDB Query request."""
+    request = _scan_request(
+        table_name,
+        filter_expression,
+        None,
+        projection_expression,
+        None,
+        select,
+        limit,
+    )
+    request["KeyConditionExpression"] = key_condition_expression
+    _add_expression_attributes(
+        request, expression_attr_val, expression_attr_names
+    )
+    if index_name:
+        request["IndexName"] = index_name
+    if not scan_index_forward:
+        request["ScanIndexForward"] = False
+    if consistent_read:
+        request["ConsistentRead"] = True
+    return request
+
+
+@pivot_exceptions
+def _provisioned_read_capacity(
+    dynamodb_client: boto3.client, table_name: str
+) -> float:
+    """Return a table's provisioned read capacity units."""
+    response = dynamodb_client.describe_table(TableName=table_name)
+    throughput = response["Table"].get("ProvisionedThroughput", {})
+    read_capacity = throughput.get("ReadCapacityUnits", 0)
+    if not read_capacity:
+        raise ValueError(
+            f"Table {table_name} has no provisioned read capacity"
+        )
+    return read_capacity
+
+
+def read_capacity_limiter(
+    table_name: str,
+    fraction: float,
+    dynamodb_client: Optional[boto3.client] = None,
+) -> CapacityRateLimiter:
+    """
+    Create a rate limiter targeting a fraction of a table's provisioned
+    read capacity.
+
+    Args:
+        table_name: The name of the DynamoDB table.
+        fraction: Share of the provisioned read capacity units to use,
+            between 0 and 1.
+        dynamodb_client: A boto3 DynamoDB client to use for the
+            operation. If None, the default client will be used.
+            Defaults to None.
+
+    Returns:
+        A CapacityRateLimiter to pass to `scan`, `scan_pages` or
+        `scan_items`.
+
+    Raises:
+        ValueError: If `fraction` is not between 0 and 1.
+        AwsError: If the table has no provisioned read capacity (e.g.
+            on-demand tables); construct a CapacityRateLimiter with an
+            explicit rate instead.
+
+    Examples:
+        >>> limiter = read_capacity_limiter("my-table", 0.2)
+        >>> scan("my-table", total_segments=4, rate_limiter=limiter)
+        DynamoDBScanOutput(items=[...], ...)
+    """
+    if dynamodb_client is None:
+        dynamodb_client = client
+
+    if not 0 < fraction <= 1:
+        raise ValueError("fraction must be between 0 and 1")
+
+    read_capacity = _provisioned_read_capacity(dynamodb_client, table_name)
+    return CapacityRateLimiter(rate=read_capacity * fraction)
+
+
 @pivot_exceptions
 def scan(
     table_name: str,
     filter_expression: Optional[str] = None,
     expression_attr_val: Optional[dict] = None,
+    projection_expression: Optional[str] = None,
+    expression_attr_names: Optional[dict] = None,
+    select: Optional[str] = None,
+    limit: Optional[int] = None,
+    total_segments: Optional[int] = None,
+    rate_limiter: Optional[CapacityRateLimiter] = None,
+    exclusive_start_key: Optional[Dict] = None,
+    max_pages: Optional[int] = None,
+    time_budget: Optional[float] = None,
+    checkpoint_path: Optional[str] = None,
+    checkpoint_interval: int = CHECKPOINT_INTERVAL,
+    deserialize: bool = False,
+    use_float: bool = False,
+    max_workers: int = SCAN_MAX_WORKERS,
     dynamodb_client: Optional[boto3.client] = None,
 ) -> DynamoDBScanOutput:
     """
@@ -28,7 +558,9 @@ def scan(
 
     This function performs a complete scan of a DynamoDB table, handling
     pagination automatically to retrieve all items that match the
-    provided filter expression.
+    provided filter expression. Raw page responses are not retained, so
+    memory use is bounded by the items returned. Use `scan_pages` or
+    `scan_items` to avoid holding the items as well.
 
     Args:
         table_name: The name of the DynamoDB table to scan.
@@ -36,13 +568,52 @@ def scan(
             Defaults to None.
         expression_attr_val: A dictionary of expression attribute
             values for the filter expression. Defaults to None.
+        projection_expression: Attributes to return for each item,
+            e.g. "id, #st". Defaults to None (all attributes).
+        expression_attr_names: Substitution tokens for attribute
+            names used in expressions. Defaults to None.
+        select: Attributes to be returned, e.g. "COUNT" to return only
+            counts and no items. Defaults to None.
+        limit: Maximum number of items evaluated per request (page
+            size). Defaults to None.
+        total_segments: Split the scan into this many segments and scan
+            them concurrently. Defaults to None (a single sequential
+            scan).
+        rate_limiter: Paces requests by consumed read capacity. Shared
+            by all segments of a parallel scan. Defaults to None.
+        exclusive_start_key: Resume a sequential scan from this
+            `last_evaluated_key`. Defaults to None.
+        max_pages: Stop once this many pages have been read across all
+            segments. Checked after each page, so parallel segments may
+            each read one page more. Defaults to None (no limit).
+        time_budget: Stop once this many seconds have elapsed, checked
+            after each page. A sequential scan always reads at least
+            one page. Defaults to None (no limit).
+        checkpoint_path: Local file in which each segment's progress is
+            saved. An existing checkpoint is resumed from if it was
+            written by the same scan (table, segment count and request
+            parameters), and rejected otherwise. The file is removed
+            once the scan completes. Cannot be combined with
+            `exclusive_start_key`. Defaults to None.
+        checkpoint_interval: Pages read by a segment between checkpoint
+            writes. Defaults to CHECKPOINT_INTERVAL.
+        deserialize: Convert items to plain Python values with
+            `deserialize_item`. Defaults to False.
+        use_float: When deserializing, return numbers as int or float
+            instead of Decimal. Defaults to False.
+        max_workers: Maximum number of segments scanned at once.
+            Defaults to SCAN_MAX_WORKERS.
         dynamodb_client: A boto3 DynamoDB client to use for the
             operation. If None, the default client will be used.
             Defaults to None.
 
     Returns:
         An object containing the scan results, including items, count,
-        scanned count, and other metadata.
+        scanned count, and other metadata. Items, counts and consumed
+        capacity cover every page read by this call, but not pages read
+        before a resumed checkpoint. If the
+        scan stopped early, `last_evaluated_key` (or `segment_keys` for
+        a parallel scan) holds the key to resume from.
 
     Examples:
         >>> scan("my-table")
@@ -54,39 +625,1272 @@ def scan(
         ...     expression_attr_val={":value": {"S": "example"}}
         ... )
         DynamoDBScanOutput(items=[...], count=5, scanned_count=10, ...)
+
+        >>> scan("my-table", select="COUNT")
+        DynamoDBScanOutput(items=[], count=10, scanned_count=10, ...)
+
+        >>> scan(
+        ...     "my-table",
+        ...     projection_expression="id, #st",
+        ...     expression_attr_names={"#st": "status"},
+        ... )
+        DynamoDBScanOutput(items=[...], count=10, scanned_count=10, ...)
+
+        >>> scan(
+        ...     "my-table",
+        ...     total_segments=8,
+        ...     time_budget=3600,
+        ...     checkpoint_path="my-table.scan.json",
+        ... )
+        DynamoDBScanOutput(items=[...], segment_keys={3: {...}}, ...)
     """
     if dynamodb_client is None:
         dynamodb_client = client
 
-    items = []
-    responses = []
-    last_evaluated_key = None
+    parallel = bool(total_segments and total_segments > 1)
+    if parallel and exclusive_start_key:
+        raise ValueError(
+            "exclusive_start_key cannot be used with a parallel scan; "
+            "use checkpoint_path to resume segments"
+        )
+    if checkpoint_path and exclusive_start_key:
+        raise ValueError(
+            "exclusive_start_key cannot be used with checkpoint_path; "
+            "the checkpoint records where to resume"
+        )
 
-    while True:
-        if filter_expression:
-            scan_kwargs = {
-                "TableName": table_name,
-                "FilterExpression": filter_expression,
-                "ExpressionAttributeValues": expression_attr_val,
-            }
+    converter = _converter(deserialize, use_float)
+    checkpoint = (
+        _ScanCheckpoint(
+            checkpoint_path,
+            table_name,
+            total_segments or 1,
+            _scan_request(
+                table_name,
+                filter_expression,
+                expression_attr_val,
+                projection_expression,
+                expression_attr_names,
+                select,
+                limit,
+            ),
+        )
+        if checkpoint_path
+        else None
+    )
+    deadline = (
+        time.monotonic() + time_budget if time_budget is not None else None
+    )
+    pages_read = [0]
+    budget_lock = threading.Lock()
+
+    def budget_exhausted() -> bool:
+        if deadline is not None and time.monotonic() >= deadline:
+            return True
+        with budget_lock:
+            return max_pages is not None and pages_read[0] >= max_pages
+
+    def scan_segment(segment: Optional[int]) -> tuple:
+        index = segment or 0
+        if checkpoint is not None:
+            if checkpoint.is_done(index):
+                return [], None, None, True, None
+            start_key = checkpoint.start_key(index)
         else:
-            scan_kwargs = {"TableName": table_name}
+            start_key = exclusive_start_key
 
-        if last_evaluated_key:
-            scan_kwargs["ExclusiveStartKey"] = last_evaluated_key
+        items = []
+        page = None
+        consumed = None
+        if parallel and budget_exhausted():
+            return items, page, start_key, False, consumed
 
-        response = dynamodb_client.scan(**scan_kwargs)
-        responses.append(response)
-        items.extend(response.get("Items", []))
+        unsaved_pages = 0
+        for page in _paginate(
+            dynamodb_client.scan,
+            _scan_request(
+                table_name,
+                filter_expression,
+                expression_attr_val,
+                projection_expression,
+                expression_attr_names,
+                select,
+                limit,
+                segment,
+                total_segments,
+            ),
+            exclusive_start_key=start_key,
+            converter=converter,
+            rate_limiter=rate_limiter,
+        ):
+            items.extend(page.items)
+            consumed = _add_capacity(consumed, page.consumed_capacity)
+            with budget_lock:
+                pages_read[0] += 1
 
-        last_evaluated_key = response.get("LastEvaluatedKey")
-        if not last_evaluated_key:
-            break
+            if checkpoint is not None:
+                checkpoint.update(index, page.last_evaluated_key)
+                unsaved_pages += 1
+                if unsaved_pages >= checkpoint_interval:
+                    checkpoint.save()
+                    unsaved_pages = 0
+
+            if page.last_evaluated_key and budget_exhausted():
+                break
+        return (
+            items,
+            page,
+            page.last_evaluated_key,
+            not page.last_evaluated_key,
+            consumed,
+        )
+
+    try:
+        if parallel:
+            with ThreadPoolExecutor(
+                max_workers=min(max_workers, total_segments)
+            ) as executor:
+                results = list(
+                    executor.map(scan_segment, range(total_segments))
+                )
+        else:
+            results = [scan_segment(None)]
+    finally:
+        # Persist progress even if a segment failed, so a retry resumes
+        # rather than starting over.
+        if checkpoint is not None and not checkpoint.complete():
+            checkpoint.save()
+
+    if checkpoint is not None and checkpoint.complete():
+        checkpoint.remove()
+
+    items = []
+    consumed_capacity = None
+    for segment_items, _, _, _, consumed in results:
+        items.extend(segment_items)
+        consumed_capacity = _add_capacity(consumed_capacity, consumed)
+    pages = [page for _, page, _, _, _ in results if page is not None]
+    segment_keys = {
+        segment: key
+        for segment, (_, _, key, done, _) in enumerate(results)
+        if not done
+    }
 
     return DynamoDBScanOutput(
         items=items,
-        count=sum(resp.get("Count", 0) for resp in responses),
-        scanned_count=sum(resp.get("ScannedCount", 0) for resp in responses),
-        last_evaluated_key=last_evaluated_key,
-        consumed_capacity=response.get("ConsumedCapacity"),
+        count=sum(page.total_count for page in pages),
+        scanned_count=sum(page.total_scanned_count for page in pages),
+        last_evaluated_key=None if parallel else results[0][2],
+        consumed_capacity=consumed_capacity,
+        segment_keys=segment_keys if parallel else None,
     )
+
+
+@pivot_exceptions
+def scan_pages(
+    table_name: str,
+    filter_expression: Optional[str] = None,
+    expression_attr_val: Optional[dict] = None,
+    projection_expression: Optional[str] = None,
+    expression_attr_names: Optional[dict] = None,
+    select: Optional[str] = None,
+    limit: Optional[int] = None,
+    segment: Optional[int] = None,
+    total_segments: Optional[int] = None,
+    rate_limiter: Optional[CapacityRateLimiter] = None,
+    exclusive_start_key: Optional[Dict] = None,
+    deserialize: bool = False,
+    use_float: bool = False,
+    dynamodb_client: Optional[boto3.client] = None,
+) -> Iterator[DynamoDBPage]:
+    """
+    Scan a DynamoDB table, yielding each page as it arrives.
+
+    Only one page is held in memory at a time. Each page carries running
+    `total_count` and `total_scanned_count` counters for the scan so far.
+    Takes the same arguments as `scan`, except that a single `segment`
+    of a parallel scan is read rather than all of them.
+
+    Args:
+        table_name: The name of the DynamoDB table to scan.
+        segment: The segment to read when `total_segments` is set.
+            Defaults to None (segment 0).
+        total_segments: Total number of segments the table is split
+            into by the caller. Defaults to None.
+        rate_limiter: Paces requests by consumed read capacity; share
+            one limiter between threads reading different segments.
+            Defaults to None.
+        exclusive_start_key: Resume from the `last_evaluated_key` of a
+            previously yielded page. Defaults to None.
+
+    Yields:
+        A DynamoDBPage for every Scan response.
+
+    Examples:
+        >>> for page in scan_pages("my-table"):
+        ...     process(page.items)
+        ...     print(page.total_scanned_count)
+    """
+    if dynamodb_client is None:
+        dynamodb_client = client
+
+    yield from _paginate(
+        dynamodb_client.scan,
+        _scan_request(
+            table_name,
+            filter_expression,
+            expression_attr_val,
+            projection_expression,
+            expression_attr_names,
+            select,
+            limit,
+            segment,
+            total_segments,
+        ),
+        exclusive_start_key=exclusive_start_key,
+        converter=_converter(deserialize, use_float),
+        rate_limiter=rate_limiter,
+    )
+
+
+@pivot_exceptions
+def scan_items(
+    table_name: str,
+    filter_expression: Optional[str] = None,
+    expression_attr_val: Optional[dict] = None,
+    projection_expression: Optional[str] = None,
+    expression_attr_names: Optional[dict] = None,
+    select: Optional[str] = None,
+    limit: Optional[int] = None,
+    segment: Optional[int] = None,
+    total_segments: Optional[int] = None,
+    rate_limiter: Optional[CapacityRateLimiter] = None,
+    exclusive_start_key: Optional[Dict] = None,
+    deserialize: bool = False,
+    use_float: bool = False,
+    dynamodb_client: Optional[boto3.client] = None,
+) -> Iterator[Dict]:
+    """
+    Scan a DynamoDB table, yielding items one at a time.
+
+    Takes the same arguments as `scan_pages`.
+
+    Yields:
+        Each item returned by the scan.
+    """
+    if dynamodb_client is None:
+        dynamodb_client = client
+
+    for page in _paginate(
+        dynamodb_client.scan,
+        _scan_request(
+            table_name,
+            filter_expression,
+            expression_attr_val,
+            projection_expression,
+            expression_attr_names,
+            select,
+            limit,
+            segment,
+            total_segments,
+        ),
+        exclusive_start_key=exclusive_start_key,
+        converter=_converter(deserialize, use_float),
+        rate_limiter=rate_limiter,
+    ):
+        yield from page.items
+
+
+@pivot_exceptions
+def query(
+    table_name: str,
+    key_condition_expression: str,
+    expression_attr_val: Optional[dict] = None,
+    index_name: Optional[str] = None,
+    filter_expression: Optional[str] = None,
+    projection_expression: Optional[str] = None,
+    expression_attr_names: Optional[dict] = None,
+    select: Optional[str] = None,
+    limit: Optional[int] = None,
+    scan_index_forward: bool = True,
+    consistent_read: bool = False,
+    deserialize: bool = False,
+    use_float: bool = False,
+    dynamodb_client: Optional[boto3.client] = None,
+) -> DynamoDBQueryOutput:
+    """
+    Query a DynamoDB table or secondary index by key.
+
+    This function handles pagination automatically to retrieve all items
+    matching the key condition.
+
+    Args:
+        table_name: The name of the DynamoDB table to query.
+        key_condition_expression: The key condition, e.g.
+            "pk = :pk AND begins_with(sk, :prefix)".
+        expression_attr_val: A dictionary of expression attribute
+            values for the key condition and filter expressions.
+            Defaults to None.
+        index_name: Name of a global or local secondary index to query.
+            Defaults to None (the base table).
+        filter_expression: A filter expression applied after the key
+            condition. Defaults to None.
+        projection_expression: Attributes to return for each item.
+            Defaults to None (all attributes).
+        expression_attr_names: Substitution tokens for attribute
+            names used in expressions. Defaults to None.
+        select: Attributes to be returned, e.g. "COUNT". Defaults to
+            None.
+        limit: Maximum number of items evaluated per request (page
+            size). Defaults to None.
+        scan_index_forward: Whether to return items in ascending sort
+            key order. Defaults to True.
+        consistent_read: Whether to use strongly consistent reads. Not
+            supported on global secondary indexes. Defaults to False.
+        deserialize: Convert items to plain Python values with
+            `deserialize_item`. Defaults to False.
+        use_float: When deserializing, return numbers as int or float
+            instead of Decimal. Defaults to False.
+        dynamodb_client: A boto3 DynamoDB client to use for the
+            operation. If None, the default client will be used.
+            Defaults to None.
+
+    Returns:
+        An object containing the query results, including items, count,
+        scanned count, and other metadata.
+
+    Examples:
+        >>> query(
+        ...     "my-table",
+        ...     "pk = :pk",
+        ...     expression_attr_val={":pk": {"S": "user#1"}},
+        ... )
+        DynamoDBQueryOutput(items=[...], count=3, scanned_count=3, ...)
+
+        >>> query(
+        ...     "my-table",
+        ...     "email = :email",
+        ...     expression_attr_val={":email": {"S": "a@example.com"}},
+        ...     index_name="email-index",
+        ... )
+        DynamoDBQueryOutput(items=[...], count=1, scanned_count=1, ...)
+    """
+    if dynamodb_client is None:
+        dynamodb_client = client
+
+    items = []
+    page = None
+    for page in _paginate(
+        dynamodb_client.query,
+        _query_request(
+            table_name,
+            key_condition_expression,
+            expression_attr_val,
+            index_name,
+            filter_expression,
+            projection_expression,
+            expression_attr_names,
+            select,
+            limit,
+            scan_index_forward,
+            consistent_read,
+        ),
+        converter=_converter(deserialize, use_float),
+    ):
+        items.extend(page.items)
+
+    return DynamoDBQueryOutput(
+        items=items,
+        count=page.total_count,
+        scanned_count=page.total_scanned_count,
+        last_evaluated_key=page.last_evaluated_key,
+        consumed_capacity=page.consumed_capacity,
+    )
+
+
+@pivot_exceptions
+def query_pages(
+    table_name: str,
+    key_condition_expression: str,
+    expression_attr_val: Optional[dict] = None,
+    index_name: Optional[str] = None,
+    filter_expression: Optional[str] = None,
+    projection_expression: Optional[str] = None,
+    expression_attr_names: Optional[dict] = None,
+    select: Optional[str] = None,
+    limit: Optional[int] = None,
+    scan_index_forward: bool = True,
+    consistent_read: bool = False,
+    deserialize: bool = False,
+    use_float: bool = False,
+    dynamodb_client: Optional[boto3.client] = None,
+) -> Iterator[DynamoDBPage]:
+    """
+    Query a DynamoDB table or index, yielding each page as it arrives.
+
+    Takes the same arguments as `query`. Only one page is held in memory
+    at a time, and each page carries running counters.
+
+    Yields:
+        A DynamoDBPage for every Query response.
+
+    Examples:
+        >>> for page in query_pages(
+        ...     "my-table",
+        ...     "pk = :pk",
+        ...     expression_attr_val={":pk": {"S": "user#1"}},
+        ...     scan_index_forward=False,
+        ... ):
+        ...     process(page.items)
+    """
+    if dynamodb_client is None:
+        dynamodb_client = client
+
+    yield from _paginate(
+        dynamodb_client.query,
+        _query_request(
+            table_name,
+            key_condition_expression,
+            expression_attr_val,
+            index_name,
+            filter_expression,
+            projection_expression,
+            expression_attr_names,
+            select,
+            limit,
+            scan_index_forward,
+            consistent_read,
+        ),
+        converter=_converter(deserialize, use_float),
+    )
+
+
+def _chunked(iterable: Iterable, size: int) -> Iterator[List]:
+    """Split an iterable into lists of at most `size` elements."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _run_batches(
+    func: Callable, chunks: Iterator[List], max_workers: int
+) -> Iterator:
+    """
+    Run `func` over chunks concurrently, keeping a bounded number in
+    flight so arbitrarily large inputs are never fully materialized.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = []
+        for chunk in chunks:
+            pending.append(executor.submit(func, chunk))
+            if len(pending) >= max_workers * 2:
+                yield pending.pop(0).result()
+        for future in pending:
+            yield future.result()
+
+
+def _batch_get_chunk(
+    dynamodb_client: boto3.client,
+    table_name: str,
+    keys: List[Dict],
+    request_options: dict,
+    max_attempts: int,
+) -> tuple:
+    """Fetch one chunk of keys, retrying UnprocessedKeys with backoff."""
+    items = []
+    request_items = {table_name: {"Keys": keys, **request_options}}
+
+    for attempt in range(1, max_attempts + 1):
+        response = dynamodb_client.batch_get_item(RequestItems=request_items)
+        items.extend(response.get("Responses", {}).get(table_name, []))
+        request_items = response.get("UnprocessedKeys") or {}
+        if not request_items or attempt == max_attempts:
+            break
+        time.sleep(backoff_delay(attempt))
+
+    unprocessed = request_items.get(table_name, {}).get("Keys", [])
+    return items, unprocessed
+
+
+def _batch_write_chunk(
+    dynamodb_client: boto3.client,
+    table_name: str,
+    write_requests: List[Dict],
+    max_attempts: int,
+) -> tuple:
+    """Apply one chunk of writes, retrying UnprocessedItems with backoff."""
+    request_items = {table_name: write_requests}
+
+    for attempt in range(1, max_attempts + 1):
+        response = dynamodb_client.batch_write_item(RequestItems=request_items)
+        request_items = response.get("UnprocessedItems") or {}
+        if not request_items or attempt == max_attempts:
+            break
+        time.sleep(backoff_delay(attempt))
+
+    unprocessed = request_items.get(table_name, [])
+    return len(write_requests) - len(unprocessed), unprocessed
+
+
+def _hashable_key(key: Dict) -> tuple:
+    """Build a hashable form of a primary key."""
+    return tuple(
+        (name, type_, value)
+        for name, attribute in sorted(key.items())
+        for type_, value in attribute.items()
+    )
+
+
+def _cache_key(table_name: str, key: Dict) -> tuple:
+    """Build a hashable cache key for a table and primary key."""
+    return table_name, _hashable_key(key)
+
+
+def _unique_keys(keys: Iterable[Dict]) -> Iterator[Dict]:
+    """Yield primary keys, skipping any seen before."""
+    seen = set()
+    for key in keys:
+        hashable = _hashable_key(key)
+        if hashable not in seen:
+            seen.add(hashable)
+            yield key
+
+
+def _key_attribute_names(
+    dynamodb_client: boto3.client, table_name: str
+) -> List[str]:
+    """Return the names of a table's primary key attributes."""
+    response = dynamodb_client.describe_table(TableName=table_name)
+    return [
+        attribute["AttributeName"]
+        for attribute in response["Table"]["KeySchema"]
+    ]
+
+
+def _match_items(
+    table_name: str,
+    keys: List[Dict],
+    unprocessed: List[Dict],
+    raw_items: List[Dict],
+    items: List,
+) -> Optional[Dict]:
+    """
+    Map the cache key of each processed key to its fetched item, or to
+    None if it has no item. Returns None if the raw items lack key
+    attributes and so cannot be matched to their keys.
+    """
+    key_names = sorted(keys[0])
+    matched = {_cache_key(table_name, key): None for key in keys}
+    for key in unprocessed:
+        matched.pop(_cache_key(table_name, key), None)
+    for raw_item, item in zip(raw_items, items):
+        if not all(name in raw_item for name in key_names):
+            return None
+        cache_key = _cache_key(
+            table_name, {name: raw_item[name] for name in key_names}
+        )
+        matched[cache_key] = item
+    return matched
+
+
+@pivot_exceptions
+def get_item(
+    table_name: str,
+    key: Dict,
+    projection_expression: Optional[str] = None,
+    expression_attr_names: Optional[dict] = None,
+    consistent_read: bool = False,
+    deserialize: bool = False,
+    use_float: bool = False,
+    cache: Optional[TTLCache] = None,
+    dynamodb_client: Optional[boto3.client] = None,
+) -> DynamoDBGetItemOutput:
+    """
+    Fetch a single item by primary key.
+
+    With a `cache`, reads are served from memory until the entry
+    expires, missing items are cached as None, and concurrent misses
+    for the same key, including those from `batch_get_item`, share one
+    read. Each caller gets its own copy of a cached item. A cache
+    stores whatever the read returned, so use one cache per table and
+    read shape (projection and deserialization options). Call
+    `invalidate_item` after writing an item to drop its cached copy.
+
+    Args:
+        table_name: The name of the DynamoDB table.
+        key: The primary key, in DynamoDB attribute value format.
+        projection_expression: Attributes to return. Defaults to None
+            (all attributes).
+        expression_attr_names: Substitution tokens for attribute names
+            used in the projection expression. Defaults to None.
+        consistent_read: Whether to use a strongly consistent read.
+            Ignored for cache hits. Defaults to False.
+        deserialize: Convert the item to plain Python values with
+            `deserialize_item`. Defaults to False.
+        use_float: When deserializing, return numbers as int or float
+            instead of Decimal. Defaults to False.
+        cache: A TTLCache to read through. Defaults to None.
+        dynamodb_client: A boto3 DynamoDB client to use for the
+            operation. If None, the default client will be used.
+            Defaults to None.
+
+    Returns:
+        The item, or None if it does not exist, and whether it was read
+        by this call, served from the cache or read by a concurrent
+        call.
+
+    Examples:
+        >>> config_cache = TTLCache(ttl=30, maxsize=10000)
+        >>> get_item(
+        ...     "config",
+        ...     {"pk": {"S": "feature-flags"}},
+        ...     deserialize=True,
+        ...     cache=config_cache,
+        ... )
+        DynamoDBGetItemOutput(item={'pk': 'feature-flags', ...}, ...)
+    """
+    if dynamodb_client is None:
+        dynamodb_client = client
+
+    request = {"TableName": table_name, "Key": key}
+    if projection_expression:
+        request["ProjectionExpression"] = projection_expression
+    _add_expression_attributes(request, None, expression_attr_names)
+    if consistent_read:
+        request["ConsistentRead"] = True
+    converter = _converter(deserialize, use_float)
+
+    def load() -> DynamoDBGetItemOutput:
+        response = dynamodb_client.get_item(**request)
+        item = response.get("Item")
+        if item is not None and converter is not None:
+            item = converter(item)
+        return DynamoDBGetItemOutput(
+            item=item, consumed_capacity=response.get("ConsumedCapacity")
+        )
+
+    if cache is None:
+        return load()
+
+    loaded = []
+
+    def load_item() -> Optional[Dict]:
+        output = load()
+        loaded.append(output)
+        return output.item
+
+    item, status = cache.get_or_load_with_status(
+        _cache_key(table_name, key), load_item
+    )
+    # Cached items are shared between callers, so hand out a copy.
+    item = copy.deepcopy(item)
+    if status == "loaded":
+        return DynamoDBGetItemOutput(
+            item=item, consumed_capacity=loaded[0].consumed_capacity
+        )
+    return DynamoDBGetItemOutput(
+        item=item, source="coalesced" if status == "shared" else "cache"
+    )
+
+
+def invalidate_item(cache: TTLCache, table_name: str, key: Dict) -> None:
+    """
+    Drop an item from a cache used with `get_item` or `batch_get_item`.
+
+    Call this from write paths after putting, updating or deleting an
+    item so the next read fetches the new version.
+
+    Args:
+        cache: The cache passed to the read functions.
+        table_name: The name of the DynamoDB table.
+        key: The primary key, in DynamoDB attribute value format.
+    """
+    cache.invalidate(_cache_key(table_name, key))
+
+
+@pivot_exceptions
+def batch_get_item(
+    table_name: str,
+    keys: Iterable[Dict],
+    projection_expression: Optional[str] = None,
+    expression_attr_names: Optional[dict] = None,
+    consistent_read: bool = False,
+    max_workers: int = 4,
+    max_attempts: int = BATCH_MAX_ATTEMPTS,
+    deserialize: bool = False,
+    use_float: bool = False,
+    cache: Optional[TTLCache] = None,
+    dynamodb_client: Optional[boto3.client] = None,
+) -> DynamoDBBatchGetOutput:
+    """
+    Fetch many items by primary key using BatchGetItem.
+
+    Keys are split into batches of 100, batches run concurrently, and
+    `UnprocessedKeys` are retried with jittered exponential backoff.
+    Repeated keys are only fetched once.
+
+    Args:
+        table_name: The name of the DynamoDB table.
+        keys: Primary keys of the items to fetch, in DynamoDB attribute
+            value format. Any iterable is accepted.
+        projection_expression: Attributes to return for each item.
+            Defaults to None (all attributes).
+        expression_attr_names: Substitution tokens for attribute names
+            used in the projection expression. Defaults to None.
+        consistent_read: Whether to use strongly consistent reads.
+            Defaults to False.
+        max_workers: Number of batches to run concurrently. Defaults to
+            4.
+        max_attempts: Attempts per batch before remaining keys are
+            returned as unprocessed. Defaults to BATCH_MAX_ATTEMPTS.
+        deserialize: Convert items to plain Python values with
+            `deserialize_item`. Defaults to False.
+        use_float: When deserializing, return numbers as int or float
+            instead of Decimal. Defaults to False.
+        cache: Serve keys from, and store fetched items in, this cache
+            (see `get_item`). Keys already being read by a concurrent
+            call are waited on rather than fetched again. Items are
+            only cached if the projection includes their key
+            attributes. Defaults to None.
+        dynamodb_client: A boto3 DynamoDB client to use for the
+            operation. If None, the default client will be used.
+            Defaults to None.
+
+    Returns:
+        The fetched items (in no particular order) and any keys left
+        unprocessed after retries.
+
+    Examples:
+        >>> batch_get_item("my-table", [{"id": {"S": "1"}}])
+        DynamoDBBatchGetOutput(items=[...], unprocessed_keys=[])
+    """
+    if dynamodb_client is None:
+        dynamodb_client = client
+
+    request_options = {}
+    if projection_expression:
+        request_options["ProjectionExpression"] = projection_expression
+    _add_expression_attributes(request_options, None, expression_attr_names)
+    if consistent_read:
+        request_options["ConsistentRead"] = True
+
+    converter = _converter(deserialize, use_float)
+
+    def fetch(chunk: List[Dict]) -> tuple:
+        raw_items, unprocessed = _batch_get_chunk(
+            dynamodb_client, table_name, chunk, request_options, max_attempts
+        )
+        items = raw_items
+        if converter is not None:
+            items = [converter(item) for item in raw_items]
+        return raw_items, items, unprocessed
+
+    def fetch_cached(chunk: List[Dict]) -> tuple:
+        keys_by_cache_key = {_cache_key(table_name, key): key for key in chunk}
+        attempted = set()
+        unmatched = []
+        unprocessed = []
+
+        def load(cache_keys: List[tuple]) -> Dict:
+            attempted.update(cache_keys)
+            missed = [keys_by_cache_key[cache_key] for cache_key in cache_keys]
+            raw_items, items, missed_unprocessed = fetch(missed)
+            unprocessed.extend(missed_unprocessed)
+            matched = _match_items(
+                table_name, missed, missed_unprocessed, raw_items, items
+            )
+            if matched is None:
+                # Items without their key attributes are returned but
+                # cannot be cached.
+                unmatched.extend(items)
+                return {}
+            return matched
+
+        found = cache.get_or_load_many(keys_by_cache_key, load)
+        # Cached items are shared between callers, so hand out copies.
+        items = [
+            copy.deepcopy(item) for item in found.values() if item is not None
+        ]
+        items.extend(unmatched)
+        # Keys another caller was loading but left unprocessed.
+        unprocessed.extend(
+            key
+            for cache_key, key in keys_by_cache_key.items()
+            if cache_key not in found and cache_key not in attempted
+        )
+        return None, items, unprocessed
+
+    output = DynamoDBBatchGetOutput(items=[])
+    for _, items, unprocessed in _run_batches(
+        fetch if cache is None else fetch_cached,
+        _chunked(_unique_keys(keys), BATCH_GET_MAX_KEYS),
+        max_workers,
+    ):
+        output.items.extend(items)
+        output.unprocessed_keys.extend(unprocessed)
+    return output
+
+
+@pivot_exceptions
+def batch_write_item(
+    table_name: str,
+    put_items: Optional[Iterable[Dict]] = None,
+    delete_keys: Optional[Iterable[Dict]] = None,
+    max_workers: int = 4,
+    max_attempts: int = BATCH_MAX_ATTEMPTS,
+    key_names: Optional[List[str]] = None,
+    dynamodb_client: Optional[boto3.client] = None,
+) -> DynamoDBBatchWriteOutput:
+    """
+    Put and delete many items using BatchWriteItem.
+
+    Write requests are split into batches of 25, batches run
+    concurrently, and `UnprocessedItems` are retried with jittered
+    exponential backoff. If several requests target the same key, only
+    the last one is sent, with deletes counting as later than puts.
+    Because of this the requests are collected in memory before any
+    are sent.
+
+    Args:
+        table_name: The name of the DynamoDB table.
+        put_items: Items to put, in DynamoDB attribute value format.
+            Any iterable is accepted. Defaults to None.
+        delete_keys: Primary keys of items to delete. Any iterable is
+            accepted. Defaults to None.
+        max_workers: Number of batches to run concurrently. Defaults to
+            4.
+        max_attempts: Attempts per batch before remaining requests are
+            returned as unprocessed. Defaults to BATCH_MAX_ATTEMPTS.
+        key_names: Names of the table's primary key attributes, used
+            to find puts of the same item. If None, they are read with
+            DescribeTable when there are items to put. Defaults to
+            None.
+        dynamodb_client: A boto3 DynamoDB client to use for the
+            operation. If None, the default client will be used.
+            Defaults to None.
+
+    Returns:
+        The number of applied writes and any write requests left
+        unprocessed after retries.
+
+    Examples:
+        >>> batch_write_item("my-table", put_items=items)
+        DynamoDBBatchWriteOutput(processed_count=1000, ...)
+    """
+    if dynamodb_client is None:
+        dynamodb_client = client
+
+    # Keyed by primary key so later requests replace earlier ones.
+    write_requests = {}
+    for item in put_items or ():
+        if key_names is None:
+            key_names = _key_attribute_names(dynamodb_client, table_name)
+        key = {name: item[name] for name in key_names}
+        write_requests[_hashable_key(key)] = {"PutRequest": {"Item": item}}
+    for key in delete_keys or ():
+        write_requests[_hashable_key(key)] = {"DeleteRequest": {"Key": key}}
+
+    def write(chunk: List[Dict]) -> tuple:
+        return _batch_write_chunk(
+            dynamodb_client, table_name, chunk, max_attempts
+        )
+
+    output = DynamoDBBatchWriteOutput(processed_count=0)
+    for processed, unprocessed in _run_batches(
+        write,
+        _chunked(write_requests.values(), BATCH_WRITE_MAX_ITEMS),
+        max_workers,
+    ):
+        output.processed_count += processed
+        output.unprocessed_items.extend(unprocessed)
+    return output
+
+
+def _scan_columns(
+    dynamodb_client: boto3.client,
+    table_name: str,
+    columns: Optional[List[str]],
+    filter_expression: Optional[str],
+    expression_attr_val: Optional[dict],
+    expression_attr_names: Optional[dict],
+    rate_limiter: Optional[CapacityRateLimiter],
+    use_float: bool,
+) -> Iterator[Dict[str, List]]:
+    """
+    Scan a table and transpose each page straight from attribute value
+    format into per-column value lists, without building item dicts.
+    """
+    request = _scan_request(table_name, filter_expression, expression_attr_val)
+    names = dict(expression_attr_names or {})
+    if columns:
+        placeholders = []
+        for index, column in enumerate(columns):
+            placeholders.append(f"#col{index}")
+            names[f"#col{index}"] = column
+        request["ProjectionExpression"] = ", ".join(placeholders)
+    _add_expression_attributes(request, None, names)
+
+    deserialize = _COLUMN_DESERIALIZERS[use_float]
+    for page in _paginate(
+        dynamodb_client.scan, request, rate_limiter=rate_limiter
+    ):
+        if not page.items:
+            continue
+        if not columns:
+            columns = sorted({name for item in page.items for name in item})
+        yield {
+            column: [
+                deserialize(item[column]) if column in item else None
+                for item in page.items
+            ]
+            for column in columns
+        }
+
+
+def _numpy_column(numpy: ModuleType, values: List) -> Any:
+    """Convert one page of column values to a NumPy array."""
+    types = {type(value) for value in values}
+    if len(types) == 1 and types <= {bool, int, float, str, bytes}:
+        return numpy.array(values)
+    if types <= {type(None), int, float}:
+        return numpy.array(
+            [numpy.nan if value is None else value for value in values],
+            dtype=float,
+        )
+    array = numpy.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+
+def _concatenate_columns(numpy: ModuleType, arrays: List) -> Any:
+    """Join per-page arrays, falling back to object when kinds differ."""
+    kinds = {array.dtype.kind for array in arrays}
+    if len(kinds) > 1 and not kinds <= {"i", "f"}:
+        arrays = [array.astype(object) for array in arrays]
+    return numpy.concatenate(arrays)
+
+
+def _scan_record_batches(
+    dynamodb_client: boto3.client,
+    table_name: str,
+    columns: Optional[List[str]],
+    schema: Any,
+    filter_expression: Optional[str],
+    expression_attr_val: Optional[dict],
+    expression_attr_names: Optional[dict],
+    rate_limiter: Optional[CapacityRateLimiter],
+    use_float: bool,
+) -> Iterator[Any]:
+    """Yield one Arrow record batch per non-empty scan page."""
+    pyarrow = import_optional("pyarrow")
+    if schema is not None and not columns:
+        columns = schema.names
+
+    for page_columns in _scan_columns(
+        dynamodb_client,
+        table_name,
+        columns,
+        filter_expression,
+        expression_attr_val,
+        expression_attr_names,
+        rate_limiter,
+        use_float,
+    ):
+        batch = pyarrow.RecordBatch.from_pydict(page_columns, schema=schema)
+        schema = batch.schema
+        yield batch
+
+
+def _csv_value(value: Any) -> Any:
+    """Render nested values as JSON so they fit in a single CSV cell."""
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, default=str)
+    return value
+
+
+@pivot_exceptions
+def scan_columns(
+    table_name: str,
+    columns: Optional[List[str]] = None,
+    filter_expression: Optional[str] = None,
+    expression_attr_val: Optional[dict] = None,
+    expression_attr_names: Optional[dict] = None,
+    rate_limiter: Optional[CapacityRateLimiter] = None,
+    use_float: bool = True,
+    dynamodb_client: Optional[boto3.client] = None,
+) -> Iterator[Dict[str, List]]:
+    """
+    Scan a DynamoDB table, yielding each page as columns of plain Python
+    values.
+
+    Values are deserialized directly into per-column lists, so no item
+    dicts are built. Missing attributes become None and sets become
+    sorted lists.
+
+    Args:
+        table_name: The name of the DynamoDB table to scan.
+        columns: Top-level attributes to read. Only these attributes
+            are requested from DynamoDB. Defaults to None, in which case
+            the attributes present on the first non-empty page are
+            used and attributes first seen on later pages are dropped.
+        filter_expression: A filter expression for the scan operation.
+            Defaults to None.
+        expression_attr_val: A dictionary of expression attribute
+            values for the filter expression. Defaults to None.
+        expression_attr_names: Substitution tokens for attribute names
+            used in the filter expression. Defaults to None.
+        rate_limiter: Paces requests by consumed read capacity.
+            Defaults to None.
+        use_float: Return numbers as int or float instead of Decimal.
+            Defaults to True.
+        dynamodb_client: A boto3 DynamoDB client to use for the
+            operation. If None, the default client will be used.
+            Defaults to None.
+
+    Yields:
+        A dict mapping each column name to that page's values.
+
+    Examples:
+        >>> for page in scan_columns("my-table", columns=["id", "qty"]):
+        ...     total += sum(qty or 0 for qty in page["qty"])
+    """
+    if dynamodb_client is None:
+        dynamodb_client = client
+
+    yield from _scan_columns(
+        dynamodb_client,
+        table_name,
+        columns,
+        filter_expression,
+        expression_attr_val,
+        expression_attr_names,
+        rate_limiter,
+        use_float,
+    )
+
+
+@pivot_exceptions
+def scan_to_numpy(
+    table_name: str,
+    columns: Optional[List[str]] = None,
+    filter_expression: Optional[str] = None,
+    expression_attr_val: Optional[dict] = None,
+    expression_attr_names: Optional[dict] = None,
+    rate_limiter: Optional[CapacityRateLimiter] = None,
+    dynamodb_client: Optional[boto3.client] = None,
+) -> Dict[str, Any]:
+    """
+    Scan a DynamoDB table into one NumPy array per attribute.
+
+    Each page is converted to arrays as it arrives and the arrays are
+    concatenated at the end. Numeric columns with missing values become
+    float arrays with NaN; nested or mixed columns use the object dtype.
+    Requires numpy.
+
+    Args:
+        table_name: The name of the DynamoDB table to scan.
+        columns: Top-level attributes to read. See `scan_columns`.
+            Defaults to None.
+        filter_expression: A filter expression for the scan operation.
+            Defaults to None.
+        expression_attr_val: A dictionary of expression attribute
+            values for the filter expression. Defaults to None.
+        expression_attr_names: Substitution tokens for attribute names
+            used in the filter expression. Defaults to None.
+        rate_limiter: Paces requests by consumed read capacity.
+            Defaults to None.
+        dynamodb_client: A boto3 DynamoDB client to use for the
+            operation. If None, the default client will be used.
+            Defaults to None.
+
+    Returns:
+        A dict mapping each column name to a NumPy array.
+
+    Examples:
+        >>> arrays = scan_to_numpy("metrics", columns=["ts", "value"])
+        >>> arrays["value"].mean()
+        42.0
+    """
+    if dynamodb_client is None:
+        dynamodb_client = client
+
+    numpy = import_optional("numpy")
+    chunks = {}
+    for page_columns in _scan_columns(
+        dynamodb_client,
+        table_name,
+        columns,
+        filter_expression,
+        expression_attr_val,
+        expression_attr_names,
+        rate_limiter,
+        True,
+    ):
+        for column, values in page_columns.items():
+            chunks.setdefault(column, []).append(_numpy_column(numpy, values))
+
+    return {
+        column: _concatenate_columns(numpy, arrays)
+        for column, arrays in chunks.items()
+    }
+
+
+@pivot_exceptions
+def scan_record_batches(
+    table_name: str,
+    columns: Optional[List[str]] = None,
+    schema: Any = None,
+    filter_expression: Optional[str] = None,
+    expression_attr_val: Optional[dict] = None,
+    expression_attr_names: Optional[dict] = None,
+    rate_limiter: Optional[CapacityRateLimiter] = None,
+    dynamodb_client: Optional[boto3.client] = None,
+) -> Iterator[Any]:
+    """
+    Scan a DynamoDB table, yielding one Arrow record batch per page.
+
+    Requires pyarrow.
+
+    Args:
+        table_name: The name of the DynamoDB table to scan.
+        columns: Top-level attributes to read. See `scan_columns`.
+            Defaults to the schema's field names, if given.
+        schema: A `pyarrow.Schema` every batch is converted to. Defaults
+            to None, in which case the schema inferred from the first
+            batch is used for the rest. Pass a schema for tables whose
+            attribute types vary between items.
+        filter_expression: A filter expression for the scan operation.
+            Defaults to None.
+        expression_attr_val: A dictionary of expression attribute
+            values for the filter expression. Defaults to None.
+        expression_attr_names: Substitution tokens for attribute names
+            used in the filter expression. Defaults to None.
+        rate_limiter: Paces requests by consumed read capacity.
+            Defaults to None.
+        dynamodb_client: A boto3 DynamoDB client to use for the
+            operation. If None, the default client will be used.
+            Defaults to None.
+
+    Yields:
+        A `pyarrow.RecordBatch` for every non-empty scan page.
+    """
+    if dynamodb_client is None:
+        dynamodb_client = client
+
+    yield from _scan_record_batches(
+        dynamodb_client,
+        table_name,
+        columns,
+        schema,
+        filter_expression,
+        expression_attr_val,
+        expression_attr_names,
+        rate_limiter,
+        True,
+    )
+
+
+@pivot_exceptions
+def export_scan(
+    table_name: str,
+    path: str,
+    file_format: str = "parquet",
+    columns: Optional[List[str]] = None,
+    schema: Any = None,
+    filter_expression: Optional[str] = None,
+    expression_attr_val: Optional[dict] = None,
+    expression_attr_names: Optional[dict] = None,
+    rate_limiter: Optional[CapacityRateLimiter] = None,
+    dynamodb_client: Optional[boto3.client] = None,
+) -> int:
+    """
+    Export a DynamoDB table snapshot to a Parquet or CSV file.
+
+    Pages are written incrementally as they arrive, so memory use is
+    bounded by a single page. Parquet output requires pyarrow; CSV uses
+    only the standard library and writes nested values as JSON. Nothing
+    is written if the scan returns no items.
+
+    Args:
+        table_name: The name of the DynamoDB table to scan.
+        path: The file to write.
+        file_format: Either "parquet" or "csv". Defaults to "parquet".
+        columns: Top-level attributes to export. See `scan_columns`.
+            Defaults to None.
+        schema: A `pyarrow.Schema` for Parquet output. See
+            `scan_record_batches`. Defaults to None.
+        filter_expression: A filter expression for the scan operation.
+            Defaults to None.
+        expression_attr_val: A dictionary of expression attribute
+            values for the filter expression. Defaults to None.
+        expression_attr_names: Substitution tokens for attribute names
+            used in the filter expression. Defaults to None.
+        rate_limiter: Paces requests by consumed read capacity.
+            Defaults to None.
+        dynamodb_client: A boto3 DynamoDB client to use for the
+            operation. If None, the default client will be used.
+            Defaults to None.
+
+    Returns:
+        The number of rows written.
+
+    Examples:
+        >>> export_scan("my-table", "/tmp/my-table.parquet")
+        125000
+    """
+    if dynamodb_client is None:
+        dynamodb_client = client
+
+    rows = 0
+    if file_format == "parquet":
+        parquet = import_optional("pyarrow.parquet", "pyarrow")
+        writer = None
+        try:
+            for batch in _scan_record_batches(
+                dynamodb_client,
+                table_name,
+                columns,
+                schema,
+                filter_expression,
+                expression_attr_val,
+                expression_attr_names,
+                rate_limiter,
+                True,
+            ):
+                if writer is None:
+                    writer = parquet.ParquetWriter(path, batch.schema)
+                writer.write_batch(batch)
+                rows += batch.num_rows
+        finally:
+            if writer is not None:
+                writer.close()
+        return rows
+
+    if file_format != "csv":
+        raise ValueError(f"Unsupported file format: {file_format}")
+
+    pages = _scan_columns(
+        dynamodb_client,
+        table_name,
+        columns,
+        filter_expression,
+        expression_attr_val,
+        expression_attr_names,
+        rate_limiter,
+        True,
+    )
+    first_page = next(pages, None)
+    if first_page is None:
+        return rows
+
+    with open(path, "w", newline="", encoding="utf-8") as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(first_page)
+        for page_columns in itertools.chain([first_page], pages):
+            for row in zip(*page_columns.values()):
+                writer.writerow([_csv_value(value) for value in row])
+                rows += 1
+    return rows
@@ -6,6 +6,8 @@ decorator for transforming boto3 exceptions into local exceptions.
 """
 
 import functools
+import inspect
+
 from botocore.exceptions import ClientError
 
 
@@ -26,6 +28,9 @@ def pivot_exceptions(func):
     and convert them into AwsError instances with context about
     where the error occurred.
 
+    Generator functions are wrapped so that exceptions raised while the
+    caller iterates over them are transformed as well.
+
     Args:
         func: The function to wrap.
 
@@ -33,27 +38,36 @@ def pivot_exceptions(func):
         The wrapped function that raises AwsError on any exception.
     """
 
+    def pivot(exc: Exception) -> AwsError:
+        if (
+            isinstance(exc, ClientError)
+            and exc.response["Error"]["Code"] == "UnrecognizedClientException"
+        ):
+            return AwsError(
+                "AWS credentials are not configured or invalid. "
+                "Please run 'aws configure' or set AWS_ACCESS_KEY_ID and AWS_SECRET_ACCESS_KEY environment variables."
+            )
+        return AwsError(
+            f"An error occurred in "
+            f"{func.__module__}.{func.__name__}: {exc}"
+        )
+
+    if inspect.isgeneratorfunction(func):
+
+        @functools.wraps(func)
+        def generator_wrapper(*args, **kwargs):
+            try:
+                return (yield from func(*args, **kwargs))
+            except Exception as exc:
+                raise pivot(exc) from exc
+
+        return generator_wrapper
+
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
         try:
             return func(*args, **kwargs)
-        except ClientError as client_exc:
-            if (
-                client_exc.response["Error"]["Code"]
-                == "UnrecognizedClientException"
-            ):
-                raise AwsError(
-                    "AWS credentials are not configured or invalid. "
-                    "Please run 'aws configure' or set AWS_ACCESS_KEY_ID and AWS_SECRET_ACCESS_KEY environment variables."
-                ) from client_exc
-            raise AwsError(
-                f"An error occurred in "
-                f"{func.__module__}.{func.__name__}: {client_exc}"
-            ) from client_exc
         except Exception as exc:
-            raise AwsError(
-                f"An error occurred in "
-                f"{func.__module__}.{func.__name__}: {exc}"
-            ) from exc
+            raise pivot(exc) from exc
 
     return wrapper
@@ -0,0 +1,68 @@
+"""
+Log message parsing for CloudWatch Logs.
+
+This module holds the parsing done by `aws_v2.logs.parse_log_events`.
+It creates no AWS clients, so process-pool workers can import it
+without AWS configuration.
+"""
+
+import json
+import re
+from typing import Any, List, Optional, Sequence, Tuple
+
+from .models.logs import LogRecord
+
+
+def _json_field(document: Any, path: str) -> Any:
+    """Look up a dotted path such as "request.id" in parsed JSON."""
+    for key in path.split("."):
+        if not isinstance(document, dict):
+            return None
+        document = document.get(key)
+    return document
+
+
+def parse_events(
+    pattern: Optional[re.Pattern],
+    json_fields: Optional[Sequence[str]],
+    events: List[Tuple[int, str, Optional[str]]],
+) -> List[LogRecord]:
+    """
+    Parse (timestamp, message, log stream) tuples into records.
+
+    An event is dropped if `pattern` is given and does not match its
+    message, or if `json_fields` is given and its message contains no
+    JSON object.
+
+    Args:
+        pattern: Optional compiled regular expression. Named groups are
+            extracted as fields.
+        json_fields: Optional dotted paths read from the JSON object in
+            each message.
+        events: (timestamp, message, log stream name) tuples.
+
+    Returns:
+        A LogRecord for each event that passes the filters.
+    """
+    records = []
+    for timestamp, message, log_stream_name in events:
+        fields = {}
+        if pattern is not None:
+            match = pattern.search(message)
+            if match is None:
+                continue
+            fields.update(match.groupdict())
+        if json_fields:
+            # Runtimes often prefix JSON logs with a timestamp or request
+            # ID, so parse from the first brace.
+            start = message.find("{")
+            try:
+                document = json.loads(message[start:]) if start >= 0 else None
+            except ValueError:
+                document = None
+            if not isinstance(document, dict):
+                continue
+            for path in json_fields:
+                fields[path] = _json_field(document, path)
+        records.append(LogRecord(timestamp, fields, log_stream_name))
+    return records
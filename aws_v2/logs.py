@@ -1,18 +1,198 @@
 """
 This module provides functionality for interacting with AWS CloudWatch Logs.
-It includes functionality to filter log events.
+It includes functionality to filter log events, either all at once, as a
+stream, in parallel across time windows and log streams, through an
+on-disk cache of historical windows, or by following new events as they
+arrive, to parse events into structured records, and to run CloudWatch
+Logs Insights queries. Events can be written in batches, directly or
+through a buffered background writer.
 """
 
-from typing import List, Optional
+import gzip
+import hashlib
+import heapq
+import itertools
+import json
+import multiprocessing
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import (
+    CancelledError,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from datetime import datetime
+from operator import attrgetter, itemgetter
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 import boto3
+from botocore.exceptions import ClientError
 
 from . import session
+from .buffer import BufferedWriter
 from .exceptions import pivot_exceptions
-from .models.logs import FilterLogEventsInput, LogEvent
+from .log_parser import parse_events
+from .models.logs import (
+    FilterLogEventsInput,
+    InsightsQueryOutput,
+    LogEvent,
+    LogEventBatch,
+    LogRecord,
+)
+from .utils import backoff_delay
 
 client = session.client("logs")
 
+# Maximum number of log groups a single Logs Insights query may search.
+INSIGHTS_MAX_LOG_GROUPS = 50
+
+# Seconds after an event's timestamp during which it may still be
+# ingested. Followers re-scan this much history once per this period.
+LOG_INGESTION_DELAY = 60
+
+# Seconds of history followers re-read on every poll, to catch events
+# ingested slightly out of order.
+FOLLOW_LOG_EVENTS_OVERLAP = 5
+
+# Width of the time buckets cached by filter_log_events_cached, in
+# seconds.
+LOG_CACHE_BUCKET_SECONDS = 3600
+
+# PutLogEvents limits: events per batch, batch size in bytes (UTF-8
+# message bytes plus a fixed overhead per event) and the time span a
+# batch may cover, in milliseconds.
+PUT_LOG_EVENTS_MAX_EVENTS = 10000
+PUT_LOG_EVENTS_MAX_BYTES = 1048576
+PUT_LOG_EVENTS_EVENT_OVERHEAD = 26
+PUT_LOG_EVENTS_MAX_SPAN = 24 * 60 * 60 * 1000
+
+# Maximum attempts for a PutLogEvents batch while it is throttled, on
+# top of the client's own retries.
+PUT_LOG_EVENTS_MAX_ATTEMPTS = 5
+
+# Query statuses after which get_query_results will not change.
+INSIGHTS_FINAL_STATUSES = ("Complete", "Failed", "Cancelled", "Timeout")
+
+_event_time = attrgetter("timestamp")
+
+
+def _to_millis(value: Union[datetime, int, None]) -> Optional[int]:
+    """Convert a datetime to epoch milliseconds, passing ints through."""
+    if isinstance(value, datetime):
+        return int(value.timestamp() * 1000)
+    return value
+
+
+def _to_seconds(value: Union[datetime, int]) -> int:
+    """Convert a datetime to epoch seconds, passing ints through."""
+    if isinstance(value, datetime):
+        return int(value.timestamp())
+    return value
+
+
+def _log_event(event: dict) -> LogEvent:
+    """Convert a FilterLogEvents event into a LogEvent."""
+    return LogEvent(
+        timestamp=event["timestamp"],
+        message=event["message"],
+        ingestion_time=event["ingestionTime"],
+        log_stream_name=event.get("logStreamName"),
+        event_id=event.get("eventId"),
+    )
+
+
+def _filter_request(
+    inputs: FilterLogEventsInput,
+    start_time: Optional[int] = None,
+    end_time: Optional[int] = None,
+    log_stream_name: Optional[str] = None,
+) -> dict:
+    """
+    Build a FilterLogEvents request, converting times to milliseconds
+    and leaving out unset parameters. A log stream name replaces the
+    stream prefix, since the API accepts only one of them.
+    """
+    request = {
+        "logGroupName": inputs.log_group_name,
+        "startTime": _to_millis(inputs.start_time),
+        "endTime": _to_millis(inputs.end_time),
+        "filterPattern": inputs.filter_pattern,
+        "limit": inputs.limit,
+    }
+    if start_time is not None:
+        request["startTime"] = start_time
+    if end_time is not None:
+        request["endTime"] = end_time
+    if log_stream_name is not None:
+        request["logStreamNames"] = [log_stream_name]
+    else:
+        request["logStreamNamePrefix"] = inputs.log_stream_name_prefix
+    return {key: value for key, value in request.items() if value is not None}
+
+
+def _raw_events(logs_client: boto3.client, request: dict) -> Iterator[dict]:
+    """Yield the raw events of every FilterLogEvents page for a request."""
+    paginator = logs_client.get_paginator("filter_log_events")
+    for page in paginator.paginate(**request):
+        yield from page["events"]
+
+
+def _log_events(
+    logs_client: boto3.client, request: dict
+) -> Iterator[LogEvent]:
+    """Yield the events of every FilterLogEvents page as LogEvents."""
+    for event in _raw_events(logs_client, request):
+        yield _log_event(event)
+
+
+def _time_windows(start: int, end: int, count: int) -> List[Tuple[int, int]]:
+    """
+    Split the inclusive range [start, end] into at most `count`
+    adjacent, non-overlapping inclusive windows.
+    """
+    count = max(1, min(count, end - start + 1))
+    bounds = [
+        start + (end - start + 1) * index // count
+        for index in range(count + 1)
+    ]
+    return [(bounds[index], bounds[index + 1] - 1) for index in range(count)]
+
+
+def _shared_windows(start: int, end: int, count: int) -> List[Tuple[int, int]]:
+    """
+    Split [start, end] into at most `count` adjacent windows that share
+    their boundaries, for APIs with one-second time resolution.
+    """
+    count = max(1, min(count, end - start))
+    bounds = [
+        start + (end - start) * index // count for index in range(count + 1)
+    ]
+    return [(bounds[index], bounds[index + 1]) for index in range(count)]
+
+
+def _merge_results(futures: List[Future]) -> Iterator[LogEvent]:
+    """Merge the sorted event lists of several queries by timestamp."""
+    return heapq.merge(
+        *(future.result() for future in futures), key=_event_time
+    )
+
 
 @pivot_exceptions
 def filter_log_events(
@@ -34,7 +214,6 @@ def filter_log_events(
     if logs_client is None:
         logs_client = client
 
-    events = []
     payload = {
         "logGroupName": inputs.log_group_name,
         "logStreamNamePrefix": inputs.log_stream_name_prefix,
@@ -44,15 +223,1011 @@ def filter_log_events(
         "limit": inputs.limit,
     }
 
-    paginator = logs_client.get_paginator("filter_log_events")
-    for page in paginator.paginate(**payload):
-        for event in page["events"]:
-            events.append(
-                LogEvent(
-                    timestamp=event["timestamp"],
-                    message=event["message"],
-                    ingestion_time=event["ingestionTime"],
-                )
+    return list(_log_events(logs_client, payload))
+
+
+@pivot_exceptions
+def stream_log_events(
+    inputs: FilterLogEventsInput,
+    logs_client: Optional[boto3.client] = None,
+) -> Iterator[LogEvent]:
+    """
+    Yield log events matching the filter one page at a time, without
+    holding the full result in memory.
+
+    Start and end times may be datetimes or epoch milliseconds.
+
+    Args:
+        inputs: The input parameters for filtering log events.
+        logs_client: The boto3 client for CloudWatch Logs. Defaults to
+            module client.
+
+    Yields:
+        Log events matching the filter criteria, in the order the API
+        returns them.
+
+    Examples:
+        >>> for event in stream_log_events(
+        ...     FilterLogEventsInput("/aws/lambda/my-function", "2025/08")
+        ... ):
+        ...     print(event.message)
+    """
+    if logs_client is None:
+        logs_client = client
+
+    yield from _log_events(logs_client, _filter_request(inputs))
+
+
+@pivot_exceptions
+def filter_log_event_batch(
+    inputs: FilterLogEventsInput,
+    logs_client: Optional[boto3.client] = None,
+) -> LogEventBatch:
+    """
+    Filters log events into a compact columnar LogEventBatch.
+
+    Events are appended straight from the API response without creating
+    a LogEvent per event, which keeps memory use low for large pulls.
+    Start and end times may be datetimes or epoch milliseconds.
+
+    Args:
+        inputs: The input parameters for filtering log events.
+        logs_client: The boto3 client for CloudWatch Logs. Defaults to
+            module client.
+
+    Returns:
+        A LogEventBatch of the events matching the filter criteria.
+
+    Examples:
+        >>> batch = filter_log_event_batch(
+        ...     FilterLogEventsInput("/aws/lambda/my-function", "2025/08")
+        ... )
+        >>> len(batch.time_range(1722528000000, 1722531600000))
+        42
+    """
+    if logs_client is None:
+        logs_client = client
+
+    batch = LogEventBatch()
+    for event in _raw_events(logs_client, _filter_request(inputs)):
+        batch.append(
+            event["timestamp"],
+            event["message"],
+            event["ingestionTime"],
+            event.get("logStreamName"),
+            event.get("eventId"),
+        )
+    return batch
+
+
+@pivot_exceptions
+def filter_log_events_parallel(
+    inputs: FilterLogEventsInput,
+    windows: int = 8,
+    log_stream_names: Optional[Sequence[str]] = None,
+    max_workers: int = 8,
+    logs_client: Optional[boto3.client] = None,
+) -> Iterator[LogEvent]:
+    """
+    Yield log events in timestamp order, querying time windows and log
+    streams concurrently.
+
+    The range from `inputs.start_time` to `inputs.end_time` is split
+    into `windows` equal, non-overlapping sub-windows. If
+    `log_stream_names` is given, each window is further split into one
+    query per stream, and the streams of a window are merged by
+    timestamp with a heap. Windows are yielded in order, so results
+    stream out as soon as the earliest window is complete while later
+    windows are still being fetched.
+
+    Each query's results are held in memory until its window is
+    yielded; use more windows to bound memory for large ranges.
+
+    Args:
+        inputs: The input parameters for filtering log events.
+            `start_time` and `end_time` are required and may be
+            datetimes or epoch milliseconds.
+        windows: Number of time windows to split the range into
+            (default: 8).
+        log_stream_names: Optional log streams to query separately.
+            Replaces `inputs.log_stream_name_prefix`.
+        max_workers: Number of queries to run concurrently (default: 8).
+        logs_client: The boto3 client for CloudWatch Logs. Defaults to
+            module client.
+
+    Yields:
+        Log events matching the filter criteria, ordered by timestamp.
+
+    Raises:
+        AwsError: If start_time or end_time is missing.
+
+    Examples:
+        >>> for event in filter_log_events_parallel(
+        ...     FilterLogEventsInput(
+        ...         "/aws/lambda/my-function",
+        ...         "2025/08",
+        ...         start_time=datetime(2025, 8, 1),
+        ...         end_time=datetime(2025, 8, 2),
+        ...         filter_pattern="ERROR",
+        ...     ),
+        ...     windows=24,
+        ... ):
+        ...     print(event.timestamp, event.message)
+    """
+    if logs_client is None:
+        logs_client = client
+
+    start_time = _to_millis(inputs.start_time)
+    end_time = _to_millis(inputs.end_time)
+    if start_time is None or end_time is None:
+        raise ValueError("start_time and end_time are required")
+
+    streams = list(log_stream_names) if log_stream_names else [None]
+
+    def fetch(window: Tuple[int, int], stream: Optional[str]) -> list:
+        request = _filter_request(inputs, *window, log_stream_name=stream)
+        return sorted(_log_events(logs_client, request), key=_event_time)
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    pending = deque()
+    try:
+        for window in _time_windows(start_time, end_time, windows):
+            pending.append(
+                [executor.submit(fetch, window, stream) for stream in streams]
+            )
+            if len(pending) > max_workers:
+                yield from _merge_results(pending.popleft())
+        while pending:
+            yield from _merge_results(pending.popleft())
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+@pivot_exceptions
+def follow_log_events(
+    inputs: FilterLogEventsInput,
+    min_interval: float = 1.0,
+    max_interval: float = 30.0,
+    ingestion_delay: float = LOG_INGESTION_DELAY,
+    overlap: float = FOLLOW_LOG_EVENTS_OVERLAP,
+    stop_event: Optional[threading.Event] = None,
+    logs_client: Optional[boto3.client] = None,
+) -> Iterator[LogEvent]:
+    """
+    Follow a log group, yielding each new matching event once.
+
+    Each poll asks only for events since the newest timestamp seen,
+    less a short `overlap` for events ingested slightly out of order.
+    Once every `ingestion_delay` seconds a sweep poll reaches back
+    `ingestion_delay` seconds instead, to find events that arrived
+    later. Event IDs seen within that window are remembered so they
+    are not yielded twice, and a high-water mark is kept per log stream
+    to drop anything older that reappears.
+
+    The polling interval drops to `min_interval` while events are
+    arriving and doubles up to `max_interval` while the group is
+    quiet.
+
+    Args:
+        inputs: The input parameters for filtering log events.
+            `start_time` (datetime or epoch milliseconds) defaults to
+            now; `end_time` is ignored.
+        min_interval: Shortest wait between polls, in seconds
+            (default: 1).
+        max_interval: Longest wait between polls, in seconds
+            (default: 30).
+        ingestion_delay: Seconds of history re-scanned by the
+            periodic sweep for late events, and the period of the
+            sweep (default: 60).
+        overlap: Seconds of history re-read on every poll (default:
+            5).
+        stop_event: Optional event that ends the generator when set.
+            Otherwise follow until the caller stops iterating.
+        logs_client: The boto3 client for CloudWatch Logs. Defaults to
+            module client.
+
+    Yields:
+        New log events, in the order each poll returns them.
+
+    Examples:
+        >>> for event in follow_log_events(
+        ...     FilterLogEventsInput(
+        ...         "/aws/lambda/my-function",
+        ...         "2025/08",
+        ...         filter_pattern="ERROR",
+        ...     )
+        ... ):
+        ...     print(event.message)
+    """
+    if logs_client is None:
+        logs_client = client
+    if stop_event is None:
+        stop_event = threading.Event()
+
+    start = _to_millis(inputs.start_time)
+    if start is None:
+        start = int(time.time() * 1000)
+    overlap = int(overlap * 1000)
+    horizon = int(ingestion_delay * 1000)
+    high_water_marks: Dict[Optional[str], int] = {}
+    seen: Dict[str, int] = {}
+    interval = min_interval
+    next_sweep = time.monotonic() + ingestion_delay
+
+    while not stop_event.is_set():
+        poll_start = start
+        if high_water_marks:
+            newest = max(high_water_marks.values())
+            if time.monotonic() >= next_sweep:
+                next_sweep = time.monotonic() + ingestion_delay
+                poll_start = max(start, newest - horizon)
+            else:
+                poll_start = max(start, newest - overlap)
+        request = _filter_request(inputs, start_time=poll_start)
+        request.pop("endTime", None)
+        new_events = 0
+        for event in _log_events(logs_client, request):
+            mark = high_water_marks.get(event.log_stream_name)
+            if event.event_id in seen or (
+                mark is not None and event.timestamp < mark - horizon
+            ):
+                continue
+            seen[event.event_id] = event.timestamp
+            if mark is None or event.timestamp > mark:
+                high_water_marks[event.log_stream_name] = event.timestamp
+            new_events += 1
+            yield event
+
+        if high_water_marks:
+            oldest = max(high_water_marks.values()) - horizon
+            seen = {
+                event_id: timestamp
+                for event_id, timestamp in seen.items()
+                if timestamp >= oldest
+            }
+        if new_events:
+            interval = min_interval
+        else:
+            interval = min(max_interval, interval * 2)
+        stop_event.wait(interval)
+
+
+def _bucket_path(
+    cache_dir: str, inputs: FilterLogEventsInput, bucket_start: int, size: int
+) -> str:
+    """Return the cache file for one time bucket of a query."""
+    key = json.dumps(
+        [
+            inputs.log_group_name,
+            inputs.log_stream_name_prefix,
+            inputs.filter_pattern,
+            bucket_start,
+            size,
+        ]
+    )
+    digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+    return os.path.join(cache_dir, f"{digest}.jsonl.gz")
+
+
+def _read_bucket(path: str) -> Iterator[LogEvent]:
+    """Yield the events stored in a cache file."""
+    with gzip.open(path, "rt", encoding="utf-8") as bucket_file:
+        for line in bucket_file:
+            timestamp, ingestion_time, message, stream, event_id = json.loads(
+                line
+            )
+            yield LogEvent(
+                timestamp=timestamp,
+                message=message,
+                ingestion_time=ingestion_time,
+                log_stream_name=stream,
+                event_id=event_id,
+            )
+
+
+def _write_bucket(path: str, events: List[LogEvent]) -> None:
+    """Write events to a cache file atomically."""
+    descriptor, temp_path = tempfile.mkstemp(
+        dir=os.path.dirname(path), suffix=".tmp"
+    )
+    try:
+        with os.fdopen(descriptor, "wb") as raw:
+            with gzip.open(raw, "wt", encoding="utf-8") as bucket_file:
+                for event in events:
+                    bucket_file.write(
+                        json.dumps(
+                            [
+                                event.timestamp,
+                                event.ingestion_time,
+                                event.message,
+                                event.log_stream_name,
+                                event.event_id,
+                            ]
+                        )
+                        + "\n"
+                    )
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
+@pivot_exceptions
+def filter_log_events_cached(
+    inputs: FilterLogEventsInput,
+    cache_dir: str,
+    bucket_seconds: int = LOG_CACHE_BUCKET_SECONDS,
+    ingestion_delay: float = LOG_INGESTION_DELAY,
+    logs_client: Optional[boto3.client] = None,
+) -> Iterator[LogEvent]:
+    """
+    Yield log events, serving historical time ranges from an on-disk
+    cache.
+
+    The range from `inputs.start_time` to `inputs.end_time` is divided
+    into buckets aligned to `bucket_seconds`. A bucket that ended more
+    than `ingestion_delay` seconds ago can no longer change, so it is
+    fetched whole once and stored as gzip-compressed JSON lines, keyed
+    by log group, stream prefix, filter pattern and bucket. Later calls
+    read it from disk. Recent buckets are always fetched and never
+    stored.
+
+    Args:
+        inputs: The input parameters for filtering log events.
+            `start_time` and `end_time` are required and may be
+            datetimes or epoch milliseconds.
+        cache_dir: Directory for cache files. Created if missing.
+        bucket_seconds: Width of each cached bucket in seconds
+            (default: 3600).
+        ingestion_delay: Seconds after which a bucket is treated as
+            complete (default: 60).
+        logs_client: The boto3 client for CloudWatch Logs. Defaults to
+            module client.
+
+    Yields:
+        Log events matching the filter criteria, bucket by bucket.
+
+    Raises:
+        AwsError: If start_time or end_time is missing.
+
+    Examples:
+        >>> events = list(
+        ...     filter_log_events_cached(
+        ...         FilterLogEventsInput(
+        ...             "/aws/lambda/my-function",
+        ...             "2025/08",
+        ...             start_time=datetime(2025, 8, 1),
+        ...             end_time=datetime(2025, 8, 2),
+        ...             filter_pattern="ERROR",
+        ...         ),
+        ...         "/tmp/log-cache",
+        ...     )
+        ... )
+    """
+    if logs_client is None:
+        logs_client = client
+
+    start_time = _to_millis(inputs.start_time)
+    end_time = _to_millis(inputs.end_time)
+    if start_time is None or end_time is None:
+        raise ValueError("start_time and end_time are required")
+
+    os.makedirs(cache_dir, exist_ok=True)
+    size = bucket_seconds * 1000
+    settled = int((time.time() - ingestion_delay) * 1000)
+
+    bucket_start = start_time - start_time % size
+    while bucket_start <= end_time:
+        bucket_end = bucket_start + size - 1
+        if bucket_end >= settled:
+            request = _filter_request(
+                inputs,
+                max(start_time, bucket_start),
+                min(end_time, bucket_end),
+            )
+            yield from _log_events(logs_client, request)
+        else:
+            path = _bucket_path(cache_dir, inputs, bucket_start, size)
+            if os.path.exists(path):
+                events = _read_bucket(path)
+            else:
+                request = _filter_request(inputs, bucket_start, bucket_end)
+                events = list(_log_events(logs_client, request))
+                _write_bucket(path, events)
+            for event in events:
+                if start_time <= event.timestamp <= end_time:
+                    yield event
+        bucket_start += size
+
+
+@pivot_exceptions
+def parse_log_events(
+    events: Iterable[LogEvent],
+    pattern: Union[str, re.Pattern, None] = None,
+    json_fields: Optional[Sequence[str]] = None,
+    use_processes: bool = False,
+    max_workers: int = 4,
+    chunk_size: int = 1000,
+) -> Iterator[LogRecord]:
+    """
+    Filter and parse log events into structured records on a worker
+    pool.
+
+    Events are read in chunks of `chunk_size` and parsed concurrently
+    while more events are fetched, so parsing keeps pace with the
+    network when `events` is a stream such as `stream_log_events`.
+    Records are yielded in input order.
+
+    An event is kept only if `pattern` matches its message (when given)
+    and its message contains a JSON object (when `json_fields` is
+    given). Named regex groups and the requested JSON fields become the
+    record fields.
+
+    Args:
+        events: The log events to parse.
+        pattern: Optional regular expression, searched in each message.
+            Named groups are extracted as fields.
+        json_fields: Optional dotted paths, e.g. ["level",
+            "request.id"], read from the JSON object in each message.
+            Missing paths are None.
+        use_processes: Parse in a process pool instead of a thread
+            pool, for CPU-heavy patterns (default: False). Workers are
+            spawned rather than forked and import only
+            `aws_v2.log_parser`, so they need no AWS configuration, but
+            a script using this must guard its entry point with
+            ``if __name__ == "__main__":`` as usual for spawned
+            processes.
+        max_workers: Number of workers (default: 4).
+        chunk_size: Events per unit of work (default: 1000).
+
+    Yields:
+        A LogRecord for each event that passes the filters.
+
+    Examples:
+        >>> for record in parse_log_events(
+        ...     stream_log_events(inputs),
+        ...     pattern=r"status=(?P<status>5\\d\\d)",
+        ...     json_fields=["request.id"],
+        ... ):
+        ...     print(record.fields)
+        {'status': '503', 'request.id': 'abc-123'}
+    """
+    if isinstance(pattern, str):
+        pattern = re.compile(pattern)
+
+    iterator = iter(events)
+    chunks = iter(
+        lambda: [
+            (event.timestamp, event.message, event.log_stream_name)
+            for event in itertools.islice(iterator, chunk_size)
+        ],
+        [],
+    )
+    pool: Executor
+    if use_processes:
+        # Forking a process that already runs botocore threads can
+        # deadlock, so workers are started fresh.
+        pool = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    else:
+        pool = ThreadPoolExecutor(max_workers=max_workers)
+
+    pending = deque()
+    try:
+        for chunk in chunks:
+            pending.append(
+                pool.submit(parse_events, pattern, json_fields, chunk)
             )
+            if len(pending) >= max_workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _insights_output(
+    query_id: str,
+    response: dict,
+    field_types: Optional[Dict[str, Callable[[str], Any]]],
+) -> InsightsQueryOutput:
+    """Convert a GetQueryResults response into typed rows."""
+    field_types = field_types or {}
+    rows = []
+    for result in response.get("results", []):
+        row = {}
+        for cell in result:
+            name = cell["field"]
+            if name == "@ptr":
+                continue
+            value = cell.get("value")
+            convert = field_types.get(name)
+            row[name] = convert(value) if convert and value else value
+        rows.append(row)
+    statistics = response.get("statistics", {})
+    return InsightsQueryOutput(
+        query_id=query_id,
+        status=response["status"],
+        rows=rows,
+        records_matched=statistics.get("recordsMatched", 0.0),
+        records_scanned=statistics.get("recordsScanned", 0.0),
+        bytes_scanned=statistics.get("bytesScanned", 0.0),
+    )
+
+
+def _run_insights_query(
+    logs_client: boto3.client,
+    request: dict,
+    timeout: float,
+    field_types: Optional[Dict[str, Callable[[str], Any]]],
+) -> InsightsQueryOutput:
+    """Start a query and poll until it finishes, stopping it on timeout."""
+    query_id = logs_client.start_query(**request)["queryId"]
+    return _wait_for_insights_query(
+        logs_client, query_id, timeout, field_types
+    )
+
+
+def _wait_for_insights_query(
+    logs_client: boto3.client,
+    query_id: str,
+    timeout: float,
+    field_types: Optional[Dict[str, Callable[[str], Any]]],
+) -> InsightsQueryOutput:
+    """Poll a started query until it finishes, stopping it on timeout."""
+    deadline = time.monotonic() + timeout
+    attempt = 0
+    while True:
+        response = logs_client.get_query_results(queryId=query_id)
+        if response["status"] in INSIGHTS_FINAL_STATUSES:
+            break
+        if time.monotonic() >= deadline:
+            logs_client.stop_query(queryId=query_id)
+            raise TimeoutError(
+                f"Logs Insights query {query_id} did not finish within "
+                f"{timeout} seconds"
+            )
+        attempt += 1
+        time.sleep(backoff_delay(attempt, base=0.5, cap=5.0))
+
+    if response["status"] != "Complete":
+        raise RuntimeError(
+            f"Logs Insights query {query_id} ended with status "
+            f"{response['status']}"
+        )
+    return _insights_output(query_id, response, field_types)
+
+
+def _insights_request(
+    query_string: str,
+    log_group_names: Sequence[str],
+    start_time: int,
+    end_time: int,
+    limit: Optional[int],
+) -> dict:
+    """Build a StartQuery request, leaving out an unset limit."""
+    request = {
+        "logGroupNames": list(log_group_names),
+        "startTime": start_time,
+        "endTime": end_time,
+        "queryString": query_string,
+    }
+    if limit is not None:
+        request["limit"] = limit
+    return request
+
+
+@pivot_exceptions
+def run_insights_query(
+    query_string: str,
+    log_group_names: Sequence[str],
+    start_time: Union[datetime, int],
+    end_time: Union[datetime, int],
+    limit: Optional[int] = None,
+    timeout: float = 300,
+    field_types: Optional[Dict[str, Callable[[str], Any]]] = None,
+    logs_client: Optional[boto3.client] = None,
+) -> InsightsQueryOutput:
+    """
+    Run a CloudWatch Logs Insights query and wait for its results.
 
-    return events
+    Aggregations run server side, so only the result rows are
+    transferred. The query is polled with jittered backoff and stopped
+    if it does not finish within `timeout` seconds.
+
+    Args:
+        query_string: The Logs Insights query.
+        log_group_names: Log groups to search (at most 50).
+        start_time: Start of the time range, as a datetime or epoch
+            seconds.
+        end_time: End of the time range, as a datetime or epoch
+            seconds.
+        limit: Optional maximum number of rows to return.
+        timeout: Seconds to wait before stopping the query (default:
+            300).
+        field_types: Optional converters applied to field values, e.g.
+            {"count": int}. Other fields are returned as strings.
+        logs_client: The boto3 client for CloudWatch Logs. Defaults to
+            module client.
+
+    Returns:
+        The query status, rows and scan statistics.
+
+    Raises:
+        AwsError: If the query fails, is cancelled, or times out.
+
+    Examples:
+        >>> result = run_insights_query(
+        ...     "stats count(*) as errors by bin(5m)",
+        ...     ["/aws/lambda/my-function"],
+        ...     datetime(2025, 8, 1),
+        ...     datetime(2025, 8, 2),
+        ...     field_types={"errors": int},
+        ... )
+        >>> result.rows[0]
+        {'bin(5m)': '2025-08-01 00:00:00.000', 'errors': 3}
+    """
+    if logs_client is None:
+        logs_client = client
+
+    request = _insights_request(
+        query_string,
+        log_group_names,
+        _to_seconds(start_time),
+        _to_seconds(end_time),
+        limit,
+    )
+    return _run_insights_query(logs_client, request, timeout, field_types)
+
+
+@pivot_exceptions
+def run_insights_queries(
+    query_string: str,
+    log_group_names: Sequence[str],
+    start_time: Union[datetime, int],
+    end_time: Union[datetime, int],
+    shards: int = 1,
+    group_batch_size: int = INSIGHTS_MAX_LOG_GROUPS,
+    limit: Optional[int] = None,
+    timeout: float = 300,
+    field_types: Optional[Dict[str, Callable[[str], Any]]] = None,
+    max_workers: int = 4,
+    logs_client: Optional[boto3.client] = None,
+) -> List[InsightsQueryOutput]:
+    """
+    Run one Logs Insights query across many log groups or time shards
+    concurrently.
+
+    Log groups are split into batches of `group_batch_size` and the time
+    range into `shards` equal windows; one query runs per batch and
+    window. Adjacent windows share their boundary second, since
+    Insights times have one-second resolution, so an event stamped
+    exactly on a boundary may be counted in both. Results are not
+    combined, since aggregates such as averages cannot be merged
+    generically.
+
+    Keep `max_workers` below the account's concurrent query quota. If a
+    query fails, queries not yet started are skipped and those still
+    running are stopped, so they do not hold on to the quota.
+
+    Args:
+        query_string: The Logs Insights query.
+        log_group_names: Log groups to search.
+        start_time: Start of the time range, as a datetime or epoch
+            seconds.
+        end_time: End of the time range, as a datetime or epoch
+            seconds.
+        shards: Number of time windows to split the range into
+            (default: 1).
+        group_batch_size: Log groups per query (default: 50, the API
+            maximum). Use 1 to query each group separately.
+        limit: Optional maximum number of rows per query.
+        timeout: Seconds to wait for each query (default: 300).
+        field_types: Optional converters applied to field values.
+        max_workers: Number of queries to run concurrently (default: 4).
+        logs_client: The boto3 client for CloudWatch Logs. Defaults to
+            module client.
+
+    Returns:
+        One result per query, ordered by time window and then by log
+        group batch.
+
+    Raises:
+        AwsError: If any query fails, is cancelled, or times out.
+    """
+    if logs_client is None:
+        logs_client = client
+
+    batches = [
+        log_group_names[index : index + group_batch_size]
+        for index in range(0, len(log_group_names), group_batch_size)
+    ]
+    requests = [
+        _insights_request(query_string, batch, *window, limit)
+        for window in _shared_windows(
+            _to_seconds(start_time), _to_seconds(end_time), shards
+        )
+        for batch in batches
+    ]
+    lock = threading.Lock()
+    running = set()
+    stopping = threading.Event()
+
+    def stop(query_id: str) -> None:
+        try:
+            logs_client.stop_query(queryId=query_id)
+        except ClientError:
+            # The query may already have finished.
+            pass
+
+    def run(request: dict) -> InsightsQueryOutput:
+        if stopping.is_set():
+            raise CancelledError()
+        query_id = logs_client.start_query(**request)["queryId"]
+        with lock:
+            running.add(query_id)
+        try:
+            if stopping.is_set():
+                stop(query_id)
+                raise CancelledError()
+            return _wait_for_insights_query(
+                logs_client, query_id, timeout, field_types
+            )
+        finally:
+            with lock:
+                running.discard(query_id)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(run, request) for request in requests]
+        try:
+            return [future.result() for future in futures]
+        except BaseException:
+            stopping.set()
+            for future in futures:
+                future.cancel()
+            with lock:
+                query_ids = list(running)
+            for query_id in query_ids:
+                stop(query_id)
+            raise
+
+
+def _event_size(event: dict) -> int:
+    """Return the size of an event as counted by PutLogEvents."""
+    return (
+        len(event["message"].encode("utf-8")) + PUT_LOG_EVENTS_EVENT_OVERHEAD
+    )
+
+
+def _log_batches(events: List[dict]) -> Iterator[List[dict]]:
+    """
+    Sort events by timestamp and split them into batches within the
+    PutLogEvents count, size and time span limits.
+    """
+    batch = []
+    batch_size = 0
+    for event in sorted(events, key=itemgetter("timestamp")):
+        size = _event_size(event)
+        if batch and (
+            len(batch) >= PUT_LOG_EVENTS_MAX_EVENTS
+            or batch_size + size > PUT_LOG_EVENTS_MAX_BYTES
+            or event["timestamp"] - batch[0]["timestamp"]
+            >= PUT_LOG_EVENTS_MAX_SPAN
+        ):
+            yield batch
+            batch = []
+            batch_size = 0
+        batch.append(event)
+        batch_size += size
+    if batch:
+        yield batch
+
+
+def _put_log_batch(
+    logs_client: boto3.client,
+    log_group_name: str,
+    log_stream_name: str,
+    batch: List[dict],
+    create_stream: bool,
+) -> None:
+    """
+    Send one batch, retrying throttling with backoff and creating the
+    log stream first if it is missing and `create_stream` is set.
+    """
+    for attempt in range(1, PUT_LOG_EVENTS_MAX_ATTEMPTS + 1):
+        try:
+            logs_client.put_log_events(
+                logGroupName=log_group_name,
+                logStreamName=log_stream_name,
+                logEvents=batch,
+            )
+            return
+        except ClientError as exc:
+            code = exc.response["Error"]["Code"]
+            if code == "ResourceNotFoundException" and create_stream:
+                create_stream = False
+                try:
+                    logs_client.create_log_stream(
+                        logGroupName=log_group_name,
+                        logStreamName=log_stream_name,
+                    )
+                except ClientError as create_exc:
+                    error = create_exc.response["Error"]["Code"]
+                    if error != "ResourceAlreadyExistsException":
+                        raise
+                continue
+            if (
+                code != "ThrottlingException"
+                or attempt == PUT_LOG_EVENTS_MAX_ATTEMPTS
+            ):
+                raise
+        time.sleep(backoff_delay(attempt))
+
+
+def _put_log_events(
+    logs_client: boto3.client,
+    log_group_name: str,
+    log_stream_name: str,
+    events: List[dict],
+    create_stream: bool,
+) -> int:
+    """Sort, batch and send events to one stream; return batches sent."""
+    batches = 0
+    for batch in _log_batches(events):
+        _put_log_batch(
+            logs_client, log_group_name, log_stream_name, batch, create_stream
+        )
+        batches += 1
+    return batches
+
+
+@pivot_exceptions
+def put_log_events(
+    log_group_name: str,
+    log_stream_name: str,
+    events: Iterable[LogEvent],
+    create_stream: bool = False,
+    logs_client: Optional[boto3.client] = None,
+) -> int:
+    """
+    Write log events to a log stream in as few PutLogEvents calls as
+    the API limits allow.
+
+    Events are sorted by timestamp and split into batches of at most
+    10,000 events, 1 MiB (message bytes plus 26 bytes per event) and a
+    24 hour span. Throttled batches are retried with backoff.
+
+    Args:
+        log_group_name: The name of the log group.
+        log_stream_name: The name of the log stream.
+        events: The events to write. Only timestamp and message are
+            sent.
+        create_stream: Whether to create the log stream if it does not
+            exist (default: False).
+        logs_client: The boto3 client for CloudWatch Logs. Defaults to
+            module client.
+
+    Returns:
+        The number of PutLogEvents calls made.
+    """
+    if logs_client is None:
+        logs_client = client
+
+    return _put_log_events(
+        logs_client,
+        log_group_name,
+        log_stream_name,
+        [
+            {"timestamp": event.timestamp, "message": event.message}
+            for event in events
+        ],
+        create_stream,
+    )
+
+
+class LogWriter(BufferedWriter):
+    """
+    Buffered writer that sends log events with PutLogEvents from a
+    background thread.
+
+    Events are buffered per log stream and flushed every
+    `flush_interval` seconds, or sooner once a stream has a full batch
+    buffered. Each flush sorts the events of a stream and sends them in
+    batches within the API limits. `flush` and `close` also flush
+    synchronously, and the writer can be used as a context manager.
+
+    If a stream fails to flush, its events are dropped and the other
+    streams are still sent. The first error is raised by `flush` or
+    `close`; background errors are logged and raised by the next call
+    to either.
+
+    Args:
+        log_group_name: The name of the log group.
+        flush_interval: Seconds between background flushes (default: 5).
+        create_streams: Whether to create log streams that do not exist
+            (default: False).
+        logs_client: The boto3 client for CloudWatch Logs. Defaults to
+            module client.
+
+    Examples:
+        >>> with LogWriter("/my-service/app") as writer:
+        ...     writer.write("host-1", "request handled")
+    """
+
+    def __init__(
+        self,
+        log_group_name: str,
+        flush_interval: float = 5.0,
+        create_streams: bool = False,
+        logs_client: Optional[boto3.client] = None,
+    ):
+        self.log_group_name = log_group_name
+        self.create_streams = create_streams
+        self.logs_client = logs_client if logs_client is not None else client
+        self._buffers: Dict[str, List[dict]] = {}
+        self._sizes: Dict[str, int] = {}
+        self._full = False
+        super().__init__(flush_interval)
+
+    def write(
+        self,
+        log_stream_name: str,
+        message: str,
+        timestamp: Union[datetime, int, None] = None,
+    ) -> None:
+        """
+        Buffer one event.
+
+        Args:
+            log_stream_name: The log stream to write to.
+            message: The log message.
+            timestamp: The event time as a datetime or epoch
+                milliseconds. Defaults to now.
+        """
+        if timestamp is None:
+            timestamp = int(time.time() * 1000)
+        event = {"timestamp": _to_millis(timestamp), "message": message}
+        with self._condition:
+            self._check_open()
+            events = self._buffers.setdefault(log_stream_name, [])
+            events.append(event)
+            size = self._sizes.get(log_stream_name, 0) + _event_size(event)
+            self._sizes[log_stream_name] = size
+            if (
+                len(events) >= PUT_LOG_EVENTS_MAX_EVENTS
+                or size >= PUT_LOG_EVENTS_MAX_BYTES
+            ):
+                self._full = True
+                self._condition.notify()
+
+    def _ready(self) -> bool:
+        """Return whether a stream has a full batch buffered."""
+        return self._full
+
+    def _take(self) -> Dict[str, List[dict]]:
+        """Remove and return the buffered events of every stream."""
+        buffers = self._buffers
+        self._buffers = {}
+        self._sizes = {}
+        self._full = False
+        return buffers
+
+    def _deliver(self, buffers: Dict[str, List[dict]]) -> None:
+        """Send each stream's events, raising the first error at the end."""
+        error = None
+        for log_stream_name, events in buffers.items():
+            try:
+                _put_log_events(
+                    self.logs_client,
+                    self.log_group_name,
+                    log_stream_name,
+                    events,
+                    self.create_streams,
+                )
+            except Exception as exc:
+                if error is None:
+                    error = exc
+        if error is not None:
+            raise error
@@ -3,9 +3,9 @@ Data models for AWS CloudWatch.
 Contains dataclasses for CloudWatch metrics and statistics.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 
 @dataclass
@@ -46,3 +46,116 @@ class MetricStatisticsOutput:
 
     label: str
     datapoints: List[Dict[str, Any]]
+
+
+@dataclass
+class MetricDataQuery:
+    """
+    Represents one query for GetMetricData.
+
+    Either a metric (namespace, metric_name and dimensions) or a metric
+    math expression must be given.
+
+    Attributes:
+        id: A unique ID for the query, used to match results. Must start
+            with a lowercase letter.
+        namespace: The namespace of the metric.
+        metric_name: The name of the metric.
+        dimensions: The dimensions for the metric.
+        period: The granularity, in seconds, of the returned data
+            points.
+        stat: The statistic to return, e.g. "Average" or "p99".
+        unit: Optional unit to filter the metric by.
+        expression: A metric math expression instead of a metric. It
+            may only refer to queries sent in the same request.
+        label: Optional label for the result.
+        return_data: Whether to return this query's data points.
+    """
+
+    id: str
+    namespace: Optional[str] = None
+    metric_name: Optional[str] = None
+    dimensions: List[Dict[str, str]] = field(default_factory=list)
+    period: int = 300
+    stat: str = "Average"
+    unit: Optional[str] = None
+    expression: Optional[str] = None
+    label: Optional[str] = None
+    return_data: bool = True
+
+    def to_dict(self) -> dict:
+        """Convert the query to a MetricDataQueries entry."""
+        query = {"Id": self.id, "ReturnData": self.return_data}
+        if self.expression is not None:
+            query["Expression"] = self.expression
+            query["Period"] = self.period
+        else:
+            metric_stat = {
+                "Metric": {
+                    "Namespace": self.namespace,
+                    "MetricName": self.metric_name,
+                    "Dimensions": self.dimensions,
+                },
+                "Period": self.period,
+                "Stat": self.stat,
+            }
+            if self.unit is not None:
+                metric_stat["Unit"] = self.unit
+            query["MetricStat"] = metric_stat
+        if self.label is not None:
+            query["Label"] = self.label
+        return query
+
+
+@dataclass
+class MetricDataResult:
+    """
+    Represents the data points returned for one metric data query.
+
+    Attributes:
+        id: The ID of the query the result belongs to.
+        label: The label of the result.
+        timestamps: The timestamps of the data points.
+        values: The values of the data points, matching `timestamps`.
+        status_code: "Complete", or "PartialData" if CloudWatch could
+            not return every data point.
+    """
+
+    id: str
+    label: Optional[str] = None
+    timestamps: List[datetime] = field(default_factory=list)
+    values: List[float] = field(default_factory=list)
+    status_code: str = "Complete"
+
+
+@dataclass
+class MetricDataOutput:
+    """
+    Represents the output of a batched GetMetricData call.
+
+    Attributes:
+        results: The result of each query, keyed by query ID.
+        messages: Any warning messages returned by CloudWatch.
+    """
+
+    results: Dict[str, MetricDataResult] = field(default_factory=dict)
+    messages: List[Dict[str, str]] = field(default_factory=list)
+
+
+@dataclass
+class MetricSeries:
+    """
+    Represents a metric time series as NumPy vectors.
+
+    Attributes:
+        timestamps: Sorted int64 array of data point times, in epoch
+            seconds.
+        values: One float64 array per statistic (e.g. "Average", "p99",
+            or "Value" for GetMetricData results), aligned with
+            `timestamps`. Missing values are NaN.
+        label: The label for the metric.
+    """
+
+    timestamps: Any
+    values: Dict[str, Any]
+    label: Optional[str] = None
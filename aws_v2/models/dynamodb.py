@@ -2,7 +2,7 @@
 Data models for DynamoDB operations.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Dict, List, Optional
 
 
@@ -10,6 +10,24 @@ from typing import Dict, List, Optional
 class DynamoDBScanOutput:
     """
     Represents the output of a DynamoDB scan operation.
+
+    For a parallel scan that stopped early, `segment_keys` maps each
+    unfinished segment to the key it should resume from, or to None if
+    the segment was never started.
+    """
+
+    items: List[Dict]
+    count: int
+    scanned_count: int
+    last_evaluated_key: Optional[Dict] = None
+    consumed_capacity: Optional[Dict] = None
+    segment_keys: Optional[Dict[int, Optional[Dict]]] = None
+
+
+@dataclass
+class DynamoDBQueryOutput:
+    """
+    Represents the output of a DynamoDB query operation.
     """
 
     items: List[Dict]
@@ -17,3 +35,79 @@ class DynamoDBScanOutput:
     scanned_count: int
     last_evaluated_key: Optional[Dict] = None
     consumed_capacity: Optional[Dict] = None
+
+
+@dataclass
+class DynamoDBGetItemOutput:
+    """
+    Represents the output of a DynamoDB get item operation.
+
+    Attributes:
+        item: The item, or None if no item has the given key.
+        consumed_capacity: Capacity consumed by the read, if requested.
+            Always None unless `source` is "request".
+        source: Where the item came from: "request" if this call read
+            it from DynamoDB, "cache" if it was served from a cache, or
+            "coalesced" if it was read by a concurrent call for the
+            same key.
+    """
+
+    item: Optional[Dict]
+    consumed_capacity: Optional[Dict] = None
+    source: str = "request"
+
+
+@dataclass
+class DynamoDBPage:
+    """
+    Represents a single page returned by a paginated DynamoDB read.
+
+    Attributes:
+        items: The items contained in this page.
+        count: Number of items returned in this page.
+        scanned_count: Number of items evaluated for this page.
+        total_count: Running number of items returned so far, including
+            this page.
+        total_scanned_count: Running number of items evaluated so far,
+            including this page.
+        last_evaluated_key: Key to resume from after this page, or None
+            if this is the last page.
+        consumed_capacity: Capacity consumed by this page, if requested.
+    """
+
+    items: List[Dict]
+    count: int
+    scanned_count: int
+    total_count: int
+    total_scanned_count: int
+    last_evaluated_key: Optional[Dict] = None
+    consumed_capacity: Optional[Dict] = None
+
+
+@dataclass
+class DynamoDBBatchGetOutput:
+    """
+    Represents the combined output of chunked BatchGetItem calls.
+
+    Attributes:
+        items: All items returned across batches.
+        unprocessed_keys: Keys still unprocessed after all retries.
+    """
+
+    items: List[Dict]
+    unprocessed_keys: List[Dict] = field(default_factory=list)
+
+
+@dataclass
+class DynamoDBBatchWriteOutput:
+    """
+    Represents the combined output of chunked BatchWriteItem calls.
+
+    Attributes:
+        processed_count: Number of write requests that were applied.
+        unprocessed_items: Write requests (PutRequest/DeleteRequest
+            maps) still unprocessed after all retries.
+    """
+
+    processed_count: int
+    unprocessed_items: List[Dict] = field(default_factory=list)
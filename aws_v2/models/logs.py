@@ -3,9 +3,20 @@ Data models for AWS CloudWatch Logs.
 Contains dataclasses for logs input and output structures.
 """
 
-from dataclasses import dataclass
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 
 @dataclass
@@ -30,7 +41,7 @@ class FilterLogEventsInput:
     limit: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class LogEvent:
     """
     Represents a log event retrieved from CloudWatch Logs.
@@ -39,8 +50,280 @@ class LogEvent:
         timestamp (int): The timestamp of the log event.
         message (str): The message of the log event.
         ingestion_time (int): The ingestion time of the log event.
+        log_stream_name (str, optional): The log stream the event
+            belongs to.
+        event_id (str, optional): The unique ID of the event.
     """
 
     timestamp: int
     message: str
     ingestion_time: int
+    log_stream_name: Optional[str] = None
+    event_id: Optional[str] = None
+
+
+@dataclass(slots=True)
+class LogRecord:
+    """
+    Represents structured fields extracted from a log event.
+
+    Attributes:
+        timestamp (int): The timestamp of the log event.
+        fields (dict): The extracted field values, keyed by name.
+        log_stream_name (str, optional): The log stream the event
+            belongs to.
+    """
+
+    timestamp: int
+    fields: Dict[str, Any]
+    log_stream_name: Optional[str] = None
+
+
+def _int64_array(values: Iterable[int] = ()) -> array:
+    """Create a signed 64-bit integer array."""
+    return array("q", values)
+
+
+def _slice_strings(
+    offsets: array, data: bytearray, low: int, high: int
+) -> Tuple[array, bytearray]:
+    """Slice events low to high out of an offsets and data column."""
+    base = offsets[low]
+    return (
+        _int64_array(offset - base for offset in offsets[low : high + 1]),
+        data[base : offsets[high]],
+    )
+
+
+@dataclass
+class LogEventBatch:
+    """
+    Represents many log events in compact columnar form.
+
+    Timestamps and ingestion times are stored in int64 arrays, and
+    messages and event IDs are stored UTF-8 encoded in contiguous
+    buffers, so each event costs a few dozen bytes of overhead instead
+    of a Python object per event. Log stream names are stored once each
+    and referenced by index. LogEvent objects are created only when
+    events are read.
+
+    The arrays support the buffer protocol, so NumPy can view them
+    without copying, e.g. numpy.frombuffer(batch.timestamps,
+    dtype=numpy.int64).
+
+    Attributes:
+        timestamps (array): Event timestamps in epoch milliseconds.
+        ingestion_times (array): Ingestion times in epoch milliseconds.
+        offsets (array): Start offset of each message in `data`, plus
+            the end offset of the last message.
+        data (bytearray): The UTF-8 encoded messages, back to back.
+        stream_names (list): The distinct log stream names, which may
+            include None.
+        stream_indices (array): Index into `stream_names` of each
+            event's log stream.
+        event_id_offsets (array): Start offset of each event ID in
+            `event_id_data`, plus the end offset of the last one.
+        event_id_data (bytearray): The event IDs, back to back. A
+            missing ID is stored as an empty string.
+    """
+
+    timestamps: array = field(default_factory=_int64_array)
+    ingestion_times: array = field(default_factory=_int64_array)
+    offsets: array = field(default_factory=lambda: _int64_array([0]))
+    data: bytearray = field(default_factory=bytearray)
+    stream_names: List[Optional[str]] = field(default_factory=list)
+    stream_indices: array = field(default_factory=_int64_array)
+    event_id_offsets: array = field(default_factory=lambda: _int64_array([0]))
+    event_id_data: bytearray = field(default_factory=bytearray)
+    _sorted: Optional[bool] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _order: Optional[array] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _stream_lookup: Dict[Optional[str], int] = field(
+        init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self):
+        self._stream_lookup = {
+            name: index for index, name in enumerate(self.stream_names)
+        }
+
+    def is_sorted(self) -> bool:
+        """Return whether the events are in timestamp order."""
+        if self._sorted is None:
+            timestamps = self.timestamps
+            self._sorted = all(
+                timestamps[index] <= timestamps[index + 1]
+                for index in range(len(timestamps) - 1)
+            )
+        return self._sorted
+
+    @classmethod
+    def from_events(cls, events: Iterable[LogEvent]) -> "LogEventBatch":
+        """Build a batch from LogEvent objects."""
+        batch = cls()
+        batch.extend(events)
+        return batch
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def __iter__(self) -> Iterator[LogEvent]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def __getitem__(self, index: int) -> LogEvent:
+        index = self._position(index)
+        return LogEvent(
+            timestamp=self.timestamps[index],
+            message=self.message(index),
+            ingestion_time=self.ingestion_times[index],
+            log_stream_name=self.stream_names[self.stream_indices[index]],
+            event_id=self.event_id(index),
+        )
+
+    def _position(self, index: int) -> int:
+        """Normalize a negative index and check that it is in range."""
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("LogEventBatch index out of range")
+        return index
+
+    def message(self, index: int) -> str:
+        """Decode the message of one event."""
+        index = self._position(index)
+        start, end = self.offsets[index], self.offsets[index + 1]
+        return self.data[start:end].decode("utf-8")
+
+    def event_id(self, index: int) -> Optional[str]:
+        """Decode the event ID of one event, or None if it has none."""
+        index = self._position(index)
+        start = self.event_id_offsets[index]
+        end = self.event_id_offsets[index + 1]
+        return self.event_id_data[start:end].decode("utf-8") or None
+
+    def _stream_index(self, log_stream_name: Optional[str]) -> int:
+        """Return the index of a stream name, adding it if new."""
+        index = self._stream_lookup.get(log_stream_name)
+        if index is None:
+            index = self._stream_lookup[log_stream_name] = len(
+                self.stream_names
+            )
+            self.stream_names.append(log_stream_name)
+        return index
+
+    def append(
+        self,
+        timestamp: int,
+        message: str,
+        ingestion_time: int,
+        log_stream_name: Optional[str] = None,
+        event_id: Optional[str] = None,
+    ):
+        """Add one event to the end of the batch."""
+        if self.timestamps and timestamp < self.timestamps[-1]:
+            self._sorted = False
+        elif not self.timestamps:
+            self._sorted = True
+        self._order = None
+        self.timestamps.append(timestamp)
+        self.ingestion_times.append(ingestion_time)
+        self.data += message.encode("utf-8")
+        self.offsets.append(len(self.data))
+        self.stream_indices.append(self._stream_index(log_stream_name))
+        self.event_id_data += (event_id or "").encode("utf-8")
+        self.event_id_offsets.append(len(self.event_id_data))
+
+    def extend(self, events: Iterable[LogEvent]) -> None:
+        """Add LogEvent objects to the end of the batch."""
+        for event in events:
+            self.append(
+                event.timestamp,
+                event.message,
+                event.ingestion_time,
+                event.log_stream_name,
+                event.event_id,
+            )
+
+    def take(self, indices: Sequence[int]) -> "LogEventBatch":
+        """Return a new batch holding the events at the given indices."""
+        batch = LogEventBatch(stream_names=list(self.stream_names))
+        for index in indices:
+            index = self._position(index)
+            start, end = self.offsets[index], self.offsets[index + 1]
+            batch.timestamps.append(self.timestamps[index])
+            batch.ingestion_times.append(self.ingestion_times[index])
+            batch.data += self.data[start:end]
+            batch.offsets.append(len(batch.data))
+            batch.stream_indices.append(self.stream_indices[index])
+            start = self.event_id_offsets[index]
+            end = self.event_id_offsets[index + 1]
+            batch.event_id_data += self.event_id_data[start:end]
+            batch.event_id_offsets.append(len(batch.event_id_data))
+        return batch
+
+    def time_range(self, start: int, end: int) -> "LogEventBatch":
+        """
+        Return the events with start <= timestamp <= end, in batch
+        order.
+
+        Both cases use a binary search: a batch in timestamp order is
+        sliced with array copies, and an unsorted batch is searched
+        through a timestamp ordering computed once and kept until the
+        batch changes.
+        """
+        if not self.is_sorted():
+            if self._order is None:
+                self._order = _int64_array(
+                    sorted(range(len(self)), key=self.timestamps.__getitem__)
+                )
+            order = self._order
+            key = self.timestamps.__getitem__
+            low = bisect_left(order, start, key=key)
+            high = bisect_right(order, end, key=key)
+            return self.take(sorted(order[low:high]))
+        low = bisect_left(self.timestamps, start)
+        high = bisect_right(self.timestamps, end)
+        offsets, data = _slice_strings(self.offsets, self.data, low, high)
+        event_id_offsets, event_id_data = _slice_strings(
+            self.event_id_offsets, self.event_id_data, low, high
+        )
+        batch = LogEventBatch(
+            timestamps=self.timestamps[low:high],
+            ingestion_times=self.ingestion_times[low:high],
+            offsets=offsets,
+            data=data,
+            stream_names=list(self.stream_names),
+            stream_indices=self.stream_indices[low:high],
+            event_id_offsets=event_id_offsets,
+            event_id_data=event_id_data,
+        )
+        batch._sorted = True
+        return batch
+
+
+@dataclass
+class InsightsQueryOutput:
+    """
+    Represents the results of a CloudWatch Logs Insights query.
+
+    Attributes:
+        query_id (str): The ID of the query.
+        status (str): The final status of the query, e.g. "Complete".
+        rows (list): One dict per result row, mapping field names to
+            values. Values are strings unless converted by the caller's
+            field types. The internal @ptr field is omitted.
+        records_matched (float): Number of log events that matched.
+        records_scanned (float): Number of log events scanned.
+        bytes_scanned (float): Number of bytes scanned.
+    """
+
+    query_id: str
+    status: str
+    rows: List[Dict[str, Any]] = field(default_factory=list)
+    records_matched: float = 0.0
+    records_scanned: float = 0.0
+    bytes_scanned: float = 0.0
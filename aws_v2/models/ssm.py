@@ -3,9 +3,10 @@ Data models for AWS SSM (Systems Manager).
 Contains dataclasses for SSM parameters and related resources.
 """
 
-from dataclasses import dataclass
+import threading
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional
+from typing import Dict, List, Optional
 
 
 @dataclass
@@ -34,3 +35,232 @@ class Parameter:
                 "%Y-%m-%dT%H:%M:%S"
             )
         return result
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Parameter":
+        """
+        Create a Parameter from a dictionary produced by `to_dict`.
+
+        LastModifiedDate may be any ISO 8601 timestamp, including one
+        with a UTC offset.
+        """
+        last_modified_date = data.get("LastModifiedDate")
+        return cls(
+            name=data["Name"],
+            value=data["Value"],
+            last_modified_date=(
+                datetime.fromisoformat(last_modified_date)
+                if last_modified_date
+                else None
+            ),
+        )
+
+
+@dataclass
+class GetParametersOutput:
+    """
+    Represents the result of fetching several parameters by name.
+
+    Attributes:
+        parameters: The parameters that were found, in request order.
+        invalid_parameters: Names that do not exist or could not be
+            read.
+    """
+
+    parameters: List[Parameter]
+    invalid_parameters: List[str] = field(default_factory=list)
+
+
+def _path_parts(path: str) -> List[str]:
+    """Split a hierarchy path into its non-empty segments."""
+    return [part for part in path.split("/") if part]
+
+
+@dataclass
+class _PathNode:
+    """A node in the parameter hierarchy trie."""
+
+    parameter: Optional[Parameter] = None
+    children: Dict[str, "_PathNode"] = field(default_factory=dict)
+
+    def walk(self):
+        """Yield every parameter at or below this node."""
+        if self.parameter is not None:
+            yield self.parameter
+        for child in self.children.values():
+            yield from child.walk()
+
+    def to_nested_dict(self):
+        """Export this node as nested dicts of parameter values."""
+        if not self.children:
+            return self.parameter.value if self.parameter else {}
+        result = {
+            name: child.to_nested_dict()
+            for name, child in self.children.items()
+        }
+        if self.parameter is not None:
+            result[""] = self.parameter.value
+        return result
+
+
+@dataclass
+class ParameterSnapshot:
+    """
+    Represents an indexed copy of a parameter hierarchy.
+
+    Parameters are indexed by name and in a prefix trie keyed on path
+    segments, so a subtree can be read without scanning every name.
+
+    The methods are thread-safe, so a snapshot can be read while a
+    background refresh updates it. Use them rather than reading
+    `parameters` directly while the snapshot may change.
+
+    Attributes:
+        path: The root of the hierarchy the snapshot was taken from.
+        decrypt: Whether SecureString values were decrypted.
+        parameters: The parameters in the snapshot, keyed by name.
+        refresh_error: The error raised by the last background refresh
+            started by `open_parameter_snapshot`, or None if it
+            succeeded or has not finished.
+    """
+
+    path: str
+    decrypt: bool = True
+    parameters: Dict[str, Parameter] = field(default_factory=dict)
+    refresh_error: Optional[Exception] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _root: _PathNode = field(
+        init=False, repr=False, compare=False, default_factory=_PathNode
+    )
+    _lock: threading.RLock = field(
+        init=False, repr=False, compare=False, default_factory=threading.RLock
+    )
+
+    def __post_init__(self):
+        for parameter in list(self.parameters.values()):
+            self.add(parameter)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self.parameters)
+
+    def __contains__(self, name: str) -> bool:
+        with self._lock:
+            return name in self.parameters
+
+    def _find(self, path: str) -> Optional[_PathNode]:
+        """Return the trie node for a path, or None if it is absent."""
+        node = self._root
+        for part in _path_parts(path):
+            node = node.children.get(part)
+            if node is None:
+                return None
+        return node
+
+    def names(self) -> List[str]:
+        """Return the names of every parameter in the snapshot."""
+        with self._lock:
+            return list(self.parameters)
+
+    def values(self) -> List[Parameter]:
+        """Return every parameter in the snapshot."""
+        with self._lock:
+            return list(self.parameters.values())
+
+    def get(self, name: str) -> Optional[Parameter]:
+        """Return the parameter with the given name, or None."""
+        with self._lock:
+            return self.parameters.get(name)
+
+    def add(self, parameter: Parameter) -> None:
+        """Add or replace a parameter."""
+        with self._lock:
+            self.parameters[parameter.name] = parameter
+            node = self._root
+            for part in _path_parts(parameter.name):
+                node = node.children.setdefault(part, _PathNode())
+            node.parameter = parameter
+
+    def remove(self, name: str) -> None:
+        """Remove a parameter if present, pruning empty trie nodes."""
+        with self._lock:
+            if self.parameters.pop(name, None) is None:
+                return
+            trail = [self._root]
+            parts = _path_parts(name)
+            for part in parts:
+                trail.append(trail[-1].children[part])
+            trail[-1].parameter = None
+            for part, parent, node in zip(
+                reversed(parts), reversed(trail[:-1]), reversed(trail)
+            ):
+                if node.parameter is not None or node.children:
+                    break
+                del parent.children[part]
+
+    def subtree(self, prefix: str) -> List[Parameter]:
+        """
+        Return every parameter at or below a path.
+
+        Args:
+            prefix: A hierarchy path such as "/app/prod/db". Matching is
+                by whole path segments, so "/app/pro" matches nothing
+                under "/app/prod".
+        """
+        with self._lock:
+            node = self._find(prefix)
+            return list(node.walk()) if node is not None else []
+
+    def to_nested_dict(self, prefix: Optional[str] = None) -> dict:
+        """
+        Export a subtree as nested dicts of parameter values.
+
+        Each path segment below `prefix` becomes a key. If a parameter
+        also has parameters beneath it, its own value is stored under
+        the "" key.
+
+        Args:
+            prefix: The path to export from (default: the snapshot
+                path).
+
+        Returns:
+            Nested dicts of values, or {} if nothing is under `prefix`.
+        """
+        with self._lock:
+            node = self._find(self.path if prefix is None else prefix)
+            if node is None or not node.children:
+                return {}
+            return node.to_nested_dict()
+
+
+@dataclass
+class ParameterSnapshotChanges:
+    """
+    Represents what a snapshot refresh changed.
+
+    Attributes:
+        updated: Names of parameters that were added or re-read.
+        removed: Names of parameters that no longer exist.
+    """
+
+    updated: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+
+
+@dataclass
+class PutParametersOutput:
+    """
+    Represents the result of writing several parameters.
+
+    Attributes:
+        written: Names of parameters that were written.
+        unchanged: Names skipped because the stored value already
+            matched.
+        failed: Error messages for parameters that could not be
+            written, keyed by name.
+    """
+
+    written: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
@@ -7,14 +7,31 @@ parameters. It handles AWS API pagination and provides consistent error
 handling through the pivot_exceptions decorator.
 """
 
-from typing import List, Optional
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, List, Optional
 
 import boto3
 from botocore.config import Config
+from botocore.exceptions import ClientError
 
 from . import session
+from .cache import TTLCache
 from .exceptions import pivot_exceptions
-from .models.ssm import Parameter
+from .models.ssm import (
+    GetParametersOutput,
+    Parameter,
+    ParameterSnapshot,
+    ParameterSnapshotChanges,
+    PutParametersOutput,
+)
+from .utils import backoff_delay, import_optional
+
+logger = logging.getLogger(__name__)
 
 # Maximum retry attempts for AWS SSM client operations. This value was
 # chosen based on AWS SDK's recommendation for standard retry mode,
@@ -29,10 +46,51 @@ config = Config(
 )
 client = session.client("ssm", config=config)
 
+# Maximum number of names accepted by a single GetParameters request.
+GET_PARAMETERS_MAX_NAMES = 10
+
+# Default freshness settings for parameter_cache. Entries are served
+# for PARAMETER_CACHE_TTL seconds, then for up to
+# PARAMETER_CACHE_STALE_TTL more seconds while they are refreshed in the
+# background.
+PARAMETER_CACHE_TTL = 60
+PARAMETER_CACHE_STALE_TTL = 300
+
+# Maximum attempts for each parameter written by put_parameters when
+# SSM keeps throttling.
+PUT_PARAMETERS_MAX_ATTEMPTS = 8
+
+# Client used for put_parameters writes. SDK retries are disabled so
+# throttling reaches the adaptive concurrency limit instead of being
+# absorbed by botocore's own backoff.
+put_parameters_client = session.client(
+    "ssm",
+    config=Config(retries={"total_max_attempts": 1, "mode": "standard"}),
+)
+
+# Environment variable holding the Fernet key used to encrypt parameter
+# snapshot files. Generate one with
+# cryptography.fernet.Fernet.generate_key().
+SNAPSHOT_KEY_ENV = "AWS_V2_SSM_SNAPSHOT_KEY"
+
+# Shared cache that callers may pass as `cache` to the read functions.
+parameter_cache = TTLCache(
+    ttl=PARAMETER_CACHE_TTL, stale_ttl=PARAMETER_CACHE_STALE_TTL
+)
+
+
+def _invalidate(cache: Optional[TTLCache], name: str) -> None:
+    """Drop both decrypted and raw cached copies of a parameter."""
+    if cache is not None:
+        cache.invalidate((name, True))
+        cache.invalidate((name, False))
+
 
 @pivot_exceptions
 def delete_parameter(
-    name: str, ssm_client: Optional[boto3.client] = None
+    name: str,
+    ssm_client: Optional[boto3.client] = None,
+    cache: Optional[TTLCache] = None,
 ) -> None:
     """
     Delete a parameter from SSM Parameter Store.
@@ -40,10 +98,21 @@ def delete_parameter(
     Args:
         name: Name of the parameter to delete.
         ssm_client: Optional boto3 SSM client to use.
+        cache: Optional TTLCache to drop the parameter from.
     """
     if ssm_client is None:
         ssm_client = client
     ssm_client.delete_parameter(Name=name)
+    _invalidate(cache, name)
+
+
+def _to_parameter(parameter: dict) -> Parameter:
+    """Build a Parameter from an SSM API parameter structure."""
+    return Parameter(
+        name=parameter["Name"],
+        value=parameter["Value"],
+        last_modified_date=parameter["LastModifiedDate"],
+    )
 
 
 @pivot_exceptions
@@ -51,36 +120,147 @@ def get_parameter(
     name: str,
     decrypt: bool = True,
     ssm_client: Optional[boto3.client] = None,
+    cache: Optional[TTLCache] = None,
 ) -> Parameter:
     """
     Retrieve a parameter from SSM Parameter Store.
 
+    With a `cache`, repeated reads are served from memory, concurrent
+    misses for the same parameter share one GetParameter call, and
+    expired entries within the cache's stale window are returned
+    immediately while being refreshed in the background.
+
     Args:
         name: Name of the parameter to retrieve.
         decrypt: Whether to decrypt SecureString parameters (default:
             True).
         ssm_client: Optional boto3 SSM client to use.
+        cache: Optional TTLCache to read through, e.g. the module's
+            `parameter_cache`.
 
     Returns:
         A Parameter object containing the requested parameter data.
     """
     if ssm_client is None:
         ssm_client = client
-    response = ssm_client.get_parameter(Name=name, WithDecryption=decrypt)
-    parameter = response["Parameter"]
 
-    return Parameter(
-        name=parameter["Name"],
-        value=parameter["Value"],
-        last_modified_date=parameter["LastModifiedDate"],
+    def load() -> Parameter:
+        response = ssm_client.get_parameter(Name=name, WithDecryption=decrypt)
+        return _to_parameter(response["Parameter"])
+
+    if cache is None:
+        return load()
+    return cache.get_or_load((name, decrypt), load)
+
+
+def _fetch_parameters(
+    ssm_client: boto3.client,
+    names: Iterable[str],
+    decrypt: bool,
+    max_workers: int,
+    cache: Optional[TTLCache],
+) -> GetParametersOutput:
+    """Fetch parameters by name in concurrent 10-name chunks."""
+    names = list(dict.fromkeys(names))
+    found = {}
+    if cache is not None:
+        for name in names:
+            parameter = cache.get((name, decrypt))
+            if parameter is not None:
+                found[name] = parameter
+    missing = [name for name in names if name not in found]
+
+    def fetch(chunk: List[str]) -> dict:
+        return ssm_client.get_parameters(Names=chunk, WithDecryption=decrypt)
+
+    chunks = [
+        missing[index : index + GET_PARAMETERS_MAX_NAMES]
+        for index in range(0, len(missing), GET_PARAMETERS_MAX_NAMES)
+    ]
+    invalid = set()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for response in executor.map(fetch, chunks):
+            invalid.update(response.get("InvalidParameters", []))
+            for item in response["Parameters"]:
+                # GetParameters reports a ":version" or ":label" selector
+                # separately from the name, so rebuild the requested name
+                # to match results (and cache keys) to what was asked for.
+                requested = item["Name"] + item.get("Selector", "")
+                parameter = _to_parameter(item)
+                found[requested] = parameter
+                if cache is not None:
+                    cache.set((requested, decrypt), parameter)
+
+    return GetParametersOutput(
+        parameters=[found[name] for name in names if name in found],
+        invalid_parameters=[name for name in names if name in invalid],
     )
 
 
+@pivot_exceptions
+def get_parameters(
+    names: Iterable[str],
+    decrypt: bool = True,
+    max_workers: int = 4,
+    ssm_client: Optional[boto3.client] = None,
+    cache: Optional[TTLCache] = None,
+) -> GetParametersOutput:
+    """
+    Retrieve several parameters by name from SSM Parameter Store.
+
+    Names are split into GetParameters requests of 10 which run
+    concurrently. With a `cache`, fresh cached parameters are not
+    requested again and fetched parameters are added to it.
+
+    Args:
+        names: Names of the parameters to retrieve, optionally with a
+            ":version" or ":label" selector. Duplicates are fetched
+            once.
+        decrypt: Whether to decrypt SecureString parameters (default:
+            True).
+        max_workers: Number of requests to run concurrently (default:
+            4).
+        ssm_client: Optional boto3 SSM client to use.
+        cache: Optional TTLCache to read from and populate, e.g. the
+            module's `parameter_cache`.
+
+    Returns:
+        The parameters found, in the order requested, and the names
+        that were invalid.
+    """
+    if ssm_client is None:
+        ssm_client = client
+
+    return _fetch_parameters(ssm_client, names, decrypt, max_workers, cache)
+
+
+def _parameters_by_path(
+    ssm_client: boto3.client,
+    path: str,
+    decrypt: bool,
+    recursive: bool,
+    parameter_filters: Optional[List[dict]],
+) -> Iterator[Parameter]:
+    """Yield every parameter returned by GetParametersByPath."""
+    request = {"Path": path, "WithDecryption": decrypt}
+    if recursive:
+        request["Recursive"] = True
+    if parameter_filters:
+        request["ParameterFilters"] = parameter_filters
+
+    paginator = ssm_client.get_paginator("get_parameters_by_path")
+    for page in paginator.paginate(**request):
+        for parameter in page["Parameters"]:
+            yield _to_parameter(parameter)
+
+
 @pivot_exceptions
 def get_parameters_by_path(
     path: str,
     decrypt: bool = True,
     ssm_client: Optional[boto3.client] = None,
+    recursive: bool = False,
+    parameter_filters: Optional[List[dict]] = None,
 ) -> List[Parameter]:
     """
     Retrieve all parameters under a specific path hierarchy from SSM
@@ -91,27 +271,330 @@ def get_parameters_by_path(
         decrypt: Whether to decrypt SecureString parameters (default:
             True).
         ssm_client: Optional boto3 SSM client to use.
+        recursive: Whether to include parameters in nested paths
+            (default: False, only the level directly below `path`).
+        parameter_filters: Optional SSM ParameterFilters, e.g.
+            [{"Key": "Type", "Values": ["SecureString"]}].
 
     Returns:
         A list of Parameter objects matching the path.
     """
-    results = []
-
     if ssm_client is None:
         ssm_client = client
 
-    paginator = ssm_client.get_paginator("get_parameters_by_path")
-    for page in paginator.paginate(Path=path, WithDecryption=decrypt):
-        for parameter in page["Parameters"]:
-            results.append(
-                Parameter(
-                    name=parameter["Name"],
-                    value=parameter["Value"],
-                    last_modified_date=parameter["LastModifiedDate"],
-                )
+    return list(
+        _parameters_by_path(
+            ssm_client, path, decrypt, recursive, parameter_filters
+        )
+    )
+
+
+def _snapshot_parameters(
+    ssm_client: boto3.client, path: str, decrypt: bool
+) -> ParameterSnapshot:
+    """Load every parameter under a path into a snapshot."""
+    return ParameterSnapshot(
+        path=path,
+        decrypt=decrypt,
+        parameters={
+            parameter.name: parameter
+            for parameter in _parameters_by_path(
+                ssm_client, path, decrypt, True, None
             )
+        },
+    )
+
+
+@pivot_exceptions
+def snapshot_parameters(
+    path: str,
+    decrypt: bool = True,
+    ssm_client: Optional[boto3.client] = None,
+) -> ParameterSnapshot:
+    """
+    Load a whole parameter hierarchy into an indexed snapshot.
+
+    The snapshot supports fast subtree lookups and nested-dict export,
+    and can be kept current with `refresh_parameter_snapshot`.
+
+    Args:
+        path: The root of the hierarchy, e.g. "/app/prod".
+        decrypt: Whether to decrypt SecureString parameters (default:
+            True).
+        ssm_client: Optional boto3 SSM client to use.
+
+    Returns:
+        A ParameterSnapshot of every parameter under `path`.
+
+    Examples:
+        >>> snapshot = snapshot_parameters("/app/prod")
+        >>> snapshot.to_nested_dict("/app/prod/db")
+        {'host': 'db.internal', 'port': '5432'}
+    """
+    if ssm_client is None:
+        ssm_client = client
 
-    return results
+    return _snapshot_parameters(ssm_client, path, decrypt)
+
+
+def _refresh_snapshot(
+    ssm_client: boto3.client,
+    snapshot: ParameterSnapshot,
+    max_workers: int,
+    cache: Optional[TTLCache],
+) -> ParameterSnapshotChanges:
+    """Re-read new and modified parameters and drop deleted ones."""
+    modified = {}
+    paginator = ssm_client.get_paginator("describe_parameters")
+    for page in paginator.paginate(
+        ParameterFilters=[
+            {"Key": "Path", "Option": "Recursive", "Values": [snapshot.path]}
+        ]
+    ):
+        for metadata in page["Parameters"]:
+            modified[metadata["Name"]] = metadata.get("LastModifiedDate")
+
+    changed = [
+        name
+        for name, last_modified_date in modified.items()
+        if name not in snapshot
+        or snapshot.get(name).last_modified_date != last_modified_date
+    ]
+    removed = [name for name in snapshot.names() if name not in modified]
+
+    fetched = _fetch_parameters(
+        ssm_client, changed, snapshot.decrypt, max_workers, None
+    )
+    for parameter in fetched.parameters:
+        snapshot.add(parameter)
+        if cache is not None:
+            cache.set((parameter.name, snapshot.decrypt), parameter)
+    for name in removed + fetched.invalid_parameters:
+        snapshot.remove(name)
+
+    return ParameterSnapshotChanges(
+        updated=[parameter.name for parameter in fetched.parameters],
+        removed=removed + fetched.invalid_parameters,
+    )
+
+
+@pivot_exceptions
+def refresh_parameter_snapshot(
+    snapshot: ParameterSnapshot,
+    max_workers: int = 4,
+    ssm_client: Optional[boto3.client] = None,
+    cache: Optional[TTLCache] = None,
+) -> ParameterSnapshotChanges:
+    """
+    Bring a snapshot up to date, re-reading only changed parameters.
+
+    Parameter metadata under the snapshot path is listed with
+    DescribeParameters, which returns no values. Only parameters that
+    are new or whose LastModifiedDate changed are fetched, and
+    parameters that no longer exist are removed.
+
+    Args:
+        snapshot: The snapshot to update in place.
+        max_workers: Number of GetParameters requests to run
+            concurrently (default: 4).
+        ssm_client: Optional boto3 SSM client to use.
+        cache: Optional TTLCache to store re-read parameters in.
+
+    Returns:
+        The names that were updated and removed.
+    """
+    if ssm_client is None:
+        ssm_client = client
+
+    return _refresh_snapshot(ssm_client, snapshot, max_workers, cache)
+
+
+def _snapshot_cipher(key: Optional[str]):
+    """Return a Fernet cipher for snapshot files."""
+    fernet = import_optional("cryptography.fernet", "cryptography")
+    if key is None:
+        key = os.environ.get(SNAPSHOT_KEY_ENV)
+    if not key:
+        raise ValueError(
+            f"A snapshot key is required; pass key or set {SNAPSHOT_KEY_ENV}"
+        )
+    return fernet.Fernet(key)
+
+
+def _save_snapshot(
+    snapshot: ParameterSnapshot, file_path: str, key: Optional[str]
+) -> None:
+    """Encrypt a snapshot and write it atomically with owner-only access."""
+    parameters = []
+    for parameter in snapshot.values():
+        data = parameter.to_dict()
+        if parameter.last_modified_date:
+            # Keep sub-second precision and any UTC offset so the date
+            # still matches DescribeParameters on refresh.
+            data["LastModifiedDate"] = parameter.last_modified_date.isoformat()
+        parameters.append(data)
+    payload = json.dumps(
+        {
+            "path": snapshot.path,
+            "decrypt": snapshot.decrypt,
+            "parameters": parameters,
+        }
+    ).encode("utf-8")
+    token = _snapshot_cipher(key).encrypt(payload)
+
+    temp_path = f"{file_path}.tmp"
+    descriptor = os.open(
+        temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600
+    )
+    with os.fdopen(descriptor, "wb") as snapshot_file:
+        snapshot_file.write(token)
+    os.replace(temp_path, file_path)
+
+
+def _load_snapshot(
+    file_path: str, key: Optional[str]
+) -> Optional[ParameterSnapshot]:
+    """Read and decrypt a snapshot file, or None if it is unusable."""
+    fernet = import_optional("cryptography.fernet", "cryptography")
+    cipher = _snapshot_cipher(key)
+    try:
+        with open(file_path, "rb") as snapshot_file:
+            token = snapshot_file.read()
+    except FileNotFoundError:
+        return None
+    try:
+        state = json.loads(cipher.decrypt(token))
+    except fernet.InvalidToken:
+        return None
+    return ParameterSnapshot(
+        path=state["path"],
+        decrypt=state["decrypt"],
+        parameters={
+            data["Name"]: Parameter.from_dict(data)
+            for data in state["parameters"]
+        },
+    )
+
+
+@pivot_exceptions
+def save_parameter_snapshot(
+    snapshot: ParameterSnapshot, file_path: str, key: Optional[str] = None
+) -> None:
+    """
+    Write a parameter snapshot to an encrypted local file.
+
+    The file is encrypted with Fernet (AES-128-CBC with HMAC-SHA256)
+    from the optional `cryptography` package, written with owner-only
+    permissions, and replaced atomically.
+
+    Args:
+        snapshot: The snapshot to save.
+        file_path: Path of the snapshot file.
+        key: Fernet key to encrypt with. Defaults to the value of the
+            AWS_V2_SSM_SNAPSHOT_KEY environment variable.
+    """
+    _save_snapshot(snapshot, file_path, key)
+
+
+@pivot_exceptions
+def load_parameter_snapshot(
+    file_path: str, key: Optional[str] = None
+) -> Optional[ParameterSnapshot]:
+    """
+    Read a parameter snapshot from an encrypted local file.
+
+    Args:
+        file_path: Path of the snapshot file.
+        key: Fernet key to decrypt with. Defaults to the value of the
+            AWS_V2_SSM_SNAPSHOT_KEY environment variable.
+
+    Returns:
+        The snapshot, or None if the file does not exist or cannot be
+        decrypted with the key (for example after a key rotation).
+    """
+    return _load_snapshot(file_path, key)
+
+
+def _refresh_snapshot_file(
+    snapshot: ParameterSnapshot,
+    file_path: str,
+    key: Optional[str],
+    ssm_client: boto3.client,
+) -> None:
+    """
+    Refresh a snapshot from SSM and save it, logging a failure and
+    recording it on the snapshot.
+    """
+    try:
+        _refresh_snapshot(ssm_client, snapshot, max_workers=4, cache=None)
+        _save_snapshot(snapshot, file_path, key)
+    except Exception as exc:
+        logger.exception("Background refresh of snapshot %s failed", file_path)
+        snapshot.refresh_error = exc
+    else:
+        snapshot.refresh_error = None
+
+
+@pivot_exceptions
+def open_parameter_snapshot(
+    path: str,
+    file_path: str,
+    decrypt: bool = True,
+    key: Optional[str] = None,
+    ssm_client: Optional[boto3.client] = None,
+) -> ParameterSnapshot:
+    """
+    Load a parameter hierarchy from a local snapshot file, falling back
+    to SSM on a cold start.
+
+    If `file_path` holds a snapshot of the same path and decrypt
+    setting, it is returned immediately and refreshed from SSM in a
+    background thread, so startup does not wait on SSM. The refresh
+    updates the returned snapshot in place and rewrites the file. If it
+    fails, the loaded values are kept, and the error is logged and
+    stored in the snapshot's `refresh_error`.
+
+    Otherwise the hierarchy is read from SSM and the file is written
+    before returning.
+
+    Args:
+        path: The root of the hierarchy, e.g. "/app/prod".
+        file_path: Path of the encrypted snapshot file.
+        decrypt: Whether to decrypt SecureString parameters (default:
+            True).
+        key: Fernet key for the file. Defaults to the value of the
+            AWS_V2_SSM_SNAPSHOT_KEY environment variable.
+        ssm_client: Optional boto3 SSM client to use.
+
+    Returns:
+        A ParameterSnapshot of every parameter under `path`.
+
+    Examples:
+        >>> snapshot = open_parameter_snapshot(
+        ...     "/app/prod", "/var/cache/app/params.snapshot"
+        ... )
+        >>> snapshot.get("/app/prod/db/host").value
+        'db.internal'
+    """
+    if ssm_client is None:
+        ssm_client = client
+
+    snapshot = _load_snapshot(file_path, key)
+    if (
+        snapshot is not None
+        and snapshot.path == path
+        and snapshot.decrypt == decrypt
+    ):
+        threading.Thread(
+            target=_refresh_snapshot_file,
+            args=(snapshot, file_path, key, ssm_client),
+            daemon=True,
+        ).start()
+        return snapshot
+
+    snapshot = _snapshot_parameters(ssm_client, path, decrypt)
+    _save_snapshot(snapshot, file_path, key)
+    return snapshot
 
 
 @pivot_exceptions
@@ -120,6 +603,7 @@ def put_parameter(
     overwrite: bool = True,
     param_type: str = "SecureString",
     ssm_client: Optional[boto3.client] = None,
+    cache: Optional[TTLCache] = None,
 ) -> None:
     """
     Store a parameter in SSM Parameter Store.
@@ -131,6 +615,8 @@ def put_parameter(
         param_type: Parameter type, one of 'String', 'StringList', or
             'SecureString' (default: 'SecureString').
         ssm_client: Optional boto3 SSM client to use.
+        cache: Optional TTLCache to drop the parameter from once it is
+            written.
     """
     if ssm_client is None:
         ssm_client = client
@@ -140,3 +626,180 @@ def put_parameter(
         Overwrite=overwrite,
         Type=param_type,
     )
+    _invalidate(cache, parameter.name)
+
+
+class _AdaptiveLimit:
+    """
+    Concurrency limit that halves when a request is throttled and grows
+    by one after a run of successes (additive increase, multiplicative
+    decrease).
+    """
+
+    def __init__(self, maximum: int):
+        self.maximum = maximum
+        self.limit = maximum
+        self._in_flight = 0
+        self._successes = 0
+        self._condition = threading.Condition()
+
+    def acquire(self) -> None:
+        """Wait until a request may start."""
+        with self._condition:
+            while self._in_flight >= self.limit:
+                self._condition.wait()
+            self._in_flight += 1
+
+    def release(self, throttled: bool) -> None:
+        """Record the outcome of a finished request."""
+        with self._condition:
+            self._in_flight -= 1
+            if throttled:
+                self.limit = max(1, self.limit // 2)
+                self._successes = 0
+            else:
+                self._successes += 1
+                if self._successes >= self.limit and self.limit < self.maximum:
+                    self.limit += 1
+                    self._successes = 0
+            self._condition.notify_all()
+
+
+def _is_throttle(exc: ClientError) -> bool:
+    """Return whether a client error is SSM throttling."""
+    return exc.response["Error"]["Code"] in (
+        "ThrottlingException",
+        "TooManyUpdates",
+    )
+
+
+def _put_with_backoff(
+    ssm_client: boto3.client,
+    limit: _AdaptiveLimit,
+    request: dict,
+) -> None:
+    """Write one parameter, backing off and retrying when throttled."""
+    for attempt in range(1, PUT_PARAMETERS_MAX_ATTEMPTS + 1):
+        limit.acquire()
+        try:
+            ssm_client.put_parameter(**request)
+        except ClientError as exc:
+            throttled = _is_throttle(exc)
+            limit.release(throttled)
+            if not throttled or attempt == PUT_PARAMETERS_MAX_ATTEMPTS:
+                raise
+        except BaseException:
+            limit.release(False)
+            raise
+        else:
+            limit.release(False)
+            return
+        time.sleep(backoff_delay(attempt))
+
+
+@pivot_exceptions
+def put_parameters(
+    parameters: Iterable[Parameter],
+    overwrite: bool = True,
+    param_type: str = "SecureString",
+    skip_unchanged: bool = True,
+    snapshot: Optional[ParameterSnapshot] = None,
+    max_workers: int = 8,
+    ssm_client: Optional[boto3.client] = None,
+    cache: Optional[TTLCache] = None,
+) -> PutParametersOutput:
+    """
+    Store many parameters in SSM Parameter Store concurrently.
+
+    Unchanged values are skipped by first reading the current values
+    (or using `snapshot`). The remaining writes run with an adaptive
+    concurrency limit that starts at `max_workers`, halves whenever SSM
+    throttles, and recovers gradually as writes succeed. Throttled
+    writes are retried with jittered backoff.
+
+    A failure to write one parameter does not stop the others; it is
+    reported in the `failed` field of the result.
+
+    Args:
+        parameters: Parameter objects to store. If a name appears more
+            than once the last value is written.
+        overwrite: Whether to overwrite existing parameters (default:
+            True).
+        param_type: Parameter type, one of 'String', 'StringList', or
+            'SecureString' (default: 'SecureString').
+        skip_unchanged: Whether to skip parameters whose stored value
+            already matches (default: True). Only values are compared,
+            so a type change alone is not written.
+        snapshot: Optional decrypted snapshot to compare against
+            instead of reading the current values from SSM.
+        max_workers: Maximum number of concurrent writes (default: 8).
+        ssm_client: Optional boto3 SSM client to use. A custom client
+            should disable SDK retries (`total_max_attempts` of 1), or it
+            will retry throttled writes itself and hide the throttling
+            from the adaptive limit. Defaults to a client with retries
+            disabled for writes and the module client for reads.
+        cache: Optional TTLCache to drop written parameters from.
+
+    Returns:
+        The names that were written, skipped as unchanged, and failed.
+
+    Examples:
+        >>> result = put_parameters(
+        ...     [Parameter("/app/prod/db/host", "db.internal"),
+        ...      Parameter("/app/prod/db/port", "5432")],
+        ... )
+        >>> result.written
+        ['/app/prod/db/host']
+    """
+    if ssm_client is None:
+        read_client, write_client = client, put_parameters_client
+    else:
+        read_client = write_client = ssm_client
+
+    pending = {parameter.name: parameter for parameter in parameters}
+    result = PutParametersOutput()
+
+    if skip_unchanged and pending:
+        if snapshot is not None:
+            lookup = snapshot.get
+        else:
+            fetched = _fetch_parameters(
+                read_client, pending, True, max_workers, None
+            )
+            lookup = {
+                parameter.name: parameter for parameter in fetched.parameters
+            }.get
+        for name, parameter in list(pending.items()):
+            current = lookup(name)
+            if current is not None and current.value == parameter.value:
+                result.unchanged.append(name)
+                del pending[name]
+
+    limit = _AdaptiveLimit(max_workers)
+
+    def write(parameter: Parameter) -> Optional[str]:
+        try:
+            _put_with_backoff(
+                write_client,
+                limit,
+                {
+                    "Name": parameter.name,
+                    "Value": parameter.value,
+                    "Overwrite": overwrite,
+                    "Type": param_type,
+                },
+            )
+        except Exception as exc:
+            return str(exc)
+        finally:
+            _invalidate(cache, parameter.name)
+        return None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for name, error in zip(pending, executor.map(write, pending.values())):
+            if error is None:
+                result.written.append(name)
+            else:
+                result.failed[name] = error
+
+    return result
@@ -3,9 +3,12 @@ Utility functions for AWS role assumption and client creation.
 
 This module provides helper functions for assuming IAM roles and creating
 boto3 clients with assumed role credentials, as well as custom waiter
-creation.
+creation, retry backoff and optional dependency helpers.
 """
 
+import importlib
+import random
+from types import ModuleType
 from typing import Optional
 
 import boto3
@@ -96,3 +99,49 @@ def validate_credentials() -> bool:
         return True
     except Exception as e:
         raise AwsError(f"AWS credentials validation failed: {e}") from e
+
+
+def backoff_delay(attempt: int, base: float = 0.05, cap: float = 5.0) -> float:
+    """
+    Compute a jittered exponential backoff delay.
+
+    Uses "full jitter": a random delay between zero and the exponential
+    ceiling, which spreads out retries from concurrent callers.
+
+    Args:
+        attempt: The retry attempt number, starting at 1.
+        base: The delay ceiling for the first attempt, in seconds.
+        cap: The maximum delay ceiling, in seconds.
+
+    Returns:
+        The number of seconds to sleep before retrying.
+    """
+    return random.uniform(0, min(cap, base * 2 ** (attempt - 1)))
+
+
+def import_optional(
+    module_name: str, package: Optional[str] = None
+) -> ModuleType:
+    """
+    Import an optional dependency, explaining how to install it if it is
+    missing.
+
+    Args:
+        module_name: The module to import, e.g. "pyarrow.parquet".
+        package: The pip package providing the module. Defaults to the
+            top-level name of `module_name`.
+
+    Returns:
+        The imported module.
+
+    Raises:
+        ImportError: If the module is not installed.
+    """
+    try:
+        return importlib.import_module(module_name)
+    except ImportError as exc:
+        package = package or module_name.split(".")[0]
+        raise ImportError(
+            f"{module_name} is required for this feature. "
+            f"Install it with 'pip install {package}'."
+        ) from exc
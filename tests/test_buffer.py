@@ -0,0 +1,86 @@
+"""Unit tests for the buffered writer base class."""
+
+import time
+import unittest
+
+from aws_v2.buffer import BufferedWriter
+from aws_v2.exceptions import AwsError
+
+
+class _ListWriter(BufferedWriter):
+    """Writer that hands buffered items to a callback."""
+
+    def __init__(self, deliver, flush_interval=60.0):
+        self.deliver = deliver
+        self._items = []
+        super().__init__(flush_interval)
+
+    def add(self, item):
+        with self._condition:
+            self._check_open()
+            self._items.append(item)
+
+    def _take(self):
+        items, self._items = self._items, []
+        return items
+
+    def _deliver(self, items):
+        self.deliver(items)
+
+
+class TestBufferedWriter(unittest.TestCase):
+    """Test cases for BufferedWriter."""
+
+    def test_flush_and_close(self):
+        """Test flush sends buffered items and close rejects new ones."""
+        sent = []
+        with _ListWriter(sent.append) as writer:
+            writer.add(1)
+            writer.flush()
+            writer.add(2)
+
+        self.assertEqual(sent, [[1], [2]])
+        with self.assertRaises(ValueError):
+            writer.add(3)
+
+    def test_background_error_logged_and_raised(self):
+        """Test a background failure is logged and raised by flush."""
+
+        def deliver(items):
+            raise RuntimeError("boom")
+
+        with self.assertLogs("aws_v2.buffer", level="ERROR") as logs:
+            writer = _ListWriter(deliver, flush_interval=0.01)
+            writer.add(1)
+            for _ in range(500):
+                if writer._error is not None:
+                    break
+                time.sleep(0.01)
+
+        self.assertIn("_ListWriter", logs.output[0])
+        with self.assertRaises(AwsError) as context:
+            writer.flush()
+        self.assertIn("boom", str(context.exception))
+        writer.close()
+
+    def test_stored_error_does_not_replace_current_error(self):
+        """Test a failing flush raises its own error, not a stale one."""
+        writer = _ListWriter(self._raise_value_error)
+        writer._error = RuntimeError("stale")
+        writer.add(1)
+
+        with self.assertRaises(AwsError) as context:
+            writer.flush()
+        self.assertIn("current", str(context.exception))
+
+        with self.assertRaises(AwsError) as context:
+            writer.close()
+        self.assertIn("stale", str(context.exception))
+
+    @staticmethod
+    def _raise_value_error(items):
+        raise ValueError("current")
+
+
+if __name__ == "__main__":
+    unittest.main()
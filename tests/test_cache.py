@@ -0,0 +1,303 @@
+"""Unit tests for the in-process cache."""
+
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+from aws_v2.cache import TTLCache
+
+
+class TestTTLCache(unittest.TestCase):
+    """Test cases for TTLCache."""
+
+    def setUp(self):
+        """Set up a controllable clock for expiry tests."""
+        self.clock = [1000.0]
+        patcher = patch("aws_v2.cache.time")
+        mock_time = patcher.start()
+        mock_time.monotonic.side_effect = lambda: self.clock[0]
+        self.addCleanup(patcher.stop)
+
+    def test_get_and_set(self):
+        """Test values are returned until they expire."""
+        cache = TTLCache(ttl=10)
+        cache.set("a", 1)
+
+        self.assertEqual(cache.get("a"), 1)
+        self.clock[0] += 10
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(len(cache), 0)
+
+    def test_caches_none(self):
+        """Test None is a cacheable value distinct from a miss."""
+        cache = TTLCache(ttl=10)
+        cache.set("a", None)
+        missing = object()
+
+        self.assertIsNone(cache.get("a", missing))
+        self.assertIs(cache.get("b", missing), missing)
+
+    def test_lru_eviction(self):
+        """Test the least recently used entry is evicted."""
+        cache = TTLCache(ttl=10, maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), 3)
+
+    def test_invalidate_and_clear(self):
+        """Test entries can be removed individually or all at once."""
+        cache = TTLCache(ttl=10)
+        cache.set("a", 1)
+        cache.set("b", 2)
+
+        cache.invalidate("a")
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get("b"), 2)
+
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+    def test_get_or_load(self):
+        """Test get_or_load only calls the loader on a miss."""
+        cache = TTLCache(ttl=10)
+        loader = MagicMock(return_value="value")
+
+        self.assertEqual(cache.get_or_load("a", loader), "value")
+        self.assertEqual(cache.get_or_load("a", loader), "value")
+        loader.assert_called_once_with()
+
+    def test_get_or_load_error_not_cached(self):
+        """Test a failing loader caches nothing."""
+        cache = TTLCache(ttl=10)
+        loader = MagicMock(side_effect=[RuntimeError("boom"), "value"])
+
+        with self.assertRaises(RuntimeError):
+            cache.get_or_load("a", loader)
+        self.assertEqual(cache.get_or_load("a", loader), "value")
+
+    def test_get_or_load_coalesces_concurrent_misses(self):
+        """Test concurrent misses for one key share a single load."""
+        cache = TTLCache(ttl=10)
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def loader():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return "value"
+
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(cache.get_or_load("a", loader))
+            )
+            for _ in range(5)
+        ]
+        threads[0].start()
+        started.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ["value"] * 5)
+
+    def test_invalidate_during_load(self):
+        """Test a load invalidated while in flight is not cached."""
+        cache = TTLCache(ttl=10)
+
+        def loader():
+            cache.invalidate("a")
+            return "stale"
+
+        self.assertEqual(cache.get_or_load("a", loader), "stale")
+        self.assertIsNone(cache.get("a"))
+
+    def test_get_or_load_with_status(self):
+        """Test get_or_load_with_status reports where values came from."""
+        cache = TTLCache(ttl=10, stale_ttl=30)
+
+        self.assertEqual(
+            cache.get_or_load_with_status("a", lambda: 1), (1, "loaded")
+        )
+        self.assertEqual(
+            cache.get_or_load_with_status("a", lambda: 2), (1, "hit")
+        )
+
+    def test_get_or_load_many(self):
+        """Test get_or_load_many loads only the misses, in one call."""
+        cache = TTLCache(ttl=10)
+        cache.set("a", 1)
+        loader = MagicMock(return_value={"b": 2, "c": None})
+
+        result = cache.get_or_load_many(["c", "a", "b", "d", "a"], loader)
+
+        self.assertEqual(result, {"c": None, "a": 1, "b": 2})
+        self.assertEqual(list(result), ["c", "a", "b"])
+        loader.assert_called_once_with(["c", "b", "d"])
+        self.assertEqual(cache.get("b"), 2)
+        self.assertNotIn("d", cache.get_or_load_many(["d"], lambda keys: {}))
+
+    def test_get_or_load_many_error_not_cached(self):
+        """Test a failing multi-key loader caches nothing."""
+        cache = TTLCache(ttl=10)
+
+        with self.assertRaises(RuntimeError):
+            cache.get_or_load_many(
+                ["a"], MagicMock(side_effect=RuntimeError("boom"))
+            )
+        self.assertEqual(cache.get_or_load("a", lambda: "value"), "value")
+
+    def test_get_or_load_many_shares_in_flight_loads(self):
+        """Test single and multi-key loads wait on each other's flights."""
+        cache = TTLCache(ttl=10)
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def load_many(keys):
+            calls.append(keys)
+            started.set()
+            release.wait(5)
+            return {"a": "A"}
+
+        results = {}
+        leader = threading.Thread(
+            target=lambda: results.update(
+                many=cache.get_or_load_many(["a", "b"], load_many)
+            )
+        )
+        leader.start()
+        started.wait(5)
+        # Release the leader only once both followers wait on its flights.
+        waiting = threading.Semaphore(0)
+
+        class Done(threading.Event):
+            def wait(self, timeout=None):
+                waiting.release()
+                return super().wait(timeout)
+
+        for flight in cache._flights.values():
+            flight.done = Done()
+        followers = [
+            threading.Thread(
+                target=lambda: results.update(
+                    a=cache.get_or_load_with_status("a", lambda: "x")
+                )
+            ),
+            threading.Thread(
+                target=lambda: results.update(
+                    b=cache.get_or_load_with_status("b", lambda: "B")
+                )
+            ),
+        ]
+        for thread in followers:
+            thread.start()
+        for _ in followers:
+            waiting.acquire(timeout=5)
+        release.set()
+        for thread in [leader, *followers]:
+            thread.join(5)
+
+        self.assertEqual(calls, [["a", "b"]])
+        self.assertEqual(results["many"], {"a": "A"})
+        self.assertEqual(results["a"], ("A", "shared"))
+        # The leader did not produce "b", so its follower loaded it.
+        self.assertEqual(results["b"], ("B", "loaded"))
+
+    @patch("aws_v2.cache._refresh_executor")
+    def test_stale_while_revalidate(self, mock_executor):
+        """Test stale entries are served while refreshed in background."""
+        cache = TTLCache(ttl=10, stale_ttl=30)
+        cache.set("a", "old")
+        self.clock[0] += 15
+        loader = MagicMock(return_value="new")
+
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get_or_load("a", loader), "old")
+        self.assertEqual(cache.get_or_load("a", loader), "old")
+
+        # Only one refresh is started while one is in flight.
+        mock_executor.submit.assert_called_once()
+        loader.assert_not_called()
+        refresh, *args = mock_executor.submit.call_args.args
+        refresh(*args)
+
+        loader.assert_called_once_with()
+        self.assertEqual(cache.get_or_load("a", loader), "new")
+
+    @patch("aws_v2.cache._refresh_executor")
+    def test_stale_refresh_failure_keeps_value(self, mock_executor):
+        """Test a failed background refresh is logged, keeping the value."""
+        cache = TTLCache(ttl=10, stale_ttl=30)
+        cache.set("a", "old")
+        self.clock[0] += 15
+        loader = MagicMock(side_effect=RuntimeError("throttled"))
+
+        self.assertEqual(cache.get_or_load("a", loader), "old")
+        refresh, *args = mock_executor.submit.call_args.args
+        with self.assertLogs("aws_v2.cache", level="ERROR") as logs:
+            refresh(*args)
+
+        self.assertIn("throttled", logs.output[0])
+        self.assertEqual(cache.get_or_load("a", loader), "old")
+        self.assertEqual(mock_executor.submit.call_count, 2)
+
+    @patch("aws_v2.cache._refresh_executor")
+    def test_invalidate_discards_stale_refresh(self, mock_executor):
+        """Test callers after invalidate do not get a stale refresh."""
+        cache = TTLCache(ttl=10, stale_ttl=30)
+        cache.set("a", "old")
+        self.clock[0] += 15
+
+        self.assertEqual(cache.get_or_load("a", lambda: "refreshed"), "old")
+        cache.invalidate("a")
+        self.assertEqual(cache.get_or_load("a", lambda: "new"), "new")
+        refresh, *args = mock_executor.submit.call_args.args
+        refresh(*args)
+
+        self.assertEqual(cache.get("a"), "new")
+
+    @patch("aws_v2.cache._refresh_executor")
+    def test_clear_discards_stale_refresh(self, mock_executor):
+        """Test a refresh superseded by clear is not cached."""
+        cache = TTLCache(ttl=10, stale_ttl=30)
+        cache.set("a", "old")
+        self.clock[0] += 15
+
+        cache.get_or_load("a", lambda: "refreshed")
+        cache.clear()
+        refresh, *args = mock_executor.submit.call_args.args
+        refresh(*args)
+
+        self.assertIsNone(cache.get("a"))
+
+    def test_stale_window_ends(self):
+        """Test entries past the stale window are loaded synchronously."""
+        cache = TTLCache(ttl=10, stale_ttl=30)
+        cache.set("a", "old")
+        self.clock[0] += 40
+
+        self.assertEqual(cache.get_or_load("a", lambda: "new"), "new")
+
+    def test_rejects_invalid_settings(self):
+        """Test ttl and maxsize must be positive."""
+        with self.assertRaises(ValueError):
+            TTLCache(ttl=0)
+        with self.assertRaises(ValueError):
+            TTLCache(ttl=1, maxsize=0)
+        with self.assertRaises(ValueError):
+            TTLCache(ttl=1, stale_ttl=-1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,13 +1,29 @@
+import importlib.util
+import io
+import json
+import math
 import unittest
-from datetime import datetime
-from unittest.mock import patch
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
 
 from aws_v2.cloudwatch import (
+    MetricDataQuery,
+    MetricDataResult,
+    MetricPublisher,
     MetricStatisticsInput,
     MetricStatisticsOutput,
+    fill_series_gaps,
+    get_metric_data,
     get_metric_statistics,
+    metric_data_series,
+    metric_statistics_series,
+    put_metric_data,
+    resample_series,
+    rolling_series,
 )
 
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+
 
 class TestCloudWatch(unittest.TestCase):
 
@@ -56,6 +72,345 @@ class TestCloudWatch(unittest.TestCase):
             Statistics=["Average"],
         )
 
+    def test_get_metric_data_packs_and_paginates(self):
+        """Test get_metric_data packs 500 queries per request."""
+        mock_client = MagicMock()
+        mock_paginator = MagicMock()
+        mock_client.get_paginator.return_value = mock_paginator
+
+        def paginate(MetricDataQueries, **kwargs):
+            ids = [query["Id"] for query in MetricDataQueries]
+            return [
+                {
+                    "MetricDataResults": [
+                        {
+                            "Id": query_id,
+                            "Label": query_id.upper(),
+                            "Timestamps": [datetime(2025, 8, 23, 0, 0)],
+                            "Values": [1.0],
+                            "StatusCode": "PartialData",
+                        }
+                        for query_id in ids
+                    ]
+                },
+                {
+                    "MetricDataResults": [
+                        {
+                            "Id": query_id,
+                            "Timestamps": [datetime(2025, 8, 23, 0, 5)],
+                            "Values": [2.0],
+                            "StatusCode": "Complete",
+                        }
+                        for query_id in ids
+                    ],
+                    "Messages": [{"Code": "Warn", "Value": "partial"}],
+                },
+            ]
+
+        mock_paginator.paginate.side_effect = paginate
+        queries = [
+            MetricDataQuery(
+                id=f"m{index}",
+                namespace="AWS/EC2",
+                metric_name="CPUUtilization",
+                dimensions=[{"Name": "InstanceId", "Value": f"i-{index}"}],
+            )
+            for index in range(501)
+        ]
+        queries.append({"Id": "total", "Expression": "SUM(METRICS())"})
+
+        output = get_metric_data(
+            queries,
+            self.input_data.start_time,
+            self.input_data.end_time,
+            cloudwatch_client=mock_client,
+        )
+
+        self.assertEqual(mock_paginator.paginate.call_count, 2)
+        sizes = sorted(
+            len(call.kwargs["MetricDataQueries"])
+            for call in mock_paginator.paginate.call_args_list
+        )
+        self.assertEqual(sizes, [2, 500])
+        self.assertEqual(len(output.results), 502)
+        result = output.results["m500"]
+        self.assertEqual(result.label, "M500")
+        self.assertEqual(result.values, [1.0, 2.0])
+        self.assertEqual(result.status_code, "PartialData")
+        self.assertEqual(len(output.messages), 2)
+        first = mock_paginator.paginate.call_args_list[0].kwargs
+        self.assertEqual(first["ScanBy"], "TimestampAscending")
+        self.assertEqual(
+            queries[0].to_dict(),
+            {
+                "Id": "m0",
+                "ReturnData": True,
+                "MetricStat": {
+                    "Metric": {
+                        "Namespace": "AWS/EC2",
+                        "MetricName": "CPUUtilization",
+                        "Dimensions": [{"Name": "InstanceId", "Value": "i-0"}],
+                    },
+                    "Period": 300,
+                    "Stat": "Average",
+                },
+            },
+        )
+
+    def test_get_metric_statistics_splits_long_ranges(self):
+        """Test ranges over 1,440 data points are split and merged."""
+        mock_client = MagicMock()
+        mock_client.get_metric_statistics.side_effect = lambda **request: {
+            "Label": "CPUUtilization",
+            "Datapoints": [
+                {"Timestamp": request["EndTime"] - timedelta(minutes=1)},
+                {"Timestamp": request["StartTime"]},
+            ],
+        }
+        input_data = MetricStatisticsInput(
+            namespace="AWS/EC2",
+            metric_name="CPUUtilization",
+            dimensions=[],
+            start_time=datetime(2025, 8, 1),
+            end_time=datetime(2025, 8, 3, 12),
+            period=60,
+            statistics=["Average"],
+        )
+
+        result = get_metric_statistics(input_data, mock_client)
+
+        ranges = sorted(
+            (call.kwargs["StartTime"], call.kwargs["EndTime"])
+            for call in mock_client.get_metric_statistics.call_args_list
+        )
+        self.assertEqual(
+            ranges,
+            [
+                (datetime(2025, 8, 1), datetime(2025, 8, 2)),
+                (datetime(2025, 8, 2), datetime(2025, 8, 3)),
+                (datetime(2025, 8, 3), datetime(2025, 8, 3, 12)),
+            ],
+        )
+        timestamps = [point["Timestamp"] for point in result.datapoints]
+        self.assertEqual(len(timestamps), 6)
+        self.assertEqual(timestamps, sorted(timestamps))
+        self.assertEqual(result.label, "CPUUtilization")
+
+    @unittest.skipUnless(HAS_NUMPY, "numpy is not installed")
+    def test_metric_statistics_series(self):
+        """Test datapoints become sorted per-statistic vectors."""
+        output = MetricStatisticsOutput(
+            label="CPUUtilization",
+            datapoints=[
+                {
+                    "Timestamp": "2025-08-23T00:10:00Z",
+                    "Average": 20.0,
+                    "Unit": "Percent",
+                },
+                {
+                    "Timestamp": datetime(
+                        2025, 8, 23, 0, 0, tzinfo=timezone.utc
+                    ),
+                    "Average": 10.0,
+                    "ExtendedStatistics": {"p99": 50.0},
+                    "Unit": "Percent",
+                },
+            ],
+        )
+
+        series = metric_statistics_series(output)
+
+        start = int(datetime(2025, 8, 23, tzinfo=timezone.utc).timestamp())
+        self.assertEqual(series.timestamps.tolist(), [start, start + 600])
+        self.assertEqual(series.values["Average"].tolist(), [10.0, 20.0])
+        self.assertEqual(series.values["p99"][0], 50.0)
+        self.assertTrue(math.isnan(series.values["p99"][1]))
+        self.assertNotIn("Unit", series.values)
+
+    @unittest.skipUnless(HAS_NUMPY, "numpy is not installed")
+    def test_series_resample_fill_and_rolling(self):
+        """Test vectorized resampling, gap filling and rolling windows."""
+        series = metric_data_series(
+            MetricDataResult(
+                id="m0",
+                timestamps=[
+                    datetime.fromtimestamp(seconds, timezone.utc)
+                    for seconds in (0, 60, 180, 300, 360)
+                ],
+                values=[1.0, 3.0, 5.0, 7.0, 9.0],
+            )
+        )
+
+        resampled = resample_series(series, 120, how="mean")
+        self.assertEqual(resampled.timestamps.tolist(), [0, 120, 240, 360])
+        self.assertEqual(
+            resampled.values["Value"].tolist(), [2.0, 5.0, 7.0, 9.0]
+        )
+
+        filled = fill_series_gaps(series, 60, fill="previous")
+        self.assertEqual(
+            filled.timestamps.tolist(), [0, 60, 120, 180, 240, 300, 360]
+        )
+        self.assertEqual(
+            filled.values["Value"].tolist(),
+            [1.0, 3.0, 3.0, 5.0, 5.0, 7.0, 9.0],
+        )
+        zero = fill_series_gaps(series, 60, fill=0)
+        self.assertEqual(zero.values["Value"][2], 0.0)
+
+        rolled = rolling_series(filled, 3, how="max")
+        self.assertEqual(
+            rolled.values["Value"][2:].tolist(), [3.0, 5.0, 5.0, 7.0, 9.0]
+        )
+        self.assertTrue(math.isnan(rolled.values["Value"][0]))
+
+    def test_put_metric_data_batches(self):
+        """Test put_metric_data sends 1,000 metrics per request."""
+        mock_client = MagicMock()
+
+        calls = put_metric_data(
+            "MyService",
+            ({"MetricName": "Hits", "Value": 1.0} for _ in range(2500)),
+            cloudwatch_client=mock_client,
+        )
+
+        self.assertEqual(calls, 3)
+        self.assertEqual(
+            [
+                len(call.kwargs["MetricData"])
+                for call in mock_client.put_metric_data.call_args_list
+            ],
+            [1000, 1000, 500],
+        )
+
+    def test_metric_publisher_aggregates(self):
+        """Test MetricPublisher sends one statistic set per metric."""
+        mock_client = MagicMock()
+        with MetricPublisher(
+            "MyService", flush_interval=60, cloudwatch_client=mock_client
+        ) as metrics:
+            for value in (5.0, 1.0, 3.0):
+                metrics.record(
+                    "Latency",
+                    value,
+                    {"Operation": "Get", "Service": "api"},
+                    "Milliseconds",
+                )
+            metrics.record("Latency", 9.0, {"Operation": "Put"})
+            mock_client.put_metric_data.assert_not_called()
+
+        request = mock_client.put_metric_data.call_args.kwargs
+        self.assertEqual(request["Namespace"], "MyService")
+        data = {
+            datum["Dimensions"][0]["Value"]: datum
+            for datum in request["MetricData"]
+        }
+        self.assertEqual(
+            data["Get"]["StatisticValues"],
+            {"SampleCount": 3, "Sum": 9.0, "Minimum": 1.0, "Maximum": 5.0},
+        )
+        self.assertEqual(data["Get"]["Unit"], "Milliseconds")
+        self.assertEqual(
+            data["Get"]["Dimensions"],
+            [
+                {"Name": "Operation", "Value": "Get"},
+                {"Name": "Service", "Value": "api"},
+            ],
+        )
+        self.assertEqual(data["Put"]["StatisticValues"]["SampleCount"], 1)
+        with self.assertRaises(ValueError):
+            metrics.record("Latency", 1.0)
+
+    def test_metric_publisher_emf(self):
+        """Test MetricPublisher writes Embedded Metric Format documents."""
+        mock_client = MagicMock()
+        stream = io.StringIO()
+        metrics = MetricPublisher(
+            "MyService",
+            emf=True,
+            stream=stream,
+            cloudwatch_client=mock_client,
+        )
+        for value in range(150):
+            metrics.record("Hits", float(value), {"Operation": "Get"})
+        for _ in range(1000):
+            metrics.record("Errors", 1.0, {"Operation": "Get"}, "Count")
+
+        metrics.flush()
+        metrics.close()
+
+        mock_client.put_metric_data.assert_not_called()
+        documents = [
+            json.loads(line) for line in stream.getvalue().splitlines()
+        ]
+        self.assertEqual(len(documents), 2)
+        first, second = documents
+        self.assertEqual(first["Operation"], "Get")
+        self.assertEqual(
+            first["Hits"]["Values"], [float(value) for value in range(100)]
+        )
+        self.assertEqual(first["Hits"]["Counts"], [1] * 100)
+        self.assertEqual(first["Errors"], {"Values": [1.0], "Counts": [1000]})
+        self.assertEqual(len(second["Hits"]["Values"]), 50)
+        self.assertNotIn("Errors", second)
+        directive = first["_aws"]["CloudWatchMetrics"][0]
+        self.assertEqual(directive["Namespace"], "MyService")
+        self.assertEqual(directive["Dimensions"], [["Operation"]])
+        self.assertEqual(
+            [metric["Name"] for metric in directive["Metrics"]],
+            ["Hits", "Errors"],
+        )
+
+    def test_metric_publisher_emf_units_in_separate_documents(self):
+        """Test one metric with two units is written to two documents."""
+        stream = io.StringIO()
+        metrics = MetricPublisher(
+            "MyService", emf=True, stream=stream, cloudwatch_client=MagicMock()
+        )
+        metrics.record("Size", 2.0, {"Operation": "Get"}, "Bytes")
+        metrics.record("Size", 3.0, {"Operation": "Get"}, "Kilobytes")
+        metrics.record("Hits", 1.0, {"Operation": "Get"}, "Count")
+
+        metrics.close()
+
+        documents = [
+            json.loads(line) for line in stream.getvalue().splitlines()
+        ]
+        self.assertEqual(len(documents), 2)
+        first, second = documents
+        self.assertEqual(first["Size"]["Values"], [2.0])
+        self.assertEqual(first["Hits"]["Values"], [1.0])
+        self.assertEqual(second["Size"]["Values"], [3.0])
+        self.assertNotIn("Hits", second)
+        self.assertEqual(
+            [
+                (metric["Name"], metric["Unit"])
+                for document in documents
+                for metric in document["_aws"]["CloudWatchMetrics"][0][
+                    "Metrics"
+                ]
+            ],
+            [("Size", "Bytes"), ("Hits", "Count"), ("Size", "Kilobytes")],
+        )
+
+    def test_metric_publisher_emf_rejects_dimension_name(self):
+        """Test EMF metrics cannot share a name with their dimensions."""
+        stream = io.StringIO()
+        metrics = MetricPublisher(
+            "MyService", emf=True, stream=stream, cloudwatch_client=MagicMock()
+        )
+
+        with self.assertRaises(ValueError):
+            metrics.record("Operation", 1.0, {"Operation": "Get"})
+        metrics.record("Operation", 1.0, {"Service": "api"})
+        metrics.close()
+
+        document = json.loads(stream.getvalue())
+        self.assertEqual(
+            document["Operation"], {"Values": [1.0], "Counts": [1]}
+        )
+        self.assertEqual(document["Service"], "api")
+
 
 if __name__ == "__main__":
     unittest.main()
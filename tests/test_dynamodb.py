@@ -1,10 +1,47 @@
 """Unit tests for DynamoDB utility functions."""
 
+import csv
+import importlib.util
+import json
+import os
+import tempfile
+import threading
 import unittest
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
 from unittest.mock import MagicMock, patch
 
-from aws_v2.dynamodb import scan
-from aws_v2.models.dynamodb import DynamoDBScanOutput
+from boto3.dynamodb.types import TypeDeserializer
+
+from aws_v2.cache import TTLCache
+from aws_v2.dynamodb import (
+    CapacityRateLimiter,
+    batch_get_item,
+    batch_write_item,
+    deserialize_item,
+    export_scan,
+    get_item,
+    invalidate_item,
+    query,
+    query_pages,
+    read_capacity_limiter,
+    scan,
+    scan_columns,
+    scan_items,
+    scan_pages,
+    scan_record_batches,
+    scan_to_numpy,
+)
+from aws_v2.exceptions import AwsError
+from aws_v2.models.dynamodb import (
+    DynamoDBGetItemOutput,
+    DynamoDBPage,
+    DynamoDBQueryOutput,
+    DynamoDBScanOutput,
+)
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
 
 
 class TestDynamoDB(unittest.TestCase):
@@ -162,6 +199,1125 @@ class TestDynamoDB(unittest.TestCase):
         # Verify the custom client was used instead of the default one
         custom_client.scan.assert_called_once_with(TableName="test-table")
 
+    @patch("aws_v2.dynamodb.client")
+    def test_scan_with_projection(self, mock_client):
+        """Test scan passes projection and attribute names through."""
+        mock_client.scan.return_value = self.mock_scan_response
+
+        scan(
+            table_name="test-table",
+            projection_expression="id, #n",
+            expression_attr_names={"#n": "name"},
+            limit=50,
+        )
+
+        mock_client.scan.assert_called_once_with(
+            TableName="test-table",
+            ProjectionExpression="id, #n",
+            ExpressionAttributeNames={"#n": "name"},
+            Limit=50,
+        )
+
+    @patch("aws_v2.dynamodb.client")
+    def test_scan_omits_unused_expression_attributes(self, mock_client):
+        """Test substitutions are only sent with an expression using them."""
+        mock_client.scan.return_value = self.mock_scan_response
+
+        scan(
+            table_name="test-table",
+            expression_attr_val={":v": {"N": "1"}},
+            expression_attr_names={"#n": "name"},
+        )
+        scan(
+            table_name="test-table",
+            projection_expression="#n",
+            expression_attr_val={":v": {"N": "1"}},
+            expression_attr_names={"#n": "name"},
+        )
+
+        self.assertEqual(
+            mock_client.scan.call_args_list[0].kwargs,
+            {"TableName": "test-table"},
+        )
+        self.assertEqual(
+            mock_client.scan.call_args_list[1].kwargs,
+            {
+                "TableName": "test-table",
+                "ProjectionExpression": "#n",
+                "ExpressionAttributeNames": {"#n": "name"},
+            },
+        )
+
+    @patch("aws_v2.dynamodb.client")
+    def test_scan_select_count(self, mock_client):
+        """Test scan with Select=COUNT returns counts without items."""
+        mock_client.scan.side_effect = [
+            {
+                "Count": 3,
+                "ScannedCount": 5,
+                "LastEvaluatedKey": {"id": {"S": "3"}},
+            },
+            {"Count": 4, "ScannedCount": 4},
+        ]
+
+        result = scan(table_name="test-table", select="COUNT")
+
+        self.assertEqual(result.items, [])
+        self.assertEqual(result.count, 7)
+        self.assertEqual(result.scanned_count, 9)
+        mock_client.scan.assert_any_call(
+            TableName="test-table", Select="COUNT"
+        )
+
+    @patch("aws_v2.dynamodb.client")
+    def test_scan_pages_running_counters(self, mock_client):
+        """Test scan_pages yields pages with running counters."""
+        mock_client.scan.side_effect = self.mock_paginated_responses
+
+        pages = list(scan_pages(table_name="test-table"))
+
+        self.assertEqual(len(pages), 2)
+        self.assertIsInstance(pages[0], DynamoDBPage)
+        self.assertEqual(pages[0].count, 1)
+        self.assertEqual(pages[0].total_count, 1)
+        self.assertEqual(pages[0].last_evaluated_key, {"id": {"S": "1"}})
+        self.assertEqual(pages[1].total_count, 2)
+        self.assertEqual(pages[1].total_scanned_count, 2)
+        self.assertIsNone(pages[1].last_evaluated_key)
+
+    def test_scan_pages_is_lazy(self):
+        """Test scan_pages only requests pages as they are consumed."""
+        custom_client = MagicMock()
+        custom_client.scan.side_effect = self.mock_paginated_responses
+
+        pages = scan_pages("test-table", dynamodb_client=custom_client)
+        custom_client.scan.assert_not_called()
+
+        next(pages)
+        self.assertEqual(custom_client.scan.call_count, 1)
+
+    @patch("aws_v2.dynamodb.client")
+    def test_scan_items(self, mock_client):
+        """Test scan_items yields every item across pages."""
+        mock_client.scan.side_effect = self.mock_paginated_responses
+
+        items = list(scan_items(table_name="test-table"))
+
+        self.assertEqual([item["id"]["S"] for item in items], ["1", "2"])
+
+    def test_scan_pages_error_during_iteration(self):
+        """Test errors raised while iterating are pivoted to AwsError."""
+        custom_client = MagicMock()
+        custom_client.scan.side_effect = RuntimeError("boom")
+
+        with self.assertRaises(AwsError):
+            list(scan_pages("test-table", dynamodb_client=custom_client))
+
+    @patch("aws_v2.dynamodb.client")
+    def test_query(self, mock_client):
+        """Test query paginates and combines results."""
+        mock_client.query.side_effect = self.mock_paginated_responses
+
+        result = query(
+            table_name="test-table",
+            key_condition_expression="id = :id",
+            expression_attr_val={":id": {"S": "1"}},
+        )
+
+        self.assertIsInstance(result, DynamoDBQueryOutput)
+        self.assertEqual(len(result.items), 2)
+        self.assertEqual(result.count, 2)
+        self.assertEqual(mock_client.query.call_count, 2)
+        mock_client.query.assert_any_call(
+            TableName="test-table",
+            KeyConditionExpression="id = :id",
+            ExpressionAttributeValues={":id": {"S": "1"}},
+            ExclusiveStartKey={"id": {"S": "1"}},
+        )
+
+    def test_query_pages_with_index(self):
+        """Test query_pages passes index and ordering options."""
+        custom_client = MagicMock()
+        custom_client.query.return_value = self.mock_scan_response
+
+        pages = list(
+            query_pages(
+                "test-table",
+                "name = :name",
+                expression_attr_val={":name": {"S": "Item 1"}},
+                index_name="name-index",
+                projection_expression="id",
+                scan_index_forward=False,
+                dynamodb_client=custom_client,
+            )
+        )
+
+        self.assertEqual(len(pages), 1)
+        self.assertEqual(pages[0].total_count, 2)
+        custom_client.query.assert_called_once_with(
+            TableName="test-table",
+            KeyConditionExpression="name = :name",
+            ExpressionAttributeValues={":name": {"S": "Item 1"}},
+            ProjectionExpression="id",
+            IndexName="name-index",
+            ScanIndexForward=False,
+        )
+
+    def test_batch_get_item_chunks_keys(self):
+        """Test batch_get_item splits keys into 100-key batches."""
+        custom_client = MagicMock()
+        custom_client.batch_get_item.side_effect = lambda RequestItems: {
+            "Responses": {"test-table": RequestItems["test-table"]["Keys"]}
+        }
+        keys = ({"id": {"S": str(i)}} for i in range(250))
+
+        result = batch_get_item(
+            "test-table", keys, dynamodb_client=custom_client
+        )
+
+        self.assertEqual(len(result.items), 250)
+        self.assertEqual(result.unprocessed_keys, [])
+        self.assertEqual(custom_client.batch_get_item.call_count, 3)
+        batch_sizes = sorted(
+            len(call.kwargs["RequestItems"]["test-table"]["Keys"])
+            for call in custom_client.batch_get_item.call_args_list
+        )
+        self.assertEqual(batch_sizes, [50, 100, 100])
+
+    @patch("aws_v2.dynamodb.time.sleep")
+    def test_batch_get_item_retries_unprocessed(self, mock_sleep):
+        """Test batch_get_item retries UnprocessedKeys."""
+        custom_client = MagicMock()
+        key_1 = {"id": {"S": "1"}}
+        key_2 = {"id": {"S": "2"}}
+        custom_client.batch_get_item.side_effect = [
+            {
+                "Responses": {"test-table": [key_1]},
+                "UnprocessedKeys": {
+                    "test-table": {"Keys": [key_2], "ConsistentRead": True}
+                },
+            },
+            {"Responses": {"test-table": [key_2]}, "UnprocessedKeys": {}},
+        ]
+
+        result = batch_get_item(
+            "test-table",
+            [key_1, key_2],
+            consistent_read=True,
+            dynamodb_client=custom_client,
+        )
+
+        self.assertEqual(result.items, [key_1, key_2])
+        self.assertEqual(custom_client.batch_get_item.call_count, 2)
+        custom_client.batch_get_item.assert_called_with(
+            RequestItems={
+                "test-table": {"Keys": [key_2], "ConsistentRead": True}
+            }
+        )
+        mock_sleep.assert_called_once()
+
+    @patch("aws_v2.dynamodb.time.sleep")
+    def test_batch_write_item_gives_up_after_max_attempts(self, mock_sleep):
+        """Test batch_write_item returns requests it could not apply."""
+        custom_client = MagicMock()
+        stuck = {"DeleteRequest": {"Key": {"id": {"S": "2"}}}}
+        custom_client.batch_write_item.return_value = {
+            "UnprocessedItems": {"test-table": [stuck]}
+        }
+
+        result = batch_write_item(
+            "test-table",
+            put_items=[{"id": {"S": "1"}}],
+            delete_keys=[{"id": {"S": "2"}}],
+            max_attempts=3,
+            key_names=["id"],
+            dynamodb_client=custom_client,
+        )
+
+        self.assertEqual(result.processed_count, 1)
+        self.assertEqual(result.unprocessed_items, [stuck])
+        self.assertEqual(custom_client.batch_write_item.call_count, 3)
+        self.assertEqual(mock_sleep.call_count, 2)
+        custom_client.batch_write_item.assert_any_call(
+            RequestItems={
+                "test-table": [
+                    {"PutRequest": {"Item": {"id": {"S": "1"}}}},
+                    stuck,
+                ]
+            }
+        )
+
+    def test_batch_write_item_chunks_requests(self):
+        """Test batch_write_item splits writes into 25-item batches."""
+        custom_client = MagicMock()
+        custom_client.batch_write_item.return_value = {}
+        custom_client.describe_table.return_value = {
+            "Table": {"KeySchema": [{"AttributeName": "id"}]}
+        }
+        items = [{"id": {"S": str(i)}} for i in range(60)]
+
+        result = batch_write_item(
+            "test-table", put_items=items, dynamodb_client=custom_client
+        )
+
+        self.assertEqual(result.processed_count, 60)
+        self.assertEqual(custom_client.batch_write_item.call_count, 3)
+        custom_client.describe_table.assert_called_once_with(
+            TableName="test-table"
+        )
+
+    def test_batch_write_item_keeps_last_request_per_key(self):
+        """Test batch_write_item sends one request per key, the last."""
+        custom_client = MagicMock()
+        custom_client.batch_write_item.return_value = {}
+        key_names = ["pk", "sk"]
+
+        def item(pk, sk, v):
+            return {"pk": {"S": pk}, "sk": {"N": sk}, "v": {"N": v}}
+
+        result = batch_write_item(
+            "test-table",
+            put_items=[
+                item("a", "1", "1"),
+                item("a", "2", "1"),
+                item("a", "1", "2"),
+                item("b", "1", "1"),
+            ],
+            delete_keys=[{"sk": {"N": "1"}, "pk": {"S": "b"}}],
+            key_names=key_names,
+            dynamodb_client=custom_client,
+        )
+
+        self.assertEqual(result.processed_count, 3)
+        custom_client.describe_table.assert_not_called()
+        custom_client.batch_write_item.assert_called_once_with(
+            RequestItems={
+                "test-table": [
+                    {"PutRequest": {"Item": item("a", "1", "2")}},
+                    {"PutRequest": {"Item": item("a", "2", "1")}},
+                    {
+                        "DeleteRequest": {
+                            "Key": {"sk": {"N": "1"}, "pk": {"S": "b"}}
+                        }
+                    },
+                ]
+            }
+        )
+
+    def test_batch_get_item_skips_repeated_keys(self):
+        """Test batch_get_item requests each key once."""
+        custom_client = MagicMock()
+        custom_client.batch_get_item.return_value = {
+            "Responses": {"test-table": [{"id": {"S": "1"}}]}
+        }
+        keys = [{"id": {"S": "1"}}, {"id": {"S": "2"}}, {"id": {"S": "1"}}]
+
+        batch_get_item("test-table", keys, dynamodb_client=custom_client)
+
+        custom_client.batch_get_item.assert_called_once_with(
+            RequestItems={"test-table": {"Keys": keys[:2]}}
+        )
+
+    def test_deserialize_item_matches_type_deserializer(self):
+        """Test deserialize_item agrees with boto3's TypeDeserializer."""
+        item = {
+            "id": {"S": "1"},
+            "qty": {"N": "42"},
+            "price": {"N": "9.99"},
+            "active": {"BOOL": True},
+            "missing": {"NULL": True},
+            "tags": {"SS": ["a", "b"]},
+            "scores": {"NS": ["1", "2.5"]},
+            "nested": {
+                "M": {"list": {"L": [{"N": "1"}, {"S": "x"}, {"M": {}}]}}
+            },
+        }
+        type_deserializer = TypeDeserializer()
+        expected = {
+            key: type_deserializer.deserialize(value)
+            for key, value in item.items()
+        }
+
+        self.assertEqual(deserialize_item(item), expected)
+
+    def test_deserialize_item_binary(self):
+        """Test deserialize_item returns binary values as bytes."""
+        item = {"blob": {"B": b"\x00\x01"}, "blobs": {"BS": [b"a", b"b"]}}
+
+        result = deserialize_item(item)
+
+        self.assertEqual(result, {"blob": b"\x00\x01", "blobs": {b"a", b"b"}})
+
+    def test_deserialize_item_use_float(self):
+        """Test deserialize_item returns int and float numbers."""
+        item = {"qty": {"N": "42"}, "price": {"N": "9.99"}, "e": {"N": "1E3"}}
+
+        result = deserialize_item(item, use_float=True)
+
+        self.assertEqual(result, {"qty": 42, "price": 9.99, "e": 1000.0})
+        self.assertIsInstance(result["qty"], int)
+        self.assertIsInstance(result["e"], float)
+
+    @patch("aws_v2.dynamodb.client")
+    def test_scan_deserialize(self, mock_client):
+        """Test scan converts items when deserialize is set."""
+        mock_client.scan.side_effect = self.mock_paginated_responses
+
+        result = scan(table_name="test-table", deserialize=True)
+
+        self.assertEqual(
+            result.items,
+            [
+                {"id": "1", "name": "Item 1", "active": True},
+                {"id": "2", "name": "Item 2", "active": False},
+            ],
+        )
+        self.assertEqual(result.last_evaluated_key, None)
+
+    def test_query_pages_deserialize_keeps_raw_keys(self):
+        """Test deserialized pages still expose raw continuation keys."""
+        custom_client = MagicMock()
+        custom_client.query.side_effect = self.mock_paginated_responses
+
+        pages = list(
+            query_pages(
+                "test-table",
+                "id = :id",
+                expression_attr_val={":id": {"N": "1"}},
+                deserialize=True,
+                use_float=True,
+                dynamodb_client=custom_client,
+            )
+        )
+
+        self.assertEqual(pages[0].items[0]["id"], "1")
+        self.assertEqual(pages[0].last_evaluated_key, {"id": {"S": "1"}})
+
+    def test_batch_get_item_deserialize(self):
+        """Test batch_get_item converts items when deserialize is set."""
+        custom_client = MagicMock()
+        custom_client.batch_get_item.return_value = {
+            "Responses": {"test-table": [{"qty": {"N": "3"}}]}
+        }
+
+        result = batch_get_item(
+            "test-table",
+            [{"id": {"S": "1"}}],
+            deserialize=True,
+            dynamodb_client=custom_client,
+        )
+
+        self.assertEqual(result.items, [{"qty": Decimal("3")}])
+
+    @patch("aws_v2.dynamodb.time")
+    def test_capacity_rate_limiter_waits_off_debt(self, mock_time):
+        """Test the limiter sleeps until consumed capacity is repaid."""
+        clock = [100.0]
+        mock_time.monotonic.side_effect = lambda: clock[0]
+
+        def sleep(seconds):
+            clock[0] += seconds
+
+        mock_time.sleep.side_effect = sleep
+        limiter = CapacityRateLimiter(rate=10)
+
+        limiter.acquire()
+        mock_time.sleep.assert_not_called()
+
+        limiter.consume(40)
+        limiter.acquire()
+
+        # Balance was 10 - 40 = -30, repaid at 10 units per second.
+        mock_time.sleep.assert_called_once_with(3.0)
+        self.assertEqual(clock[0], 103.0)
+
+    def test_capacity_rate_limiter_rejects_zero_rate(self):
+        """Test the limiter requires a positive rate."""
+        with self.assertRaises(ValueError):
+            CapacityRateLimiter(rate=0)
+
+    def test_scan_with_rate_limiter(self):
+        """Test scan requests and reports consumed capacity."""
+        custom_client = MagicMock()
+        custom_client.scan.side_effect = self.mock_paginated_responses
+        limiter = MagicMock()
+
+        scan("test-table", rate_limiter=limiter, dynamodb_client=custom_client)
+
+        custom_client.scan.assert_any_call(
+            TableName="test-table", ReturnConsumedCapacity="TOTAL"
+        )
+        self.assertEqual(limiter.acquire.call_count, 2)
+        limiter.consume.assert_any_call(0.0)
+        limiter.consume.assert_any_call(0.5)
+
+    def test_scan_parallel_segments(self):
+        """Test scan reads every segment and combines the results."""
+        custom_client = MagicMock()
+
+        def segment_response(**kwargs):
+            segment = kwargs["Segment"]
+            return {
+                "Items": [{"id": {"S": str(segment)}}],
+                "Count": 1,
+                "ScannedCount": 2,
+            }
+
+        custom_client.scan.side_effect = segment_response
+
+        result = scan(
+            "test-table", total_segments=3, dynamodb_client=custom_client
+        )
+
+        self.assertEqual(
+            [item["id"]["S"] for item in result.items], ["0", "1", "2"]
+        )
+        self.assertEqual(result.count, 3)
+        self.assertEqual(result.scanned_count, 6)
+        custom_client.scan.assert_any_call(
+            TableName="test-table", Segment=2, TotalSegments=3
+        )
+
+    def test_scan_parallel_sums_capacity_and_caps_workers(self):
+        """Test a parallel scan sums capacity and limits its threads."""
+        custom_client = MagicMock()
+
+        def segment_response(**kwargs):
+            segment = kwargs["Segment"]
+            response = {
+                "Items": [],
+                "Count": 0,
+                "ScannedCount": 0,
+                "ConsumedCapacity": {
+                    "TableName": "test-table",
+                    "CapacityUnits": 0.5,
+                },
+            }
+            if "ExclusiveStartKey" not in kwargs:
+                response["LastEvaluatedKey"] = {"id": {"S": str(segment)}}
+            return response
+
+        custom_client.scan.side_effect = segment_response
+
+        with patch(
+            "aws_v2.dynamodb.ThreadPoolExecutor", wraps=ThreadPoolExecutor
+        ) as mock_executor:
+            result = scan(
+                "test-table",
+                total_segments=6,
+                rate_limiter=MagicMock(),
+                max_workers=2,
+                dynamodb_client=custom_client,
+            )
+
+        mock_executor.assert_called_once_with(max_workers=2)
+        self.assertEqual(custom_client.scan.call_count, 12)
+        self.assertEqual(
+            result.consumed_capacity,
+            {"TableName": "test-table", "CapacityUnits": 6.0},
+        )
+
+    def test_read_capacity_limiter_rejects_fraction(self):
+        """Test an invalid fraction is a ValueError, not an AwsError."""
+        custom_client = MagicMock()
+
+        with self.assertRaises(ValueError) as context:
+            read_capacity_limiter(
+                "test-table", 1.5, dynamodb_client=custom_client
+            )
+
+        self.assertNotIsInstance(context.exception, AwsError)
+        custom_client.describe_table.assert_not_called()
+
+    def test_read_capacity_limiter(self):
+        """Test read_capacity_limiter targets a fraction of table RCU."""
+        custom_client = MagicMock()
+        custom_client.describe_table.return_value = {
+            "Table": {"ProvisionedThroughput": {"ReadCapacityUnits": 200}}
+        }
+
+        limiter = read_capacity_limiter(
+            "test-table", 0.25, dynamodb_client=custom_client
+        )
+
+        self.assertEqual(limiter.rate, 50)
+
+    def test_read_capacity_limiter_on_demand(self):
+        """Test read_capacity_limiter rejects on-demand tables."""
+        custom_client = MagicMock()
+        custom_client.describe_table.return_value = {
+            "Table": {"ProvisionedThroughput": {"ReadCapacityUnits": 0}}
+        }
+
+        with self.assertRaises(AwsError):
+            read_capacity_limiter(
+                "test-table", 0.25, dynamodb_client=custom_client
+            )
+
+    def test_scan_max_pages_returns_continuation_key(self):
+        """Test scan stops after max_pages with a real continuation key."""
+        custom_client = MagicMock()
+        custom_client.scan.side_effect = self.mock_paginated_responses
+
+        result = scan("test-table", max_pages=1, dynamodb_client=custom_client)
+
+        self.assertEqual(len(result.items), 1)
+        self.assertEqual(result.last_evaluated_key, {"id": {"S": "1"}})
+        custom_client.scan.assert_called_once_with(TableName="test-table")
+
+    def test_scan_exclusive_start_key(self):
+        """Test scan resumes from an exclusive start key."""
+        custom_client = MagicMock()
+        custom_client.scan.return_value = self.mock_paginated_responses[1]
+
+        result = scan(
+            "test-table",
+            exclusive_start_key={"id": {"S": "1"}},
+            dynamodb_client=custom_client,
+        )
+
+        self.assertIsNone(result.last_evaluated_key)
+        custom_client.scan.assert_called_once_with(
+            TableName="test-table", ExclusiveStartKey={"id": {"S": "1"}}
+        )
+
+    def test_scan_checkpoint_resume(self):
+        """Test an interrupted scan resumes from its checkpoint file."""
+        custom_client = MagicMock()
+        custom_client.scan.side_effect = self.mock_paginated_responses
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "scan.json")
+
+            first = scan(
+                "test-table",
+                max_pages=1,
+                checkpoint_path=path,
+                dynamodb_client=custom_client,
+            )
+            self.assertEqual(len(first.items), 1)
+            with open(path, encoding="utf-8") as checkpoint_file:
+                state = json.load(checkpoint_file)
+            self.assertEqual(
+                state["segments"]["0"]["last_evaluated_key"],
+                {"id": {"S": "1"}},
+            )
+
+            second = scan(
+                "test-table",
+                checkpoint_path=path,
+                dynamodb_client=custom_client,
+            )
+            self.assertEqual(len(second.items), 1)
+            self.assertIsNone(second.last_evaluated_key)
+            self.assertFalse(os.path.exists(path))
+
+        custom_client.scan.assert_called_with(
+            TableName="test-table", ExclusiveStartKey={"id": {"S": "1"}}
+        )
+
+    def test_scan_checkpoint_saved_on_failure(self):
+        """Test progress is checkpointed when a later page fails."""
+        custom_client = MagicMock()
+        custom_client.scan.side_effect = [
+            self.mock_paginated_responses[0],
+            RuntimeError("connection reset"),
+        ]
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "scan.json")
+            with self.assertRaises(AwsError):
+                scan(
+                    "test-table",
+                    checkpoint_path=path,
+                    dynamodb_client=custom_client,
+                )
+
+            with open(path, encoding="utf-8") as checkpoint_file:
+                state = json.load(checkpoint_file)
+            self.assertEqual(
+                state["segments"]["0"],
+                {"done": False, "last_evaluated_key": {"id": {"S": "1"}}},
+            )
+
+    def test_scan_checkpoint_binary_key(self):
+        """Test binary key attributes survive a checkpoint round trip."""
+        custom_client = MagicMock()
+        binary_key = {"id": {"B": b"\xff\x00"}}
+        custom_client.scan.side_effect = [
+            {"Items": [], "Count": 0, "LastEvaluatedKey": binary_key},
+            {"Items": [], "Count": 0},
+        ]
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "scan.json")
+            scan(
+                "test-table",
+                max_pages=1,
+                checkpoint_path=path,
+                dynamodb_client=custom_client,
+            )
+            scan(
+                "test-table",
+                checkpoint_path=path,
+                dynamodb_client=custom_client,
+            )
+
+        custom_client.scan.assert_called_with(
+            TableName="test-table", ExclusiveStartKey=binary_key
+        )
+
+    def test_scan_checkpoint_mismatch(self):
+        """Test a checkpoint for another table is rejected."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "scan.json")
+            with open(path, "w", encoding="utf-8") as checkpoint_file:
+                json.dump(
+                    {
+                        "table_name": "other-table",
+                        "total_segments": 1,
+                        "segments": {},
+                    },
+                    checkpoint_file,
+                )
+
+            with self.assertRaises(AwsError):
+                scan(
+                    "test-table",
+                    checkpoint_path=path,
+                    dynamodb_client=MagicMock(),
+                )
+
+    def test_scan_checkpoint_rejects_different_request(self):
+        """Test a checkpoint is only resumed by the same scan request."""
+        custom_client = MagicMock()
+        custom_client.scan.side_effect = self.mock_paginated_responses
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "scan.json")
+            scan(
+                "test-table",
+                filter_expression="kind = :kind",
+                expression_attr_val={":kind": {"S": "a"}},
+                max_pages=1,
+                checkpoint_path=path,
+                dynamodb_client=custom_client,
+            )
+
+            with self.assertRaises(AwsError):
+                scan(
+                    "test-table",
+                    filter_expression="kind = :kind",
+                    expression_attr_val={":kind": {"S": "b"}},
+                    checkpoint_path=path,
+                    dynamodb_client=custom_client,
+                )
+            with self.assertRaises(AwsError):
+                scan(
+                    "test-table",
+                    exclusive_start_key={"id": {"S": "1"}},
+                    checkpoint_path=path,
+                    dynamodb_client=custom_client,
+                )
+            self.assertEqual(custom_client.scan.call_count, 1)
+
+    def test_scan_parallel_segment_keys(self):
+        """Test a parallel scan reports per-segment continuation keys."""
+        custom_client = MagicMock()
+
+        def segment_response(**kwargs):
+            segment = kwargs["Segment"]
+            return {
+                "Items": [],
+                "Count": 0,
+                "LastEvaluatedKey": {"id": {"S": f"seg-{segment}"}},
+            }
+
+        custom_client.scan.side_effect = segment_response
+
+        result = scan(
+            "test-table",
+            total_segments=2,
+            max_pages=1,
+            dynamodb_client=custom_client,
+        )
+
+        # Segments that had not started before the budget ran out are
+        # reported with no key so they restart from the beginning.
+        self.assertIsNone(result.last_evaluated_key)
+        self.assertEqual(set(result.segment_keys), {0, 1})
+        for segment, key in result.segment_keys.items():
+            self.assertIn(key, (None, {"id": {"S": f"seg-{segment}"}}))
+
+    def _column_client(self):
+        """Create a client returning two pages of heterogeneous items."""
+        custom_client = MagicMock()
+        custom_client.scan.side_effect = [
+            {
+                "Items": [
+                    {"id": {"S": "1"}, "qty": {"N": "3"}},
+                    {"id": {"S": "2"}, "tags": {"SS": ["b", "a"]}},
+                ],
+                "LastEvaluatedKey": {"id": {"S": "2"}},
+            },
+            {"Items": [{"id": {"S": "3"}, "qty": {"N": "4.5"}}]},
+        ]
+        return custom_client
+
+    def test_scan_columns(self):
+        """Test scan_columns transposes pages into column lists."""
+        custom_client = self._column_client()
+
+        pages = list(
+            scan_columns(
+                "test-table",
+                columns=["id", "qty", "tags"],
+                dynamodb_client=custom_client,
+            )
+        )
+
+        self.assertEqual(
+            pages[0],
+            {"id": ["1", "2"], "qty": [3, None], "tags": [None, ["a", "b"]]},
+        )
+        self.assertEqual(pages[1]["qty"], [4.5])
+        custom_client.scan.assert_any_call(
+            TableName="test-table",
+            ProjectionExpression="#col0, #col1, #col2",
+            ExpressionAttributeNames={
+                "#col0": "id",
+                "#col1": "qty",
+                "#col2": "tags",
+            },
+        )
+
+    def test_scan_columns_infers_columns(self):
+        """Test scan_columns uses the first page's attributes."""
+        pages = list(
+            scan_columns("test-table", dynamodb_client=self._column_client())
+        )
+
+        self.assertEqual(list(pages[0]), ["id", "qty", "tags"])
+        self.assertEqual(pages[1]["tags"], [None])
+
+    def test_export_scan_csv(self):
+        """Test export_scan writes CSV rows incrementally."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "export.csv")
+
+            rows = export_scan(
+                "test-table",
+                path,
+                file_format="csv",
+                dynamodb_client=self._column_client(),
+            )
+
+            with open(path, newline="", encoding="utf-8") as csv_file:
+                written = list(csv.reader(csv_file))
+
+        self.assertEqual(rows, 3)
+        self.assertEqual(
+            written,
+            [
+                ["id", "qty", "tags"],
+                ["1", "3", ""],
+                ["2", "", '["a", "b"]'],
+                ["3", "4.5", ""],
+            ],
+        )
+
+    def test_export_scan_unknown_format(self):
+        """Test export_scan rejects unknown formats."""
+        with self.assertRaises(AwsError):
+            export_scan(
+                "test-table",
+                "out.json",
+                file_format="json",
+                dynamodb_client=MagicMock(),
+            )
+
+    @patch("aws_v2.dynamodb.import_optional")
+    def test_scan_to_numpy_missing_dependency(self, mock_import):
+        """Test a missing optional dependency surfaces as AwsError."""
+        mock_import.side_effect = ImportError("numpy is required")
+
+        with self.assertRaises(AwsError):
+            scan_to_numpy("test-table", dynamodb_client=MagicMock())
+
+    @unittest.skipUnless(HAS_NUMPY, "numpy is not installed")
+    def test_scan_to_numpy(self):
+        """Test scan_to_numpy builds one array per attribute."""
+        import numpy
+
+        arrays = scan_to_numpy(
+            "test-table",
+            columns=["id", "qty"],
+            dynamodb_client=self._column_client(),
+        )
+
+        self.assertEqual(arrays["id"].tolist(), ["1", "2", "3"])
+        self.assertEqual(arrays["qty"].dtype, numpy.float64)
+        self.assertEqual(arrays["qty"][0], 3.0)
+        self.assertTrue(numpy.isnan(arrays["qty"][1]))
+
+    @unittest.skipUnless(HAS_NUMPY, "numpy is not installed")
+    def test_scan_to_numpy_mixed_columns(self):
+        """Test mixed-type columns keep their values as objects."""
+        custom_client = MagicMock()
+        custom_client.scan.side_effect = [
+            {
+                "Items": [
+                    {
+                        "id": {"S": "1"},
+                        "qty": {"N": "3"},
+                        "ok": {"BOOL": True},
+                    },
+                    {"id": {"S": "2"}, "qty": {"S": "abc"}, "ok": {"N": "2"}},
+                ],
+                "LastEvaluatedKey": {"id": {"S": "2"}},
+            },
+            {
+                "Items": [
+                    {"id": {"S": "3"}, "qty": {"S": "x"}, "ok": {"N": "1"}}
+                ]
+            },
+        ]
+
+        arrays = scan_to_numpy(
+            "test-table",
+            columns=["id", "qty", "ok"],
+            dynamodb_client=custom_client,
+        )
+
+        self.assertEqual(arrays["id"].dtype.kind, "U")
+        self.assertEqual(arrays["qty"].dtype, object)
+        self.assertEqual(arrays["qty"].tolist(), [3, "abc", "x"])
+        self.assertEqual(arrays["ok"].dtype, object)
+        self.assertEqual(
+            [type(value) for value in arrays["ok"]], [bool, int, int]
+        )
+
+    @unittest.skipUnless(HAS_PYARROW, "pyarrow is not installed")
+    def test_export_scan_parquet(self):
+        """Test export_scan writes Parquet with a fixed schema."""
+        import pyarrow
+        import pyarrow.parquet
+
+        schema = pyarrow.schema(
+            [("id", pyarrow.string()), ("qty", pyarrow.float64())]
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "export.parquet")
+
+            rows = export_scan(
+                "test-table",
+                path,
+                schema=schema,
+                dynamodb_client=self._column_client(),
+            )
+            table = pyarrow.parquet.read_table(path)
+
+        self.assertEqual(rows, 3)
+        self.assertEqual(table.schema, schema)
+        self.assertEqual(table.column("qty").to_pylist(), [3.0, None, 4.5])
+
+    @unittest.skipUnless(HAS_PYARROW, "pyarrow is not installed")
+    def test_scan_record_batches(self):
+        """Test scan_record_batches yields one batch per page."""
+        batches = list(
+            scan_record_batches(
+                "test-table",
+                columns=["id"],
+                dynamodb_client=self._column_client(),
+            )
+        )
+
+        self.assertEqual([batch.num_rows for batch in batches], [2, 1])
+        self.assertEqual(batches[1].schema, batches[0].schema)
+
+    def test_get_item(self):
+        """Test get_item returns the item and consumed capacity."""
+        custom_client = MagicMock()
+        custom_client.get_item.return_value = {
+            "Item": {"id": {"S": "1"}, "qty": {"N": "2"}},
+            "ConsumedCapacity": {"CapacityUnits": 0.5},
+        }
+
+        result = get_item(
+            "test-table",
+            {"id": {"S": "1"}},
+            consistent_read=True,
+            deserialize=True,
+            dynamodb_client=custom_client,
+        )
+
+        self.assertIsInstance(result, DynamoDBGetItemOutput)
+        self.assertEqual(result.item, {"id": "1", "qty": Decimal("2")})
+        self.assertEqual(result.consumed_capacity, {"CapacityUnits": 0.5})
+        custom_client.get_item.assert_called_once_with(
+            TableName="test-table",
+            Key={"id": {"S": "1"}},
+            ConsistentRead=True,
+        )
+
+    def test_get_item_read_through_cache(self):
+        """Test get_item serves repeat reads and misses from the cache."""
+        custom_client = MagicMock()
+        custom_client.get_item.side_effect = [
+            {"Item": {"id": {"S": "1"}}},
+            {},
+        ]
+        cache = TTLCache(ttl=60)
+
+        for _ in range(3):
+            result = get_item(
+                "test-table",
+                {"id": {"S": "1"}},
+                cache=cache,
+                dynamodb_client=custom_client,
+            )
+            self.assertEqual(result.item, {"id": {"S": "1"}})
+        for _ in range(2):
+            missing = get_item(
+                "test-table",
+                {"id": {"S": "2"}},
+                cache=cache,
+                dynamodb_client=custom_client,
+            )
+            self.assertIsNone(missing.item)
+
+        self.assertEqual(custom_client.get_item.call_count, 2)
+
+    def test_invalidate_item(self):
+        """Test invalidate_item forces the next read to the network."""
+        custom_client = MagicMock()
+        custom_client.get_item.side_effect = [
+            {"Item": {"id": {"S": "1"}, "v": {"N": "1"}}},
+            {"Item": {"id": {"S": "1"}, "v": {"N": "2"}}},
+        ]
+        cache = TTLCache(ttl=60)
+        key = {"id": {"S": "1"}}
+
+        get_item("test-table", key, cache=cache, dynamodb_client=custom_client)
+        invalidate_item(cache, "test-table", key)
+        result = get_item(
+            "test-table", key, cache=cache, dynamodb_client=custom_client
+        )
+
+        self.assertEqual(result.item["v"], {"N": "2"})
+        self.assertEqual(custom_client.get_item.call_count, 2)
+
+    def test_batch_get_item_with_cache(self):
+        """Test batch_get_item only fetches keys missing from the cache."""
+        custom_client = MagicMock()
+        custom_client.batch_get_item.return_value = {
+            "Responses": {"test-table": [{"id": {"S": "2"}, "v": {"N": "2"}}]}
+        }
+        cache = TTLCache(ttl=60)
+        priming_client = MagicMock()
+        priming_client.get_item.return_value = {
+            "Item": {"id": {"S": "1"}, "v": {"N": "1"}}
+        }
+        get_item(
+            "test-table",
+            {"id": {"S": "1"}},
+            deserialize=True,
+            cache=cache,
+            dynamodb_client=priming_client,
+        )
+        keys = [{"id": {"S": "1"}}, {"id": {"S": "2"}}, {"id": {"S": "3"}}]
+
+        first = batch_get_item(
+            "test-table",
+            keys,
+            deserialize=True,
+            cache=cache,
+            dynamodb_client=custom_client,
+        )
+        second = batch_get_item(
+            "test-table",
+            keys,
+            deserialize=True,
+            cache=cache,
+            dynamodb_client=custom_client,
+        )
+
+        custom_client.batch_get_item.assert_called_once_with(
+            RequestItems={"test-table": {"Keys": keys[1:]}}
+        )
+        expected = [{"id": "1", "v": Decimal(1)}, {"id": "2", "v": Decimal(2)}]
+        self.assertEqual(first.items, expected)
+        self.assertEqual(second.items, expected)
+
+    def test_get_item_cache_hands_out_copies(self):
+        """Test cached items are copied and report their source."""
+        custom_client = MagicMock()
+        custom_client.get_item.return_value = {
+            "Item": {"id": {"S": "1"}, "v": {"N": "1"}},
+            "ConsumedCapacity": {"CapacityUnits": 0.5},
+        }
+        cache = TTLCache(ttl=60)
+        key = {"id": {"S": "1"}}
+
+        first = get_item(
+            "test-table", key, cache=cache, dynamodb_client=custom_client
+        )
+        first.item["v"]["N"] = "9"
+        second = get_item(
+            "test-table", key, cache=cache, dynamodb_client=custom_client
+        )
+
+        self.assertEqual(first.source, "request")
+        self.assertEqual(first.consumed_capacity, {"CapacityUnits": 0.5})
+        self.assertEqual(second.source, "cache")
+        self.assertIsNone(second.consumed_capacity)
+        self.assertEqual(second.item["v"], {"N": "1"})
+
+    def test_batch_get_item_shares_in_flight_get_item(self):
+        """Test batch_get_item does not refetch a key being read."""
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_get_item(**kwargs):
+            started.set()
+            release.wait(5)
+            return {"Item": {"id": {"S": "1"}}}
+
+        custom_client = MagicMock()
+        custom_client.get_item.side_effect = slow_get_item
+
+        def batch_get(**kwargs):
+            # Let the GetItem finish once the batch has claimed its keys.
+            release.set()
+            return {"Responses": {"test-table": [{"id": {"S": "2"}}]}}
+
+        custom_client.batch_get_item.side_effect = batch_get
+        cache = TTLCache(ttl=60)
+        keys = [{"id": {"S": "1"}}, {"id": {"S": "2"}}]
+
+        reader = threading.Thread(
+            target=get_item,
+            args=("test-table", keys[0]),
+            kwargs={"cache": cache, "dynamodb_client": custom_client},
+        )
+        reader.start()
+        started.wait(5)
+        result = batch_get_item(
+            "test-table", keys, cache=cache, dynamodb_client=custom_client
+        )
+        reader.join(5)
+
+        custom_client.get_item.assert_called_once()
+        custom_client.batch_get_item.assert_called_once_with(
+            RequestItems={"test-table": {"Keys": keys[1:]}}
+        )
+        self.assertEqual(result.items, keys)
+        result.items[0]["id"]["S"] = "changed"
+        cached = get_item(
+            "test-table", keys[0], cache=cache, dynamodb_client=custom_client
+        )
+        self.assertEqual(cached.item, {"id": {"S": "1"}})
+
 
 if __name__ == "__main__":
     unittest.main()
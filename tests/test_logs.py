@@ -1,10 +1,33 @@
 """Unit tests for CloudWatch Logs utility functions."""
 
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
 import unittest
 from datetime import datetime
 from unittest.mock import MagicMock, patch
 
-from aws_v2.logs import FilterLogEventsInput, filter_log_events
+from botocore.exceptions import ClientError
+
+from aws_v2.exceptions import AwsError
+from aws_v2.logs import (
+    FilterLogEventsInput,
+    LogWriter,
+    filter_log_event_batch,
+    filter_log_events,
+    filter_log_events_cached,
+    filter_log_events_parallel,
+    follow_log_events,
+    parse_log_events,
+    put_log_events,
+    run_insights_queries,
+    run_insights_query,
+    stream_log_events,
+)
+from aws_v2.models.logs import LogEvent, LogEventBatch
 
 
 class TestLogs(unittest.TestCase):
@@ -158,6 +181,703 @@ class TestLogs(unittest.TestCase):
         self.assertEqual(len(result), 0)
         self.assertEqual(result, [])
 
+    def test_stream_log_events(self):
+        """Test stream_log_events yields events lazily."""
+        inputs = FilterLogEventsInput(
+            log_group_name="/aws/lambda/my-function",
+            log_stream_name_prefix="2025/08",
+            start_time=1722528000000,
+        )
+
+        events = stream_log_events(inputs, self.mock_logs_client)
+
+        self.mock_paginator.paginate.assert_not_called()
+        self.assertEqual(next(events).timestamp, 1722528000000)
+        self.assertEqual(len(list(events)), 2)
+        self.mock_paginator.paginate.assert_called_once_with(
+            logGroupName="/aws/lambda/my-function",
+            logStreamNamePrefix="2025/08",
+            startTime=1722528000000,
+        )
+
+    def test_filter_log_events_parallel(self):
+        """Test windows and streams are queried and merged in order."""
+        inputs = FilterLogEventsInput(
+            log_group_name="/aws/lambda/my-function",
+            log_stream_name_prefix="unused",
+            start_time=0,
+            end_time=99,
+            filter_pattern="ERROR",
+        )
+        requests = []
+
+        def paginate(**request):
+            requests.append(request)
+            stream = request["logStreamNames"][0]
+            offset = 0 if stream == "a" else 1
+            timestamps = range(
+                request["startTime"] + offset, request["endTime"] + 1, 10
+            )
+            return [
+                {
+                    "events": [
+                        {
+                            "timestamp": timestamp,
+                            "message": stream,
+                            "ingestionTime": timestamp,
+                            "logStreamName": stream,
+                            "eventId": f"{stream}{timestamp}",
+                        }
+                        for timestamp in reversed(timestamps)
+                    ]
+                }
+            ]
+
+        self.mock_paginator.paginate.side_effect = paginate
+
+        events = list(
+            filter_log_events_parallel(
+                inputs,
+                windows=4,
+                log_stream_names=["a", "b"],
+                max_workers=2,
+                logs_client=self.mock_logs_client,
+            )
+        )
+
+        self.assertEqual(len(requests), 8)
+        self.assertEqual(
+            sorted(
+                (request["startTime"], request["endTime"])
+                for request in requests
+                if request["logStreamNames"] == ["a"]
+            ),
+            [(0, 24), (25, 49), (50, 74), (75, 99)],
+        )
+        self.assertNotIn("logStreamNamePrefix", requests[0])
+        timestamps = [event.timestamp for event in events]
+        self.assertEqual(timestamps, sorted(timestamps))
+        self.assertEqual(len(events), 24)
+        self.assertEqual(events[1].log_stream_name, "b")
+        self.assertEqual(events[1].event_id, "b1")
+
+    def test_filter_log_events_parallel_requires_range(self):
+        """Test filter_log_events_parallel needs start and end times."""
+        with self.assertRaises(AwsError):
+            list(
+                filter_log_events_parallel(
+                    FilterLogEventsInput("/aws/lambda/x", "2025/08"),
+                    logs_client=self.mock_logs_client,
+                )
+            )
+
+    @patch("aws_v2.logs.time.sleep")
+    def test_run_insights_query(self, mock_sleep):
+        """Test run_insights_query polls until complete and types rows."""
+        self.mock_logs_client.start_query.return_value = {"queryId": "q-1"}
+        self.mock_logs_client.get_query_results.side_effect = [
+            {"status": "Running", "results": []},
+            {
+                "status": "Complete",
+                "results": [
+                    [
+                        {"field": "level", "value": "ERROR"},
+                        {"field": "errors", "value": "3"},
+                        {"field": "@ptr", "value": "abc"},
+                    ]
+                ],
+                "statistics": {"recordsMatched": 3.0, "recordsScanned": 9.0},
+            },
+        ]
+
+        result = run_insights_query(
+            "stats count(*) as errors by level",
+            ["/aws/lambda/my-function"],
+            datetime(2025, 8, 1),
+            1754092800,
+            limit=10,
+            field_types={"errors": int},
+            logs_client=self.mock_logs_client,
+        )
+
+        self.mock_logs_client.start_query.assert_called_once_with(
+            logGroupNames=["/aws/lambda/my-function"],
+            startTime=int(datetime(2025, 8, 1).timestamp()),
+            endTime=1754092800,
+            queryString="stats count(*) as errors by level",
+            limit=10,
+        )
+        self.assertEqual(result.query_id, "q-1")
+        self.assertEqual(result.rows, [{"level": "ERROR", "errors": 3}])
+        self.assertEqual(result.records_scanned, 9.0)
+        self.assertEqual(mock_sleep.call_count, 1)
+
+    @patch("aws_v2.logs.time.sleep")
+    @patch("aws_v2.logs.time.monotonic")
+    def test_run_insights_query_timeout(self, mock_monotonic, mock_sleep):
+        """Test run_insights_query stops a query that runs too long."""
+        mock_monotonic.side_effect = [0, 5, 11]
+        self.mock_logs_client.start_query.return_value = {"queryId": "q-1"}
+        self.mock_logs_client.get_query_results.return_value = {
+            "status": "Running"
+        }
+
+        with self.assertRaises(AwsError):
+            run_insights_query(
+                "fields @message",
+                ["/aws/lambda/my-function"],
+                0,
+                60,
+                timeout=10,
+                logs_client=self.mock_logs_client,
+            )
+
+        self.mock_logs_client.stop_query.assert_called_once_with(queryId="q-1")
+
+    def test_run_insights_queries_shards(self):
+        """Test run_insights_queries runs one query per batch and shard."""
+        self.mock_logs_client.start_query.side_effect = lambda **request: {
+            "queryId": f"{request['logGroupNames'][0]}@{request['startTime']}"
+        }
+        self.mock_logs_client.get_query_results.side_effect = lambda queryId: {
+            "status": "Complete",
+            "results": [[{"field": "id", "value": queryId}]],
+        }
+
+        results = run_insights_queries(
+            "fields @message",
+            ["g1", "g2", "g3"],
+            0,
+            99,
+            shards=2,
+            group_batch_size=2,
+            logs_client=self.mock_logs_client,
+        )
+
+        self.assertEqual(
+            [result.rows[0]["id"] for result in results],
+            ["g1@0", "g3@0", "g1@49", "g3@49"],
+        )
+        self.assertEqual(
+            sorted(
+                (call.kwargs["startTime"], call.kwargs["endTime"])
+                for call in self.mock_logs_client.start_query.call_args_list
+            ),
+            [(0, 49), (0, 49), (49, 99), (49, 99)],
+        )
+        self.assertIn(
+            ["g1", "g2"],
+            [
+                call.kwargs["logGroupNames"]
+                for call in self.mock_logs_client.start_query.call_args_list
+            ],
+        )
+
+    @patch("aws_v2.logs.time.sleep")
+    def test_run_insights_queries_stops_others_on_error(self, mock_sleep):
+        """Test a failed query stops the queries still running."""
+        stopped = set()
+        self.mock_logs_client.start_query.side_effect = lambda **request: {
+            "queryId": f"q{request['startTime']}"
+        }
+
+        def results(queryId):
+            if queryId == "q0":
+                return {"status": "Failed"}
+            if queryId in stopped:
+                return {"status": "Cancelled"}
+            return {"status": "Running"}
+
+        self.mock_logs_client.get_query_results.side_effect = results
+        self.mock_logs_client.stop_query.side_effect = (
+            lambda queryId: stopped.add(queryId)
+        )
+
+        with self.assertRaises(AwsError):
+            run_insights_queries(
+                "fields @message",
+                ["g1"],
+                0,
+                100,
+                shards=4,
+                max_workers=2,
+                logs_client=self.mock_logs_client,
+            )
+
+        started = {
+            f"q{call.kwargs['startTime']}"
+            for call in self.mock_logs_client.start_query.call_args_list
+        }
+        self.assertIn("q25", stopped)
+        self.assertEqual(stopped, started - {"q0"})
+        self.assertNotIn("q75", started)
+
+    def test_follow_log_events(self):
+        """Test follow_log_events yields each event once and backs off."""
+
+        def event(stream, timestamp):
+            return {
+                "timestamp": timestamp,
+                "message": f"{stream}-{timestamp}",
+                "ingestionTime": timestamp,
+                "logStreamName": stream,
+                "eventId": f"{stream}{timestamp}",
+            }
+
+        polls = [
+            [event("a", 1000), event("b", 2000)],
+            # Overlapping poll returns a repeat and a late event.
+            [event("b", 2000), event("a", 1500), event("a", 5000)],
+            [event("a", 5000)],
+            [],
+        ]
+        requests = []
+        stop_event = MagicMock(spec=threading.Event)
+        stop_event.is_set.side_effect = lambda: len(requests) == len(polls)
+
+        def paginate(**request):
+            requests.append(request)
+            return [{"events": polls[len(requests) - 1]}]
+
+        self.mock_paginator.paginate.side_effect = paginate
+        inputs = FilterLogEventsInput(
+            log_group_name="/aws/lambda/my-function",
+            log_stream_name_prefix="2025/08",
+            start_time=0,
+            end_time=99,
+        )
+
+        events = list(
+            follow_log_events(
+                inputs,
+                min_interval=1,
+                max_interval=3,
+                ingestion_delay=60,
+                overlap=1,
+                stop_event=stop_event,
+                logs_client=self.mock_logs_client,
+            )
+        )
+
+        self.assertEqual(
+            [event.message for event in events],
+            ["a-1000", "b-2000", "a-1500", "a-5000"],
+        )
+        self.assertEqual(
+            [request["startTime"] for request in requests],
+            [0, 1000, 4000, 4000],
+        )
+        self.assertNotIn("endTime", requests[0])
+        self.assertEqual(
+            [call.args[0] for call in stop_event.wait.call_args_list],
+            [1, 1, 2, 3],
+        )
+
+    @patch("aws_v2.logs.time.monotonic")
+    def test_follow_log_events_sweeps_for_late_events(self, mock_monotonic):
+        """Test polls re-read only the overlap until a periodic sweep."""
+
+        def event(timestamp):
+            return {
+                "timestamp": timestamp,
+                "message": str(timestamp),
+                "ingestionTime": timestamp,
+                "logStreamName": "a",
+                "eventId": str(timestamp),
+            }
+
+        polls = [
+            [event(20000)],
+            [event(30000)],
+            [event(40000)],
+            [event(40000), event(35000)],
+        ]
+        requests = []
+        clock = [0]
+        mock_monotonic.side_effect = lambda: clock[0]
+        stop_event = MagicMock(spec=threading.Event)
+        stop_event.is_set.side_effect = lambda: len(requests) == len(polls)
+
+        def paginate(**request):
+            requests.append(request)
+            clock[0] += 4
+            return [{"events": polls[len(requests) - 1]}]
+
+        self.mock_paginator.paginate.side_effect = paginate
+
+        events = list(
+            follow_log_events(
+                FilterLogEventsInput("group", "", start_time=0),
+                ingestion_delay=10,
+                overlap=1,
+                stop_event=stop_event,
+                logs_client=self.mock_logs_client,
+            )
+        )
+
+        self.assertEqual(
+            [request["startTime"] for request in requests],
+            [0, 19000, 29000, 30000],
+        )
+        self.assertEqual(
+            [event.message for event in events],
+            ["20000", "30000", "40000", "35000"],
+        )
+
+    def test_filter_log_event_batch(self):
+        """Test filter_log_event_batch stores events in columns."""
+        self.mock_paginator.paginate.return_value[0]["events"][0].update(
+            logStreamName="stream-1", eventId="id-1"
+        )
+        batch = filter_log_event_batch(self.inputs, self.mock_logs_client)
+
+        self.assertIsInstance(batch, LogEventBatch)
+        self.assertEqual(len(batch), 3)
+        self.assertEqual(batch.timestamps[2], 1724428800000)
+        self.assertEqual(
+            batch.message(1), "ERROR: Database connection timeout"
+        )
+        self.assertEqual(
+            list(batch)[0],
+            LogEvent(
+                timestamp=1722528000000,
+                message="ERROR: Failed to process request",
+                ingestion_time=1722528001000,
+                log_stream_name="stream-1",
+                event_id="id-1",
+            ),
+        )
+        self.assertIsNone(batch[1].log_stream_name)
+
+    def test_log_event_batch_time_range(self):
+        """Test LogEventBatch slices sorted and unsorted batches."""
+        events = [
+            LogEvent(
+                timestamp=timestamp, message=f"é{timestamp}", ingestion_time=0
+            )
+            for timestamp in (10, 20, 20, 30, 40)
+        ]
+        batch = LogEventBatch.from_events(events)
+
+        window = batch.time_range(20, 30)
+        self.assertEqual(list(window), events[1:4])
+        self.assertEqual(window.message(-1), "é30")
+        self.assertEqual(len(batch.time_range(41, 50)), 0)
+
+        shuffled = LogEventBatch.from_events(reversed(events))
+        self.assertFalse(shuffled.is_sorted())
+        self.assertEqual(
+            [event.timestamp for event in shuffled.time_range(15, 35)],
+            [30, 20, 20],
+        )
+        shuffled.append(25, "late", 0)
+        self.assertEqual(
+            [event.timestamp for event in shuffled.time_range(15, 35)],
+            [30, 20, 20, 25],
+        )
+
+    def test_log_event_batch_round_trip(self):
+        """Test LogEventBatch keeps stream names and IDs of each event."""
+        events = [
+            LogEvent(1, "a", 2, log_stream_name="s1", event_id="e1"),
+            LogEvent(3, "b", 4, log_stream_name="s2", event_id="e2"),
+            LogEvent(5, "c", 6),
+            LogEvent(7, "d", 8, log_stream_name="s1", event_id="e4"),
+        ]
+        batch = LogEventBatch.from_events(events)
+
+        self.assertEqual(list(batch), events)
+        self.assertEqual(batch.stream_names, ["s1", "s2", None])
+        self.assertEqual(list(batch.take([-1, 0])), [events[3], events[0]])
+        self.assertEqual(list(batch.time_range(3, 5)), events[1:3])
+        self.assertEqual(batch[-2], events[2])
+        with self.assertRaises(IndexError):
+            batch.take([4])
+
+    def test_parse_log_events(self):
+        """Test parse_log_events filters and extracts fields in order."""
+        events = [
+            LogEvent(
+                timestamp=index,
+                message=(
+                    f"2025-08-01T00:00:00Z req-{index} "
+                    f'{{"status": {500 + index % 2}, '
+                    f'"request": {{"id": "r{index}"}}}}'
+                ),
+                ingestion_time=index,
+                log_stream_name="stream",
+            )
+            for index in range(7)
+        ]
+        events.append(
+            LogEvent(timestamp=7, message="status 501", ingestion_time=7)
+        )
+
+        for use_processes in (False, True):
+            records = list(
+                parse_log_events(
+                    events,
+                    pattern=r"req-(?P<request>\d+) .*\"status\": 501",
+                    json_fields=["status", "request.id", "missing.path"],
+                    use_processes=use_processes,
+                    max_workers=2,
+                    chunk_size=2,
+                )
+            )
+
+            self.assertEqual(
+                [record.timestamp for record in records], [1, 3, 5]
+            )
+            self.assertEqual(
+                records[0].fields,
+                {
+                    "request": "1",
+                    "status": 501,
+                    "request.id": "r1",
+                    "missing.path": None,
+                },
+            )
+            self.assertEqual(records[0].log_stream_name, "stream")
+
+    def test_parse_log_events_worker_module(self):
+        """Test process workers can parse without importing aws_v2.logs."""
+        code = (
+            "import sys, aws_v2.log_parser; "
+            "print('aws_v2.logs' in sys.modules)"
+        )
+        environment = {
+            key: value
+            for key, value in os.environ.items()
+            if not key.startswith("AWS_")
+        }
+
+        output = subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True,
+            check=True,
+            env=environment,
+            text=True,
+        ).stdout
+
+        self.assertEqual(output.strip(), "False")
+
+    def test_filter_log_events_cached(self):
+        """Test settled buckets are fetched once and read from disk."""
+        requests = []
+
+        def paginate(**request):
+            requests.append(request)
+            timestamps = range(request["startTime"], request["endTime"], 400)
+            return [
+                {
+                    "events": [
+                        {
+                            "timestamp": timestamp,
+                            "message": f"event {timestamp}",
+                            "ingestionTime": timestamp + 1,
+                            "logStreamName": "stream",
+                            "eventId": str(timestamp),
+                        }
+                        for timestamp in timestamps
+                    ]
+                }
+            ]
+
+        self.mock_paginator.paginate.side_effect = paginate
+        inputs = FilterLogEventsInput(
+            log_group_name="/aws/lambda/my-function",
+            log_stream_name_prefix="2025/08",
+            start_time=1500,
+            end_time=2500,
+            filter_pattern="ERROR",
+        )
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            first = list(
+                filter_log_events_cached(
+                    inputs,
+                    cache_dir,
+                    bucket_seconds=1,
+                    logs_client=self.mock_logs_client,
+                )
+            )
+            second = list(
+                filter_log_events_cached(
+                    inputs,
+                    cache_dir,
+                    bucket_seconds=1,
+                    logs_client=self.mock_logs_client,
+                )
+            )
+            self.assertEqual(len(os.listdir(cache_dir)), 2)
+
+        self.assertEqual(
+            [
+                (request["startTime"], request["endTime"])
+                for request in requests
+            ],
+            [(1000, 1999), (2000, 2999)],
+        )
+        self.assertEqual(
+            [event.timestamp for event in first], [1800, 2000, 2400]
+        )
+        self.assertEqual(first, second)
+        self.assertEqual(second[0].event_id, "1800")
+
+    def test_filter_log_events_cached_skips_recent(self):
+        """Test buckets inside the ingestion delay are never cached."""
+        self.mock_paginator.paginate.return_value = [{"events": []}]
+        now = int(time.time() * 1000)
+        inputs = FilterLogEventsInput(
+            log_group_name="/aws/lambda/my-function",
+            log_stream_name_prefix="2025/08",
+            start_time=now - 1000,
+            end_time=now,
+        )
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            list(
+                filter_log_events_cached(
+                    inputs, cache_dir, logs_client=self.mock_logs_client
+                )
+            )
+            self.assertEqual(os.listdir(cache_dir), [])
+
+        request = self.mock_paginator.paginate.call_args.kwargs
+        self.assertEqual(request["endTime"], now)
+
+    def test_put_log_events_batches(self):
+        """Test put_log_events sorts events and splits on size limits."""
+        message = "x" * (512 * 1024 - 26)
+        events = [
+            LogEvent(timestamp=3, message=message, ingestion_time=0),
+            LogEvent(timestamp=1, message=message, ingestion_time=0),
+            LogEvent(timestamp=2, message=message, ingestion_time=0),
+        ]
+
+        calls = put_log_events(
+            "group", "stream", events, logs_client=self.mock_logs_client
+        )
+
+        self.assertEqual(calls, 2)
+        batches = [
+            call.kwargs["logEvents"]
+            for call in self.mock_logs_client.put_log_events.call_args_list
+        ]
+        self.assertEqual(
+            [[event["timestamp"] for event in batch] for batch in batches],
+            [[1, 2], [3]],
+        )
+
+    def test_put_log_events_creates_missing_stream(self):
+        """Test put_log_events creates a missing stream and retries."""
+        self.mock_logs_client.put_log_events.side_effect = [
+            ClientError(
+                {"Error": {"Code": "ResourceNotFoundException"}},
+                "PutLogEvents",
+            ),
+            {},
+        ]
+
+        put_log_events(
+            "group",
+            "stream",
+            [LogEvent(timestamp=1, message="hello", ingestion_time=0)],
+            create_stream=True,
+            logs_client=self.mock_logs_client,
+        )
+
+        self.mock_logs_client.create_log_stream.assert_called_once_with(
+            logGroupName="group", logStreamName="stream"
+        )
+        self.assertEqual(self.mock_logs_client.put_log_events.call_count, 2)
+
+    def test_log_writer(self):
+        """Test LogWriter buffers per stream and flushes on close."""
+        with LogWriter(
+            "group", flush_interval=60, logs_client=self.mock_logs_client
+        ) as writer:
+            writer.write("b", "second", timestamp=2)
+            writer.write("a", "only", timestamp=5)
+            writer.write("b", "first", timestamp=1)
+            self.mock_logs_client.put_log_events.assert_not_called()
+
+        calls = {
+            call.kwargs["logStreamName"]: call.kwargs["logEvents"]
+            for call in self.mock_logs_client.put_log_events.call_args_list
+        }
+        self.assertEqual(
+            calls,
+            {
+                "a": [{"timestamp": 5, "message": "only"}],
+                "b": [
+                    {"timestamp": 1, "message": "first"},
+                    {"timestamp": 2, "message": "second"},
+                ],
+            },
+        )
+        with self.assertRaises(ValueError):
+            writer.write("a", "late")
+
+    def test_log_writer_flushes_full_batch_in_background(self):
+        """Test LogWriter flushes from its thread once a batch is full."""
+        sent = threading.Event()
+        self.mock_logs_client.put_log_events.side_effect = (
+            lambda **kwargs: sent.set()
+        )
+        writer = LogWriter(
+            "group", flush_interval=60, logs_client=self.mock_logs_client
+        )
+
+        writer.write("a", "x" * (1024 * 1024), timestamp=1)
+
+        self.assertTrue(sent.wait(5))
+        writer.close()
+        self.assertEqual(self.mock_logs_client.put_log_events.call_count, 1)
+
+    def test_log_writer_reports_background_errors(self):
+        """Test a failed background flush is raised by the next flush."""
+        self.mock_logs_client.put_log_events.side_effect = ClientError(
+            {"Error": {"Code": "AccessDeniedException"}}, "PutLogEvents"
+        )
+        writer = LogWriter(
+            "group", flush_interval=0.01, logs_client=self.mock_logs_client
+        )
+        writer.write("a", "hello", timestamp=1)
+        for _ in range(500):
+            if writer._error is not None:
+                break
+            time.sleep(0.01)
+
+        with self.assertRaises(AwsError):
+            writer.flush()
+        writer.close()
+
+    def test_log_writer_sends_other_streams_after_error(self):
+        """Test one failing stream does not drop the other streams."""
+        sent = []
+
+        def put_log_events(**kwargs):
+            if kwargs["logStreamName"] == "a":
+                raise ClientError(
+                    {"Error": {"Code": "AccessDeniedException"}},
+                    "PutLogEvents",
+                )
+            sent.append(kwargs["logStreamName"])
+
+        self.mock_logs_client.put_log_events.side_effect = put_log_events
+        writer = LogWriter(
+            "group", flush_interval=60, logs_client=self.mock_logs_client
+        )
+        writer.write("a", "lost", timestamp=1)
+        writer.write("b", "kept", timestamp=1)
+        writer.write("c", "kept", timestamp=1)
+
+        with self.assertRaises(AwsError):
+            writer.flush()
+        self.assertEqual(sorted(sent), ["b", "c"])
+        writer.close()
+
 
 if __name__ == "__main__":
     unittest.main()
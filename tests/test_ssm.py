@@ -1,17 +1,38 @@
 """Unit tests for SSM Parameter Store functions."""
 
+import importlib.util
+import os
+import tempfile
+import threading
 import unittest
-from datetime import datetime
+from datetime import datetime, timezone
 from unittest.mock import MagicMock, patch
 
-from aws_v2.models.ssm import Parameter
+from botocore.exceptions import ClientError
+
+from aws_v2.cache import TTLCache
+from aws_v2.models.ssm import (
+    GetParametersOutput,
+    Parameter,
+    ParameterSnapshot,
+)
 from aws_v2.ssm import (
+    _AdaptiveLimit,
     delete_parameter,
     get_parameter,
+    get_parameters,
     get_parameters_by_path,
+    load_parameter_snapshot,
+    open_parameter_snapshot,
     put_parameter,
+    put_parameters,
+    refresh_parameter_snapshot,
+    save_parameter_snapshot,
+    snapshot_parameters,
 )
 
+HAS_CRYPTOGRAPHY = importlib.util.find_spec("cryptography") is not None
+
 
 class TestSSM(unittest.TestCase):
     """Test cases for SSM Parameter Store functions."""
@@ -216,6 +237,618 @@ class TestSSM(unittest.TestCase):
             Type="SecureString",
         )
 
+    def test_get_parameter_with_cache(self):
+        """Test get_parameter serves repeat reads from the cache."""
+        self.mock_ssm.get_parameter.return_value = {
+            "Parameter": {
+                "Name": "/test/parameter",
+                "Value": "test-value",
+                "LastModifiedDate": datetime(2025, 12, 17, 12, 0, 0),
+            }
+        }
+        cache = TTLCache(ttl=60)
+
+        for _ in range(3):
+            result = get_parameter(
+                "/test/parameter", ssm_client=self.mock_ssm, cache=cache
+            )
+            self.assertEqual(result.value, "test-value")
+
+        self.mock_ssm.get_parameter.assert_called_once_with(
+            Name="/test/parameter", WithDecryption=True
+        )
+
+    def test_get_parameter_cache_keyed_by_decrypt(self):
+        """Test decrypted and raw values are cached separately."""
+        self.mock_ssm.get_parameter.side_effect = [
+            {
+                "Parameter": {
+                    "Name": "/s",
+                    "Value": "plain",
+                    "LastModifiedDate": None,
+                }
+            },
+            {
+                "Parameter": {
+                    "Name": "/s",
+                    "Value": "cipher",
+                    "LastModifiedDate": None,
+                }
+            },
+        ]
+        cache = TTLCache(ttl=60)
+
+        decrypted = get_parameter("/s", True, self.mock_ssm, cache)
+        raw = get_parameter("/s", False, self.mock_ssm, cache)
+
+        self.assertEqual(decrypted.value, "plain")
+        self.assertEqual(raw.value, "cipher")
+
+    def test_put_parameter_invalidates_cache(self):
+        """Test put_parameter drops the cached copy of the parameter."""
+        cache = TTLCache(ttl=60)
+        cache.set(("/test/parameter", True), self.test_parameter)
+
+        put_parameter(
+            self.test_parameter, ssm_client=self.mock_ssm, cache=cache
+        )
+
+        self.assertIsNone(cache.get(("/test/parameter", True)))
+
+    def test_delete_parameter_invalidates_cache(self):
+        """Test delete_parameter drops the cached copy of the parameter."""
+        cache = TTLCache(ttl=60)
+        cache.set(("/test/parameter", False), self.test_parameter)
+
+        delete_parameter("/test/parameter", self.mock_ssm, cache)
+
+        self.assertIsNone(cache.get(("/test/parameter", False)))
+
+    def test_get_parameters_chunks_names(self):
+        """Test get_parameters splits names into 10-name requests."""
+        names = [f"/app/param{index}" for index in range(23)]
+
+        def get_parameters_response(Names, WithDecryption):
+            return {
+                "Parameters": [
+                    {
+                        "Name": name,
+                        "Value": name.upper(),
+                        "LastModifiedDate": datetime(2025, 12, 17),
+                    }
+                    for name in Names
+                    if name != "/app/param5"
+                ],
+                "InvalidParameters": (
+                    ["/app/param5"] if "/app/param5" in Names else []
+                ),
+            }
+
+        self.mock_ssm.get_parameters.side_effect = get_parameters_response
+
+        result = get_parameters(names, ssm_client=self.mock_ssm)
+
+        self.assertIsInstance(result, GetParametersOutput)
+        self.assertEqual(self.mock_ssm.get_parameters.call_count, 3)
+        self.assertEqual(
+            [parameter.name for parameter in result.parameters],
+            [name for name in names if name != "/app/param5"],
+        )
+        self.assertEqual(result.parameters[0].value, "/APP/PARAM0")
+        self.assertEqual(result.invalid_parameters, ["/app/param5"])
+
+    def test_get_parameters_uses_and_fills_cache(self):
+        """Test get_parameters skips cached names and caches the rest."""
+        cache = TTLCache(ttl=60)
+        cache.set(("/test/parameter", True), self.test_parameter)
+        self.mock_ssm.get_parameters.return_value = {
+            "Parameters": [
+                {
+                    "Name": "/test/other",
+                    "Value": "other-value",
+                    "LastModifiedDate": datetime(2025, 12, 17),
+                }
+            ],
+            "InvalidParameters": [],
+        }
+
+        result = get_parameters(
+            ["/test/parameter", "/test/other", "/test/other"],
+            ssm_client=self.mock_ssm,
+            cache=cache,
+        )
+
+        self.mock_ssm.get_parameters.assert_called_once_with(
+            Names=["/test/other"], WithDecryption=True
+        )
+        self.assertEqual(
+            [parameter.value for parameter in result.parameters],
+            ["test-value", "other-value"],
+        )
+        self.assertEqual(cache.get(("/test/other", True)).value, "other-value")
+
+    def test_get_parameters_versioned_names(self):
+        """Test selector results map back to the requested names."""
+        cache = TTLCache(ttl=60)
+        self.mock_ssm.get_parameters.return_value = {
+            "Parameters": [
+                {
+                    "Name": "/app/key",
+                    "Value": "v3",
+                    "Selector": ":3",
+                    "Version": 3,
+                    "LastModifiedDate": datetime(2025, 12, 1),
+                },
+                {
+                    "Name": "/app/key",
+                    "Value": "latest",
+                    "Version": 5,
+                    "LastModifiedDate": datetime(2025, 12, 3),
+                },
+                {
+                    "Name": "/app/key",
+                    "Value": "v4",
+                    "Selector": ":prod",
+                    "Version": 4,
+                    "LastModifiedDate": datetime(2025, 12, 2),
+                },
+            ],
+            "InvalidParameters": ["/app/key:9"],
+        }
+
+        result = get_parameters(
+            ["/app/key:3", "/app/key", "/app/key:prod", "/app/key:9"],
+            ssm_client=self.mock_ssm,
+            cache=cache,
+        )
+
+        self.assertEqual(
+            [parameter.value for parameter in result.parameters],
+            ["v3", "latest", "v4"],
+        )
+        self.assertEqual(result.invalid_parameters, ["/app/key:9"])
+        self.assertEqual(cache.get(("/app/key", True)).value, "latest")
+        self.assertEqual(cache.get(("/app/key:3", True)).value, "v3")
+        self.assertEqual(cache.get(("/app/key:prod", True)).value, "v4")
+
+    def test_get_parameters_by_path_recursive_with_filters(self):
+        """Test get_parameters_by_path passes Recursive and filters."""
+        mock_paginator = MagicMock()
+        mock_paginator.paginate.return_value = [{"Parameters": []}]
+        self.mock_ssm.get_paginator.return_value = mock_paginator
+        filters = [{"Key": "Type", "Values": ["SecureString"]}]
+
+        get_parameters_by_path(
+            "/app",
+            ssm_client=self.mock_ssm,
+            recursive=True,
+            parameter_filters=filters,
+        )
+
+        mock_paginator.paginate.assert_called_once_with(
+            Path="/app",
+            WithDecryption=True,
+            Recursive=True,
+            ParameterFilters=filters,
+        )
+
+    def test_parameter_snapshot_index(self):
+        """Test ParameterSnapshot subtree lookups and nested export."""
+        snapshot = ParameterSnapshot(
+            path="/app",
+            parameters={
+                name: Parameter(name=name, value=value)
+                for name, value in [
+                    ("/app/db", "primary"),
+                    ("/app/db/host", "localhost"),
+                    ("/app/db/port", "5432"),
+                    ("/app/name", "demo"),
+                    ("/application/other", "x"),
+                ]
+            },
+        )
+
+        self.assertEqual(
+            sorted(
+                parameter.name for parameter in snapshot.subtree("/app/db")
+            ),
+            ["/app/db", "/app/db/host", "/app/db/port"],
+        )
+        self.assertEqual(snapshot.subtree("/app/d"), [])
+        self.assertEqual(
+            snapshot.to_nested_dict(),
+            {
+                "db": {"": "primary", "host": "localhost", "port": "5432"},
+                "name": "demo",
+            },
+        )
+
+        snapshot.remove("/app/db/host")
+        snapshot.remove("/app/db/port")
+        self.assertEqual(
+            snapshot.to_nested_dict(), {"db": "primary", "name": "demo"}
+        )
+        self.assertEqual(len(snapshot), 3)
+
+    def test_snapshot_and_refresh_parameters(self):
+        """Test refresh re-reads only changed parameters."""
+        old = datetime(2025, 12, 1)
+        new = datetime(2025, 12, 2)
+        by_path = MagicMock()
+        by_path.paginate.return_value = [
+            {
+                "Parameters": [
+                    {"Name": "/app/a", "Value": "1", "LastModifiedDate": old},
+                    {"Name": "/app/b", "Value": "2", "LastModifiedDate": old},
+                    {"Name": "/app/c", "Value": "3", "LastModifiedDate": old},
+                ]
+            }
+        ]
+        describe = MagicMock()
+        describe.paginate.return_value = [
+            {
+                "Parameters": [
+                    {"Name": "/app/a", "LastModifiedDate": old},
+                    {"Name": "/app/b", "LastModifiedDate": new},
+                    {"Name": "/app/d", "LastModifiedDate": new},
+                ]
+            }
+        ]
+        self.mock_ssm.get_paginator.side_effect = lambda name: {
+            "get_parameters_by_path": by_path,
+            "describe_parameters": describe,
+        }[name]
+        self.mock_ssm.get_parameters.return_value = {
+            "Parameters": [
+                {"Name": "/app/b", "Value": "22", "LastModifiedDate": new},
+                {"Name": "/app/d", "Value": "4", "LastModifiedDate": new},
+            ],
+            "InvalidParameters": [],
+        }
+
+        snapshot = snapshot_parameters("/app", ssm_client=self.mock_ssm)
+        by_path.paginate.assert_called_once_with(
+            Path="/app", WithDecryption=True, Recursive=True
+        )
+        self.assertEqual(len(snapshot), 3)
+
+        changes = refresh_parameter_snapshot(
+            snapshot, ssm_client=self.mock_ssm
+        )
+
+        self.mock_ssm.get_parameters.assert_called_once_with(
+            Names=["/app/b", "/app/d"], WithDecryption=True
+        )
+        self.assertEqual(changes.updated, ["/app/b", "/app/d"])
+        self.assertEqual(changes.removed, ["/app/c"])
+        self.assertEqual(
+            snapshot.to_nested_dict(), {"a": "1", "b": "22", "d": "4"}
+        )
+
+    def test_parameter_snapshot_read_during_refresh(self):
+        """Test a snapshot can be read while a refresh updates it."""
+        names = [f"/app/group{i % 10}/key{i}" for i in range(200)]
+        rounds = iter(range(1, 51))
+        current = {}
+
+        def describe_pages(**kwargs):
+            version = next(rounds)
+            current["date"] = datetime(2025, 1, 1, second=version % 60)
+            current["names"] = names[: 100 if version % 2 else 200]
+            return [
+                {
+                    "Parameters": [
+                        {"Name": name, "LastModifiedDate": current["date"]}
+                        for name in current["names"]
+                    ]
+                }
+            ]
+
+        def get_parameters_page(Names, WithDecryption):
+            return {
+                "Parameters": [
+                    {
+                        "Name": name,
+                        "Value": "v",
+                        "LastModifiedDate": current["date"],
+                    }
+                    for name in Names
+                ],
+                "InvalidParameters": [],
+            }
+
+        describe = MagicMock()
+        describe.paginate.side_effect = describe_pages
+        self.mock_ssm.get_paginator.return_value = describe
+        self.mock_ssm.get_parameters.side_effect = get_parameters_page
+        snapshot = ParameterSnapshot(
+            path="/app",
+            parameters={
+                name: Parameter(name=name, value="v") for name in names
+            },
+        )
+        errors = []
+
+        def refresh():
+            try:
+                for _ in range(50):
+                    refresh_parameter_snapshot(
+                        snapshot, max_workers=1, ssm_client=self.mock_ssm
+                    )
+            except Exception as error:
+                errors.append(error)
+
+        thread = threading.Thread(target=refresh)
+        thread.start()
+        try:
+            while thread.is_alive():
+                snapshot.to_nested_dict()
+                snapshot.subtree("/app/group1")
+                snapshot.values()
+                len(snapshot)
+        finally:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(len(snapshot), 200)
+
+    def test_parameter_from_dict_round_trip(self):
+        """Test Parameter.from_dict reads the output of to_dict."""
+        self.assertEqual(
+            Parameter.from_dict(self.test_parameter.to_dict()),
+            self.test_parameter,
+        )
+
+    @unittest.skipUnless(HAS_CRYPTOGRAPHY, "cryptography is not installed")
+    def test_parameter_snapshot_file_round_trip(self):
+        """Test snapshots are saved encrypted and loaded back."""
+        from cryptography.fernet import Fernet
+
+        key = Fernet.generate_key().decode()
+        modified = datetime(2025, 12, 17, 12, 0, 0, 123000, timezone.utc)
+        snapshot = ParameterSnapshot(
+            path="/app",
+            parameters={
+                "/app/secret": Parameter(
+                    "/app/secret", "hunter2", last_modified_date=modified
+                )
+            },
+        )
+
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, "params.snapshot")
+            with patch.dict(os.environ, {"AWS_V2_SSM_SNAPSHOT_KEY": key}):
+                save_parameter_snapshot(snapshot, file_path)
+                loaded = load_parameter_snapshot(file_path)
+            with open(file_path, "rb") as snapshot_file:
+                self.assertNotIn(b"hunter2", snapshot_file.read())
+            self.assertIsNone(
+                load_parameter_snapshot(
+                    file_path, key=Fernet.generate_key().decode()
+                )
+            )
+            self.assertIsNone(
+                load_parameter_snapshot(
+                    os.path.join(directory, "missing"), key=key
+                )
+            )
+
+        self.assertEqual(loaded.path, "/app")
+        self.assertEqual(loaded.get("/app/secret").value, "hunter2")
+        self.assertEqual(
+            loaded.get("/app/secret").last_modified_date, modified
+        )
+
+    @unittest.skipUnless(HAS_CRYPTOGRAPHY, "cryptography is not installed")
+    @patch("aws_v2.ssm.threading.Thread")
+    def test_open_parameter_snapshot(self, mock_thread):
+        """Test a cold start reads SSM and a warm start reads the file."""
+        from cryptography.fernet import Fernet
+
+        key = Fernet.generate_key().decode()
+        mock_paginator = MagicMock()
+        mock_paginator.paginate.return_value = [
+            {
+                "Parameters": [
+                    {
+                        "Name": "/app/a",
+                        "Value": "1",
+                        "LastModifiedDate": datetime(2025, 12, 1),
+                    }
+                ]
+            }
+        ]
+        self.mock_ssm.get_paginator.return_value = mock_paginator
+
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, "params.snapshot")
+            cold = open_parameter_snapshot(
+                "/app", file_path, key=key, ssm_client=self.mock_ssm
+            )
+            mock_thread.assert_not_called()
+
+            warm = open_parameter_snapshot(
+                "/app", file_path, key=key, ssm_client=self.mock_ssm
+            )
+
+        self.assertEqual(cold.to_nested_dict(), {"a": "1"})
+        self.assertEqual(warm.to_nested_dict(), {"a": "1"})
+        self.assertEqual(mock_paginator.paginate.call_count, 1)
+        mock_thread.return_value.start.assert_called_once_with()
+        self.assertIs(mock_thread.call_args.kwargs["args"][0], warm)
+
+    @unittest.skipUnless(HAS_CRYPTOGRAPHY, "cryptography is not installed")
+    @patch("aws_v2.ssm.threading.Thread")
+    def test_open_parameter_snapshot_records_refresh_error(self, mock_thread):
+        """Test a failed background refresh is logged and recorded."""
+        from cryptography.fernet import Fernet
+
+        key = Fernet.generate_key().decode()
+        mock_paginator = MagicMock()
+        mock_paginator.paginate.return_value = [
+            {
+                "Parameters": [
+                    {
+                        "Name": "/app/a",
+                        "Value": "1",
+                        "LastModifiedDate": datetime(2025, 12, 1),
+                    }
+                ]
+            }
+        ]
+        self.mock_ssm.get_paginator.return_value = mock_paginator
+        denied = ClientError(
+            {"Error": {"Code": "AccessDeniedException", "Message": "No"}},
+            "GetParametersByPath",
+        )
+
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, "params.snapshot")
+            open_parameter_snapshot(
+                "/app", file_path, key=key, ssm_client=self.mock_ssm
+            )
+            snapshot = open_parameter_snapshot(
+                "/app", file_path, key=key, ssm_client=self.mock_ssm
+            )
+            refresh = mock_thread.call_args.kwargs["target"]
+            args = mock_thread.call_args.kwargs["args"]
+
+            mock_paginator.paginate.side_effect = denied
+            with self.assertLogs("aws_v2.ssm", level="ERROR"):
+                refresh(*args)
+            self.assertIs(snapshot.refresh_error, denied)
+            self.assertEqual(snapshot.to_nested_dict(), {"a": "1"})
+
+            mock_paginator.paginate.side_effect = None
+            refresh(*args)
+            self.assertIsNone(snapshot.refresh_error)
+
+    @patch("aws_v2.ssm.time.sleep")
+    def test_put_parameters_skips_unchanged_and_retries(self, mock_sleep):
+        """Test put_parameters skips unchanged values and retries."""
+        self.mock_ssm.get_parameters.return_value = {
+            "Parameters": [
+                {
+                    "Name": "/app/same",
+                    "Value": "1",
+                    "LastModifiedDate": datetime(2025, 12, 1),
+                },
+                {
+                    "Name": "/app/changed",
+                    "Value": "old",
+                    "LastModifiedDate": datetime(2025, 12, 1),
+                },
+            ],
+            "InvalidParameters": ["/app/new"],
+        }
+        throttle = ClientError(
+            {"Error": {"Code": "ThrottlingException", "Message": "Slow"}},
+            "PutParameter",
+        )
+        denied = ClientError(
+            {"Error": {"Code": "AccessDeniedException", "Message": "No"}},
+            "PutParameter",
+        )
+        attempts = {}
+
+        def put(Name, **kwargs):
+            attempts[Name] = attempts.get(Name, 0) + 1
+            if Name == "/app/new" and attempts[Name] == 1:
+                raise throttle
+            if Name == "/app/denied":
+                raise denied
+
+        self.mock_ssm.put_parameter.side_effect = put
+
+        result = put_parameters(
+            [
+                Parameter("/app/same", "1"),
+                Parameter("/app/changed", "new"),
+                Parameter("/app/new", "2"),
+                Parameter("/app/denied", "3"),
+            ],
+            ssm_client=self.mock_ssm,
+        )
+
+        self.assertEqual(result.unchanged, ["/app/same"])
+        self.assertEqual(result.written, ["/app/changed", "/app/new"])
+        self.assertEqual(list(result.failed), ["/app/denied"])
+        self.assertEqual(
+            attempts, {"/app/changed": 1, "/app/new": 2, "/app/denied": 1}
+        )
+        mock_sleep.assert_called_once()
+
+    def test_put_parameters_compares_with_snapshot(self):
+        """Test put_parameters uses a given snapshot instead of reading."""
+        snapshot = ParameterSnapshot(
+            path="/app",
+            parameters={"/app/a": Parameter("/app/a", "1")},
+        )
+        cache = TTLCache(ttl=60)
+        cache.set(("/app/b", True), Parameter("/app/b", "old"))
+
+        result = put_parameters(
+            [Parameter("/app/a", "1"), Parameter("/app/b", "2")],
+            snapshot=snapshot,
+            ssm_client=self.mock_ssm,
+            cache=cache,
+        )
+
+        self.mock_ssm.get_parameters.assert_not_called()
+        self.mock_ssm.put_parameter.assert_called_once_with(
+            Name="/app/b", Value="2", Overwrite=True, Type="SecureString"
+        )
+        self.assertEqual(result.written, ["/app/b"])
+        self.assertIsNone(cache.get(("/app/b", True)))
+
+    @patch("aws_v2.ssm.put_parameters_client")
+    @patch("aws_v2.ssm.client")
+    def test_put_parameters_default_clients(self, mock_client, mock_writer):
+        """Test default writes use the client without SDK retries."""
+        mock_client.get_parameters.return_value = {
+            "Parameters": [],
+            "InvalidParameters": ["/app/a"],
+        }
+
+        result = put_parameters([Parameter("/app/a", "1")])
+
+        mock_client.get_parameters.assert_called_once()
+        mock_client.put_parameter.assert_not_called()
+        mock_writer.put_parameter.assert_called_once_with(
+            Name="/app/a", Value="1", Overwrite=True, Type="SecureString"
+        )
+        self.assertEqual(result.written, ["/app/a"])
+
+    def test_put_parameters_client_disables_retries(self):
+        """Test the bulk write client leaves throttling to put_parameters."""
+        from aws_v2.ssm import put_parameters_client
+
+        retries = put_parameters_client.meta.config.retries
+        self.assertEqual(retries["total_max_attempts"], 1)
+
+    def test_adaptive_limit(self):
+        """Test the write limit halves on throttling and recovers."""
+        limit = _AdaptiveLimit(8)
+
+        limit.acquire()
+        limit.release(throttled=True)
+        self.assertEqual(limit.limit, 4)
+        limit.acquire()
+        limit.release(throttled=True)
+        limit.acquire()
+        limit.release(throttled=True)
+        limit.acquire()
+        limit.release(throttled=True)
+        self.assertEqual(limit.limit, 1)
+
+        limit.acquire()
+        limit.release(throttled=False)
+        self.assertEqual(limit.limit, 2)
+        for _ in range(2):
+            limit.acquire()
+            limit.release(throttled=False)
+        self.assertEqual(limit.limit, 3)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -159,6 +159,13 @@ class TestUtils(unittest.TestCase):
         self.assertIn("Invalid credentials", str(context.exception))
         mock_sts.get_caller_identity.assert_called_once()
 
+    def test_backoff_delay_is_bounded(self):
+        """Test backoff_delay stays within the exponential ceiling."""
+        for attempt in range(1, 10):
+            delay = utils.backoff_delay(attempt, base=0.1, cap=1.0)
+            self.assertGreaterEqual(delay, 0)
+            self.assertLessEqual(delay, min(1.0, 0.1 * 2 ** (attempt - 1)))
+
 
 if __name__ == "__main__":
     unittest.main()